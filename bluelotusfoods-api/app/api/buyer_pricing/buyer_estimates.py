@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Body, HTTPException
 from app.db.db import get_conn
+from app.db.async_db import get_async_conn
 from app.db.queries import DatabaseQueries
-from app.services.pricing_calculations import calculate_estimate_totals
+from app.services.pricing_calculations import calculate_line_item_prices
 from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
 from pydantic import BaseModel
 from typing import List, Optional
 from decimal import Decimal
 from datetime import date
 import logging
-import httpx
-import os
 from app.core.settings import settings
+from app.services.email_client import post_email_service
+from app.services.job_queue import JobFailed, enqueue_job_async, idempotency_key, job_handler, wake_workers
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -72,19 +74,16 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
     Save a new buyer estimate with selected quote items.
     Generates unique estimate number and stores all selected items.
     """
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Start transaction
-                cur.execute("BEGIN")
-                
+            async with conn.cursor(row_factory=dict_row) as cur:
                 from datetime import datetime
                 now = datetime.now()
                 
                 # Step 1: INSERT with placeholder — let PostgreSQL assign the id via SERIAL.
                 # Step 2: Use the RETURNING id to build EST-YYYY-MM-<id>, then UPDATE.
                 # This is concurrency-safe (unlike SELECT MAX(id)+1 which has race conditions).
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['insert_estimate'], (
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['insert_estimate'], (
                     request.company_id,
                     request.buyer_ids or str(request.buyer_id),
                     request.notes,
@@ -92,34 +91,29 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
                     request.delivery_date_to
                 ))
                 
-                result = cur.fetchone()
+                result = await cur.fetchone()
                 estimate_id = result['id']
                 estimate_date = result['estimate_date']
                 created_at = result['created_at']
                 
                 # Generate estimate_number: EST-YYYY-MM-<id>
                 estimate_number = f"EST-{now.year}-{now.month:02d}-{estimate_id}"
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_estimate_number'],
-                            (estimate_number, estimate_id))
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_estimate_number'],
+                                  (estimate_number, estimate_id))
                 
-                # Insert estimate items
+                # Price every item, then insert them all in one statement: each
+                # column goes in as an array and the saved rows come back with
+                # their display names, so there's no need to re-query the items.
+                rows = []
                 for item in request.items:
-                    # Calculate price and totals using pricing service
-                    calc_data = calculate_estimate_totals({
-                        'fish_price': float(item.fish_price),
-                        'freight_price': float(item.freight_price),
-                        'tariff_percent': float(item.tariff_percent),
-                        'margin': float(item.margin)
-                    })
-                    
-                    # price = (fish_price + tariff_amount) + freight_price + margin
-                    price = Decimal(str(calc_data['total_price']))
-                    
-                    # total_price = price + clearing_charges
-                    total_price = price + item.clearing_charges
-                    
-                    cur.execute(DatabaseQueries.BUYER_ESTIMATES['insert_item'], (
-                        estimate_id,
+                    tariff_amount, price, total_price = calculate_line_item_prices(
+                        item.fish_price,
+                        item.freight_price,
+                        item.tariff_percent,
+                        item.margin,
+                        item.clearing_charges
+                    )
+                    rows.append((
                         item.vendor_id,
                         item.quote_id,
                         item.port_code,
@@ -131,7 +125,7 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
                         item.fish_price,
                         item.freight_price,
                         item.tariff_percent,
-                        calc_data['tariff_amount'],
+                        tariff_amount,
                         item.margin,
                         price,
                         item.clearing_charges,
@@ -139,21 +133,27 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
                         total_price
                     ))
                 
-                # Insert region groups if provided
+                saved_items = []
+                if rows:
+                    columns = [list(column) for column in zip(*rows)]
+                    await cur.execute(DatabaseQueries.BUYER_ESTIMATES['insert_items'],
+                                      (estimate_id, *columns))
+                    saved_items = await cur.fetchall()
+                
+                # Insert region groups if provided (port_codes is itself an
+                # array, so these go through executemany rather than unnest)
                 if request.region_groups:
-                    for region in request.region_groups:
-                        cur.execute(DatabaseQueries.BUYER_ESTIMATES['insert_region_group'], (
+                    await cur.executemany(DatabaseQueries.BUYER_ESTIMATES['insert_region_group'], [
+                        (
                             estimate_id,
                             region['region_name'],
                             region.get('port_codes', []),
                             region.get('notes')
-                        ))
-                
-                conn.commit()
-                
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_items'], (estimate_id,))
+                        )
+                        for region in request.region_groups
+                    ])
                 
-                saved_items = cur.fetchall()
+                await conn.commit()
                 
                 return {
                     "success": True,
@@ -175,7 +175,7 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
                 }
                 
         except Exception as e:
-            conn.rollback()
+            await conn.rollback()
             logger.error(f"Error saving buyer estimate: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error saving estimate: {str(e)}")
 
@@ -183,12 +183,12 @@ async def save_buyer_estimate(request: SaveBuyerEstimateRequest):
 @router.get("/buyer/{buyer_id}")
 async def get_buyer_estimates(buyer_id: int, limit: int = 50):
     """Get all estimates for a specific buyer"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['list_by_buyer'], (buyer_id, limit))
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['list_by_buyer'], (buyer_id, limit))
                 
-                results = cur.fetchall()
+                results = await cur.fetchall()
                 
                 return {
                     "success": True,
@@ -203,21 +203,21 @@ async def get_buyer_estimates(buyer_id: int, limit: int = 50):
 @router.get("/{estimate_id}")
 async def get_estimate_details(estimate_id: int):
     """Get full details of a specific estimate including all items"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_header'], (estimate_id,))
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_header'], (estimate_id,))
                 
-                estimate = cur.fetchone()
+                estimate = await cur.fetchone()
                 if not estimate:
                     raise HTTPException(status_code=404, detail="Estimate not found")
                 
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_items'], (estimate_id,))
-                items = cur.fetchall()
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_items'], (estimate_id,))
+                items = await cur.fetchall()
 
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_region_groups'], (estimate_id,))
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_region_groups'], (estimate_id,))
                 
-                region_groups = cur.fetchall()
+                region_groups = await cur.fetchall()
                 
                 return {
                     "success": True,
@@ -240,16 +240,16 @@ async def update_estimate_status(estimate_id: int, status: str):
     if status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
     
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_status'], (status, estimate_id))
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_status'], (status, estimate_id))
                 
-                result = cur.fetchone()
+                result = await cur.fetchone()
                 if not result:
                     raise HTTPException(status_code=404, detail="Estimate not found")
                 
-                conn.commit()
+                await conn.commit()
                 
                 return {
                     "success": True,
@@ -260,14 +260,18 @@ async def update_estimate_status(estimate_id: int, status: str):
         except HTTPException:
             raise
         except Exception as e:
-            conn.rollback()
+            await conn.rollback()
             logger.error(f"Error updating estimate status: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error updating status: {str(e)}")
 
 
 @router.get("/company/{company_id}")
-async def get_company_estimates(company_id: int, week_start: Optional[str] = None):
-    """Get estimates for a specific company within a week window (defaults to current week)"""
+async def get_company_estimates(company_id: int, week_start: Optional[str] = None,
+                                limit: Optional[int] = None, offset: int = 0):
+    """
+    Get estimates for a specific company within a week window (defaults to current week).
+    Optional limit/offset page through the week, newest first.
+    """
     from datetime import date, timedelta
     if week_start:
         try:
@@ -278,29 +282,44 @@ async def get_company_estimates(company_id: int, week_start: Optional[str] = Non
         today = date.today()
         ws = today - timedelta(days=(today.weekday()))  # Monday of current week
 
-    with get_conn() as conn:
+    if (limit is not None and limit < 1) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be positive and offset non-negative")
+
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get estimates
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['list_by_company'], (company_id, ws.isoformat(), ws.isoformat()))
+            async with conn.cursor(row_factory=dict_row) as cur:
+                # Get estimates (one extra row tells us whether another page exists)
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['list_by_company'], (
+                    company_id, ws.isoformat(), ws.isoformat(),
+                    limit + 1 if limit is not None else None, offset
+                ))
                 
-                estimates = cur.fetchall()
+                estimates = await cur.fetchall()
+                has_more = limit is not None and len(estimates) > limit
+                if has_more:
+                    estimates = estimates[:limit]
                 
-                # For each estimate, get items with details
+                # Get items for all estimates in one query, grouped by estimate
+                items_by_estimate = {estimate['id']: [] for estimate in estimates}
+                if estimates:
+                    await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_company_items'],
+                                      (list(items_by_estimate),))
+                    for item in await cur.fetchall():
+                        items_by_estimate[item['buyer_estimate_id']].append(dict(item))
+
                 results = []
                 for estimate in estimates:
-                    cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_company_items'], (estimate['id'],))
-                    
-                    items = cur.fetchall()
-                    
                     estimate_dict = dict(estimate)
-                    estimate_dict['items'] = [dict(item) for item in items]
-                    estimate_dict['item_count'] = len(items)
+                    estimate_dict['items'] = items_by_estimate[estimate['id']]
+                    estimate_dict['item_count'] = len(estimate_dict['items'])
                     results.append(estimate_dict)
                 
                 return {
                     "success": True,
-                    "estimates": results
+                    "estimates": results,
+                    "limit": limit,
+                    "offset": offset,
+                    "has_more": has_more
                 }
                 
         except Exception as e:
@@ -308,115 +327,178 @@ async def get_company_estimates(company_id: int, week_start: Optional[str] = Non
             raise HTTPException(status_code=500, detail=f"Error fetching estimates: {str(e)}")
 
 
-@router.post("/{estimate_id}/send")
+BUYER_EMAIL_JOB = 'estimate.buyer_email'
+ESTIMATE_OWNER_NOTIFICATION_JOB = 'estimate.owner_notification'
+
+
+async def _load_estimate_email(estimate_id: int, notify_buyer: bool):
+    """Estimate header, items shaped for the email service, and buyer emails (if notify_buyer)."""
+    buyer_emails: list = []
+    async with get_async_conn() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_header'], (estimate_id,))
+
+            estimate = await cur.fetchone()
+            if not estimate:
+                raise HTTPException(status_code=404, detail="Estimate not found")
+
+            await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_items'], (estimate_id,))
+
+            items = await cur.fetchall()
+
+            if notify_buyer:
+                # Get buyer emails
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_buyer_emails'],
+                                  (estimate['buyer_ids'],))
+                buyer_emails = [row['email'] for row in await cur.fetchall()]
+
+    if notify_buyer and not buyer_emails:
+        raise HTTPException(status_code=400, detail="No valid buyer emails found for this estimate")
+
+    # Prepare items for email API
+    email_items = []
+    for item in items:
+        email_items.append({
+            'vendor_name': item['vendor_name'],
+            'common_name': item['common_name'],
+            'scientific_name': item.get('scientific_name') or '',
+            'cut': item['cut_name'],
+            'grade': item['grade_name'],
+            'fish_size': item.get('fish_size') or '',
+            'port': item['port_code'],
+            'offer_quantity': float(item['offer_quantity']),
+            'fish_price': float(item['fish_price']),
+            'margin': float(item['margin']),
+            'freight_price': float(item['freight_price']),
+            'tariff_percent': float(item['tariff_percent']),
+            'clearing_charges': float(item['clearing_charges']),
+            'total_price': float(item['total_price']),
+            'fish_species_id': item['fish_species_id'],
+            'cut_id': item['cut_id'],
+            'grade_id': item['grade_id']
+        })
+
+    return estimate, email_items, buyer_emails
+
+
+def _delivery_dates(estimate: dict):
+    delivery_date_from = estimate.get('delivery_date_from').isoformat() if estimate.get('delivery_date_from') else None
+    delivery_date_to = estimate.get('delivery_date_to').isoformat() if estimate.get('delivery_date_to') else None
+    return delivery_date_from, delivery_date_to
+
+
+async def _post_estimate_email(path: str, payload: dict):
+    response = await post_email_service(path, payload, idempotency_key=idempotency_key())
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=f"Email service error: {response.text}")
+    email_data = response.json()
+    if not email_data.get('success'):
+        raise JobFailed(f"Failed to send email: {email_data.get('message')}")
+
+
+@job_handler(BUYER_EMAIL_JOB)
+async def _buyer_email_job(payload: dict) -> dict:
+    """Email the estimate to its buyers; the estimate was marked sent when this job was queued"""
+    estimate, email_items, buyer_emails = await _load_estimate_email(payload['estimate_id'], notify_buyer=True)
+    delivery_date_from, delivery_date_to = _delivery_dates(estimate)
+
+    await _post_estimate_email(
+        "/email/buyer-pricing/send-estimate",
+        {
+            'buyer_emails': buyer_emails,
+            'buyer_name': estimate['buyer_names'],
+            'company_name': estimate['company_name'],
+            'estimate_number': estimate['estimate_number'],
+            'items': email_items,
+            'delivery_date_from': delivery_date_from,
+            'delivery_date_to': delivery_date_to,
+            'notes': estimate.get('notes')
+        }
+    )
+    return {"estimate_number": estimate['estimate_number'], "buyer_emails": buyer_emails}
+
+
+@job_handler(ESTIMATE_OWNER_NOTIFICATION_JOB)
+async def _estimate_owner_notification_job(payload: dict) -> dict:
+    estimate, email_items, _ = await _load_estimate_email(payload['estimate_id'], notify_buyer=False)
+    delivery_date_from, delivery_date_to = _delivery_dates(estimate)
+
+    owner_email = settings.owner_notification_email
+    await _post_estimate_email(
+        "/email/buyer-pricing/send-owner-notification",
+        {
+            'owner_email': owner_email,
+            'company_name': estimate['company_name'],
+            'buyer_name': estimate['buyer_names'],
+            'estimate_number': estimate['estimate_number'],
+            'items': email_items,
+            'delivery_date_from': delivery_date_from,
+            'delivery_date_to': delivery_date_to
+        }
+    )
+    logger.info(f"Owner notification sent to {owner_email} for estimate {estimate['estimate_number']}")
+    return {"owner_email": owner_email}
+
+
+@router.post("/{estimate_id}/send", status_code=202)
 async def send_estimate(estimate_id: int, request: Optional[SendEstimateRequest] = Body(default=None)):
-    """Send estimate - update status to 'sent' and generate PDF"""
-    with get_conn() as conn:
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_header'], (estimate_id,))
-                
-                estimate = cur.fetchone()
+    """
+    Send estimate - update status to 'sent' and queue the buyer and owner
+    emails in the same transaction, so the status and the emails can't
+    drift apart
+    """
+    notify_buyer = request.notify_buyer if request else True
+    buyer_emails: list = []
+    reference = f"estimate:{estimate_id}"
+
+    try:
+        async with get_async_conn() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_header'], (estimate_id,))
+
+                estimate = await cur.fetchone()
                 if not estimate:
                     raise HTTPException(status_code=404, detail="Estimate not found")
-                
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_items'], (estimate_id,))
-                
-                items = cur.fetchall()
-                
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_status_sent'], (estimate_id,))
-                
-                conn.commit()
 
-                notify_buyer = request.notify_buyer if request else True
-
-                # Prepare items for email API
-                email_items = []
-                for item in items:
-                    email_items.append({
-                        'vendor_name': item['vendor_name'],
-                        'common_name': item['common_name'],
-                        'scientific_name': item.get('scientific_name') or '',
-                        'cut': item['cut_name'],
-                        'grade': item['grade_name'],
-                        'fish_size': item.get('fish_size') or '',
-                        'port': item['port_code'],
-                        'offer_quantity': float(item['offer_quantity']),
-                        'fish_price': float(item['fish_price']),
-                        'margin': float(item['margin']),
-                        'freight_price': float(item['freight_price']),
-                        'tariff_percent': float(item['tariff_percent']),
-                        'clearing_charges': float(item['clearing_charges']),
-                        'total_price': float(item['total_price']),
-                        'fish_species_id': item['fish_species_id'],
-                        'cut_id': item['cut_id'],
-                        'grade_id': item['grade_id']
-                    })
-
-                email_api_url = os.environ.get('EMAIL_SERVICE_URL', 'http://localhost:8001')
-                buyer_emails: list = []
-
-                async with httpx.AsyncClient() as client:
-                    if notify_buyer:
-                        # Get buyer emails
-                        cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_buyer_emails'],
-                                    (estimate['buyer_ids'],))
-                        buyer_emails = [row['email'] for row in cur.fetchall()]
-
-                        if not buyer_emails:
-                            raise HTTPException(status_code=400, detail="No valid buyer emails found for this estimate")
-
-                        email_response = await client.post(
-                            f"{email_api_url}/email/buyer-pricing/send-estimate",
-                            json={
-                                'buyer_emails': buyer_emails,
-                                'buyer_name': estimate['buyer_names'],
-                                'company_name': estimate['company_name'],
-                                'estimate_number': estimate['estimate_number'],
-                                'items': email_items,
-                                'delivery_date_from': estimate.get('delivery_date_from').isoformat() if estimate.get('delivery_date_from') else None,
-                                'delivery_date_to': estimate.get('delivery_date_to').isoformat() if estimate.get('delivery_date_to') else None,
-                                'notes': estimate.get('notes')
-                            },
-                            timeout=30.0
-                        )
-                        email_data = email_response.json()
-                        if not email_data.get('success'):
-                            raise HTTPException(status_code=500, detail=f"Failed to send email: {email_data.get('message')}")
-                    else:
-                        logger.info(f"Buyer notification skipped for estimate {estimate['estimate_number']} (notify_buyer=False)")
-
-                    # Send owner notification (always, fire and forget)
-                    try:
-                        owner_email = settings.owner_notification_email
-                        await client.post(
-                            f"{email_api_url}/email/buyer-pricing/send-owner-notification",
-                            json={
-                                'owner_email': owner_email,
-                                'company_name': estimate['company_name'],
-                                'estimate_number': estimate['estimate_number'],
-                                'items': email_items,
-                                'delivery_date_from': estimate.get('delivery_date_from').isoformat() if estimate.get('delivery_date_from') else None,
-                                'delivery_date_to': estimate.get('delivery_date_to').isoformat() if estimate.get('delivery_date_to') else None
-                            },
-                            timeout=30.0
-                        )
-                        logger.info(f"Owner notification sent to {owner_email} for estimate {estimate['estimate_number']}")
-                    except Exception as owner_err:
-                        logger.error(f"Failed to send owner notification: {str(owner_err)}")
+                if notify_buyer:
+                    await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_buyer_emails'],
+                                      (estimate['buyer_ids'],))
+                    buyer_emails = [row['email'] for row in await cur.fetchall()]
+                    if not buyer_emails:
+                        raise HTTPException(status_code=400, detail="No valid buyer emails found for this estimate")
 
-                return {
-                    "success": True,
-                    "message": f"Estimate sent. Buyer notified: {notify_buyer}.",
-                    "estimate_id": estimate_id,
-                    "estimate_number": estimate['estimate_number'],
-                    "buyer_emails": buyer_emails,
-                    "notify_buyer": notify_buyer
-                }
-                
-        except Exception as e:
-            logger.error(f"Error sending estimate: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error sending estimate: {str(e)}")
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['update_status_sent'], (estimate_id,))
+
+                jobs = {}
+                if notify_buyer:
+                    jobs['buyer_email'] = await enqueue_job_async(
+                        cur, BUYER_EMAIL_JOB, {'estimate_id': estimate_id}, reference=reference
+                    )
+                else:
+                    logger.info(f"Buyer notification skipped for estimate {estimate['estimate_number']} (notify_buyer=False)")
+                # Owner notification (always)
+                jobs['owner_notification'] = await enqueue_job_async(
+                    cur, ESTIMATE_OWNER_NOTIFICATION_JOB, {'estimate_id': estimate_id}, reference=reference
+                )
+            await conn.commit()
+        wake_workers()
+
+        return {
+            "success": True,
+            "queued": True,
+            "jobs": jobs,
+            "message": f"Estimate sent. Buyer notified: {notify_buyer}.",
+            "estimate_id": estimate_id,
+            "estimate_number": estimate['estimate_number'],
+            "buyer_emails": buyer_emails,
+            "notify_buyer": notify_buyer
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error sending estimate: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error sending estimate: {str(e)}")
 
 
 class VendorQuoteLookupRequest(BaseModel):
@@ -432,13 +514,13 @@ async def get_vendor_quotes_by_ids(request: VendorQuoteLookupRequest):
     if not request.quote_ids:
         return {"success": True, "quotes": {}}
 
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            async with conn.cursor(row_factory=dict_row) as cur:
                 # Get quote header + vendor info
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quotes_header'], (request.quote_ids,))
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quotes_header'], (request.quote_ids,))
 
-                quotes_raw = cur.fetchall()
+                quotes_raw = await cur.fetchall()
 
                 # Build a dict keyed by quote_id
                 quotes = {}
@@ -452,17 +534,17 @@ async def get_vendor_quotes_by_ids(request: VendorQuoteLookupRequest):
                     return {"success": True, "quotes": {}}
 
                 # Get products for these quotes
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quote_products'], (request.quote_ids,))
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quote_products'], (request.quote_ids,))
 
-                for prod in cur.fetchall():
+                for prod in await cur.fetchall():
                     qid = prod['quote_id']
                     if qid in quotes:
                         quotes[qid]['products'].append(dict(prod))
 
                 # Get destinations for these quotes
-                cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quote_destinations'], (request.quote_ids,))
+                await cur.execute(DatabaseQueries.BUYER_ESTIMATES['get_vendor_quote_destinations'], (request.quote_ids,))
 
-                for dest in cur.fetchall():
+                for dest in await cur.fetchall():
                     qid = dest['quote_id']
                     if qid in quotes:
                         quotes[qid]['destinations'].append(dict(dest))
@@ -512,12 +594,12 @@ async def create_purchase_order(request: CreatePORequest):
     if not request.items:
         raise HTTPException(status_code=400, detail="At least one PO item is required")
 
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            async with conn.cursor(row_factory=dict_row) as cur:
                 # Look up vendor_code from vendors table
-                cur.execute(DatabaseQueries.VENDORS['get_code'], (request.vendor_id,))
-                vendor_row = cur.fetchone()
+                await cur.execute(DatabaseQueries.VENDORS['get_code'], (request.vendor_id,))
+                vendor_row = await cur.fetchone()
                 if not vendor_row:
                     raise HTTPException(status_code=404, detail=f"Vendor {request.vendor_id} not found")
                 vendor_code = vendor_row['code']
@@ -526,11 +608,11 @@ async def create_purchase_order(request: CreatePORequest):
                 po_number = f"PO-{request.quote_id}-{request.estimate_id}-{vendor_code}"
 
                 # Check if PO already exists
-                cur.execute(
+                await cur.execute(
                     DatabaseQueries.PURCHASE_ORDERS['check_exists'],
                     (request.quote_id, request.estimate_id, request.vendor_id)
                 )
-                existing = cur.fetchone()
+                existing = await cur.fetchone()
                 if existing:
                     return {
                         "success": False,
@@ -540,17 +622,17 @@ async def create_purchase_order(request: CreatePORequest):
                     }
 
                 # Insert PO header
-                cur.execute(
+                await cur.execute(
                     DatabaseQueries.PURCHASE_ORDERS['insert'],
                     (po_number, request.quote_id, request.estimate_id, request.vendor_id,
                      request.delivery_date_from, request.delivery_date_to)
                 )
-                po_row = cur.fetchone()
+                po_row = await cur.fetchone()
                 po_id = po_row['id']
 
                 # Insert PO items
                 for item in request.items:
-                    cur.execute(
+                    await cur.execute(
                         DatabaseQueries.PURCHASE_ORDERS['insert_item'],
                         (po_id, item.fish_name, item.cut_name, item.grade_name, item.fish_size,
                          item.port_code, item.destination_name, item.price_per_kg,
@@ -558,7 +640,7 @@ async def create_purchase_order(request: CreatePORequest):
                          item.order_weight_lbs, item.order_weight_kg)
                     )
 
-                conn.commit()
+                await conn.commit()
 
                 logger.info(f"Created PO {po_number} with {len(request.items)} items")
                 return {
@@ -571,7 +653,7 @@ async def create_purchase_order(request: CreatePORequest):
                 }
 
         except Exception as e:
-            conn.rollback()
+            await conn.rollback()
             logger.error(f"Error creating purchase order: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error creating purchase order: {str(e)}")
 
@@ -626,12 +708,12 @@ async def get_pos_by_estimate(estimate_id: int):
     Get all POs for a given estimate. Used to check PO status on the SummaryTab.
     Returns a dict keyed by vendor_id so the frontend can quickly look up PO state.
     """
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.PURCHASE_ORDERS['get_by_estimate'], (estimate_id,))
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.PURCHASE_ORDERS['get_by_estimate'], (estimate_id,))
 
-                rows = cur.fetchall()
+                rows = await cur.fetchall()
                 # Build a dict keyed by vendor_id for easy lookup
                 pos_by_vendor: dict = {}
                 for row in rows:
@@ -642,8 +724,8 @@ async def get_pos_by_estimate(estimate_id: int):
 
                 # Fetch items for each PO so the buyer can see what weights were ordered
                 for po_dict in pos_by_vendor.values():
-                    cur.execute(DatabaseQueries.PURCHASE_ORDERS['get_items_summary'], (po_dict['id'],))
-                    po_dict['items'] = [dict(r) for r in cur.fetchall()]
+                    await cur.execute(DatabaseQueries.PURCHASE_ORDERS['get_items_summary'], (po_dict['id'],))
+                    po_dict['items'] = [dict(r) for r in await cur.fetchall()]
                     logger.info(f"[get_pos_by_estimate] estimate={estimate_id} po={po_dict['po_number']} items={len(po_dict['items'])}")
 
                 return {"success": True, "purchase_orders": pos_by_vendor}
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
-from app.db.db import get_conn
+from app.db.async_db import get_async_conn
 from app.db.queries import DatabaseQueries
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
@@ -32,11 +32,11 @@ class BuyerWithPorts(BaseModel):
 @router.get("/buyers", response_model=List[Buyer])
 async def get_all_buyers():
     """Get all buyers with their company information"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_PRICING['get_all_buyers'])
-                buyers = cur.fetchall()
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_PRICING['get_all_buyers'])
+                buyers = await cur.fetchall()
                 return [dict(row) for row in buyers]
         except Exception as e:
             logger.error(f"Error fetching buyers: {str(e)}")
@@ -46,16 +46,16 @@ async def get_all_buyers():
 @router.get("/buyers/{buyer_id}", response_model=BuyerWithPorts)
 async def get_buyer_with_ports(buyer_id: int):
     """Get a specific buyer with their company's ports"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_PRICING['get_buyer_by_id'], (buyer_id,))
-                buyer = cur.fetchone()
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_PRICING['get_buyer_by_id'], (buyer_id,))
+                buyer = await cur.fetchone()
                 if not buyer:
                     raise HTTPException(status_code=404, detail="Buyer not found")
 
-                cur.execute(DatabaseQueries.BUYER_PRICING['get_company_ports'], (buyer['company_id'],))
-                ports = [dict(row) for row in cur.fetchall()]
+                await cur.execute(DatabaseQueries.BUYER_PRICING['get_company_ports'], (buyer['company_id'],))
+                ports = [dict(row) for row in await cur.fetchall()]
 
                 result = dict(buyer)
                 result['ports'] = ports
@@ -70,11 +70,11 @@ async def get_buyer_with_ports(buyer_id: int):
 @router.get("/company/{company_id}/buyers", response_model=List[Buyer])
 async def get_buyers_by_company(company_id: int):
     """Get all buyers for a specific company"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.BUYER_PRICING['get_buyers_by_company'], (company_id,))
-                buyers = cur.fetchall()
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.BUYER_PRICING['get_buyers_by_company'], (company_id,))
+                buyers = await cur.fetchall()
                 return [dict(row) for row in buyers]
         except Exception as e:
             logger.error(f"Error fetching buyers for company {company_id}: {str(e)}")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
-from app.db.db import get_conn
+from app.db.async_db import get_async_conn
 from app.services.pricing_calculations import calculate_clearing_charges_with_quantity
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
 from pydantic import BaseModel
 from decimal import Decimal
 import logging
@@ -31,10 +31,10 @@ async def calculate_clearing_charges(request: CalculateClearingRequest):
     Returns rounded quantities (in LBS) and clearing charges per LB for each tier.
     Minimum quantity: 1200 LBS, rounded to nearest 100 LBS.
     """
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("""
                     SELECT
                         custom_entry_fee,
                         airline_service_fee,
@@ -49,16 +49,16 @@ async def calculate_clearing_charges(request: CalculateClearingRequest):
                     WHERE is_active = true
                     LIMIT 1
                 """)
-                clearing_config = cur.fetchone()
+                clearing_config = await cur.fetchone()
                 if not clearing_config:
                     raise HTTPException(status_code=404, detail="No active clearing charges found")
 
-                cur.execute("""
+                await cur.execute("""
                     SELECT is_simp_applicable
                     FROM fish_species_simp_applicable
                     WHERE fish_species_id = %s
                 """, (request.fish_species_id,))
-                simp_result = cur.fetchone()
+                simp_result = await cur.fetchone()
                 is_simp_applicable = simp_result['is_simp_applicable'] if simp_result else False
 
                 tiers = calculate_clearing_charges_with_quantity(
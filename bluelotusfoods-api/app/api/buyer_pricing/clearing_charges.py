@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
-from app.db.db import get_conn
-from psycopg2.extras import RealDictCursor
+from app.db.async_db import get_async_conn
+from psycopg.rows import dict_row
 from pydantic import BaseModel
 from typing import Optional
 from decimal import Decimal
@@ -41,10 +41,10 @@ class SaveClearingChargesRequest(BaseModel):
 @router.get("/active")
 async def get_active_clearing_charges():
     """Get the currently active clearing charges"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("""
                     SELECT
                         id,
                         custom_entry_fee,
@@ -63,7 +63,7 @@ async def get_active_clearing_charges():
                     WHERE is_active = true
                     LIMIT 1
                 """)
-                result = cur.fetchone()
+                result = await cur.fetchone()
                 if not result:
                     raise HTTPException(status_code=404, detail="No active clearing charges found")
                 return dict(result)
@@ -82,17 +82,17 @@ async def save_clearing_charges(request: SaveClearingChargesRequest):
     2. Insert new record with current timestamp
     3. Mark new record as active
     """
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("""
                     UPDATE clearing_charges
                     SET valid_to = NOW(),
                         is_active = false
                     WHERE is_active = true
                 """)
 
-                cur.execute("""
+                await cur.execute("""
                     INSERT INTO clearing_charges (
                         custom_entry_fee,
                         airline_service_fee,
@@ -121,8 +121,8 @@ async def save_clearing_charges(request: SaveClearingChargesRequest):
                     request.customs_tax_per_30000
                 ))
 
-                result = cur.fetchone()
-                conn.commit()
+                result = await cur.fetchone()
+                await conn.commit()
 
                 return {
                     "success": True,
@@ -131,7 +131,7 @@ async def save_clearing_charges(request: SaveClearingChargesRequest):
                     "valid_from": result['valid_from'].isoformat()
                 }
         except Exception as e:
-            conn.rollback()
+            await conn.rollback()
             logger.error(f"Error saving clearing charges: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error saving clearing charges: {str(e)}")
 
@@ -139,10 +139,10 @@ async def save_clearing_charges(request: SaveClearingChargesRequest):
 @router.get("/history")
 async def get_clearing_charges_history():
     """Get all clearing charges history"""
-    with get_conn() as conn:
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("""
                     SELECT
                         id,
                         custom_entry_fee,
@@ -160,7 +160,7 @@ async def get_clearing_charges_history():
                     FROM clearing_charges
                     ORDER BY valid_from DESC
                 """)
-                results = cur.fetchall()
+                results = await cur.fetchall()
                 return {
                     "success": True,
                     "history": [dict(row) for row in results]
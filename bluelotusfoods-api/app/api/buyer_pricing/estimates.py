@@ -1,53 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from app.db.db import get_conn
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from app.api.ndjson import empty_ndjson_response, stream_async_query, wants_ndjson
+from app.core.settings import settings
+from app.db.async_db import get_async_conn
 from app.db.queries import DatabaseQueries
-from app.services.pricing_calculations import (
-    calculate_estimate_totals,
-    KG_TO_LBS,
-    kg_to_lbs,
-    lbs_to_kg,
-    convert_fish_size_to_lbs,
-)
-from psycopg2.extras import RealDictCursor
+from app.services.search_cache import search_cache
+from app.services.pricing_calculations import price_search_results
+from psycopg.rows import dict_row
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime, date
+from typing import List, Optional, Tuple
 from decimal import Decimal
+import base64
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def convert_vendor_price_to_buyer_price(estimate: dict) -> dict:
-    """
-    Convert vendor prices from KG to LBS for buyer pricing display.
-    Vendor quotes are submitted in KG, but buyer pricing is displayed in LBS.
-    """
-    # Convert per-kg prices/quantities to per-lb
-    fish_price_lb    = lbs_to_kg(Decimal(str(estimate.get('fish_price', 0))))
-    freight_price_lb = lbs_to_kg(Decimal(str(estimate.get('freight_price', 0))))
-    margin_lb        = lbs_to_kg(Decimal(str(estimate.get('margin', 0))))
-    offer_quantity_lb = kg_to_lbs(Decimal(str(estimate.get('offer_quantity', 0))))
-    
-    # If fish_size_id is set, fish_size is already the correct lbs/range label from the DB CASE expression.
-    # Only run the legacy kg→lbs conversion for old quotes that have no fish_size_id.
-    if estimate.get('fish_size_id') is not None:
-        fish_size_display = estimate.get('fish_size')
-    else:
-        fish_size_display = convert_fish_size_to_lbs(estimate.get('fish_size'))
-
-    # Return updated estimate with LB prices
-    return {
-        **estimate,
-        'offer_quantity': float(offer_quantity_lb),
-        'fish_price': float(fish_price_lb),
-        'freight_price': float(freight_price_lb),
-        'margin': float(margin_lb),
-        'fish_size': fish_size_display
-    }
-
-
 class EstimateItem(BaseModel):
     quote_id: Optional[int]
     quote_date: Optional[str]
@@ -72,99 +44,205 @@ class CreateEstimateRequest(BaseModel):
     vendor_ids: List[int]
     port_codes: List[str]
     date_range: str  # e.g., "This Week", "Last Week", "This Month"
+    limit: Optional[int] = None  # rows per page, capped at settings.estimate_search_max_page_size
+    cursor: Optional[str] = None  # next_cursor from the previous page
+    include_total: bool = False  # also count every matching row (one more query)
+
+
+def _date_range_filter(date_range: Optional[str]) -> str:
+    if date_range == "This Week":
+        return """
+            AND es.quote_created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
+            AND es.quote_created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day' + INTERVAL '7 days'
+        """
+    if date_range == "Last Week":
+        return """
+            AND es.quote_created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '8 days'
+            AND es.quote_created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
+        """
+    if date_range == "This Month":
+        return " AND es.quote_created_at >= DATE_TRUNC('month', CURRENT_DATE)"
+    return ""
+
+
+def _search_filters(request: CreateEstimateRequest) -> Tuple[str, list]:
+    """WHERE conditions (and their params) shared by the search and its count."""
+    conditions = ""
+    params = []
+    if request.vendor_ids:
+        conditions += " AND es.vendor_id = ANY(%s)"
+        params.append(request.vendor_ids)
+    if request.port_codes:
+        conditions += " AND es.port = ANY(%s)"
+        params.append(request.port_codes)
+    conditions += _date_range_filter(request.date_range)
+    return conditions, params
+
+
+def _normalized_filters(request: CreateEstimateRequest) -> tuple:
+    """The filters in a canonical form; buyer_ids don't affect the results."""
+    return tuple(sorted(set(request.vendor_ids))), tuple(sorted(set(request.port_codes))), request.date_range
+
+
+def _search_fingerprint(request: CreateEstimateRequest) -> str:
+    """Identifies the filters a cursor was issued for."""
+    filters = json.dumps(_normalized_filters(request))
+    return hashlib.sha256(filters.encode()).hexdigest()[:16]
+
+
+def _encode_cursor(row: dict, fingerprint: str) -> str:
+    key = [row['quote_id'], row['port'], row['common_name'], row['weight_range'] or '',
+           row['quote_destination_id'], row['quote_product_id']]
+    token = json.dumps({'k': key, 'f': fingerprint}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+
+# Types of the cursor key: quote_id, port, common_name, weight_range, quote_destination_id, quote_product_id
+_CURSOR_KEY_TYPES = (int, str, str, str, int, int)
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> list:
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        key = token['k']
+        if not isinstance(key, list) or len(key) != len(_CURSOR_KEY_TYPES):
+            raise ValueError("wrong key length")
+        # bool is an int subclass, but never a valid id
+        if not all(isinstance(v, t) and not isinstance(v, bool) for v, t in zip(key, _CURSOR_KEY_TYPES)):
+            raise ValueError("wrong key types")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if token.get('f') != fingerprint:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different search; start again without it")
+    return key
 
 
 @router.post("/search")
-async def search_estimates(request: CreateEstimateRequest):
-    """Search vendor quotes based on selected buyers, vendors, and ports"""
-    with get_conn() as conn:
+async def search_estimates(request: CreateEstimateRequest, accept: Optional[str] = Header(None)):
+    """
+    Search vendor quotes based on selected buyers, vendors, and ports.
+
+    Results come a page at a time (newest quote first); pass next_cursor back
+    as cursor for the following page. Each page is a keyset range scan, so
+    any page costs about the same however large the date range is.
+
+    With Accept: application/x-ndjson the estimates are streamed one per
+    line instead: every match after cursor, or only limit of them if a
+    limit is sent.
+    """
+    limit = min(max(request.limit or settings.estimate_search_page_size, 1), settings.estimate_search_max_page_size)
+    fingerprint = _search_fingerprint(request)
+    after = _decode_cursor(request.cursor, fingerprint) if request.cursor else None
+
+    conditions, params = _search_filters(request)
+    query = DatabaseQueries.ESTIMATES['search_base'] + conditions
+    page_params = list(params)
+    if after:
+        query += DatabaseQueries.ESTIMATES['search_after_cursor']
+        page_params += [after[0], after[0], *after]
+    query += DatabaseQueries.ESTIMATES['search_page']
+
+    if wants_ndjson(accept):
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = DatabaseQueries.ESTIMATES['search_base']
-                params = []
-
-                if request.vendor_ids:
-                    query += " AND v.id = ANY(%s)"
-                    params.append(request.vendor_ids)
-
-                if request.port_codes:
-                    query += " AND d.code = ANY(%s)"
-                    params.append(request.port_codes)
-
-                if request.date_range:
-                    if request.date_range == "This Week":
-                        query += """
-                            AND q.created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
-                            AND q.created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day' + INTERVAL '7 days'
-                        """
-                    elif request.date_range == "Last Week":
-                        query += """
-                            AND q.created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '8 days'
-                            AND q.created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
-                        """
-                    elif request.date_range == "This Month":
-                        query += " AND q.created_at >= DATE_TRUNC('month', CURRENT_DATE)"
-
-                query += " ORDER BY q.id DESC, q.created_at DESC, d.code, f.common_name, qp.weight_range"
-
-                cur.execute(query, params)
-                results = cur.fetchall()
-
-                estimates_in_lbs = [convert_vendor_price_to_buyer_price(dict(row)) for row in results]
-                estimates_with_totals = [calculate_estimate_totals(estimate) for estimate in estimates_in_lbs]
-
-                return {
+            # LIMIT NULL is no limit
+            return await stream_async_query(query, page_params + [request.limit], price_search_results, "estimates")
+        except Exception as e:
+            logger.error(f"Error searching estimates: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error searching estimates: {str(e)}")
+
+    # One extra row tells whether there is a next page
+    page_params.append(limit + 1)
+
+    async with get_async_conn() as conn:
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                cache_key = None
+                if search_cache.enabled:
+                    await cur.execute(DatabaseQueries.ESTIMATES['search_version'], ())
+                    stamp = await cur.fetchone()
+                    cache_key = (stamp['version'], stamp['today'], _normalized_filters(request),
+                                 limit, request.cursor, request.include_total)
+                    body = search_cache.get(cache_key)
+                    if body is not None:
+                        return Response(content=body, media_type="application/json")
+
+                await cur.execute(query, page_params)
+                results = await cur.fetchall()
+                has_more = len(results) > limit
+                results = results[:limit]
+
+                total = None
+                if request.include_total:
+                    await cur.execute(DatabaseQueries.ESTIMATES['search_count_base'] + conditions, params)
+                    total = (await cur.fetchone())['total']
+
+                estimates_with_totals = price_search_results(results)
+
+                response = {
                     "success": True,
                     "count": len(estimates_with_totals),
+                    "limit": limit,
+                    "has_more": has_more,
+                    "next_cursor": _encode_cursor(results[-1], fingerprint) if has_more else None,
                     "estimates": estimates_with_totals
                 }
+                if request.include_total:
+                    response["total"] = total
+                if cache_key is None:
+                    return response
+                encoded = JSONResponse(content=jsonable_encoder(response))
+                search_cache.put(cache_key, encoded.body)
+                return encoded
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error searching estimates: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error searching estimates: {str(e)}")
 
 
 @router.get("/buyers/{buyer_id}/estimates")
-async def get_buyer_estimates(buyer_id: int, date_range: Optional[str] = "This Week"):
-    """Get estimates for a specific buyer based on their company's ports"""
-    with get_conn() as conn:
+async def get_buyer_estimates(buyer_id: int, date_range: Optional[str] = "This Week",
+                              accept: Optional[str] = Header(None)):
+    """
+    Get estimates for a specific buyer based on their company's ports.
+    With Accept: application/x-ndjson the estimates are streamed one per line.
+    """
+    query = (DatabaseQueries.ESTIMATES['buyer_estimates_base'] + _date_range_filter(date_range)
+             + " ORDER BY es.quote_id DESC, es.port, es.common_name, es.weight_range")
+
+    async with get_async_conn() as conn:
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(DatabaseQueries.ESTIMATES['buyer_ports'], (buyer_id,))
-                port_codes = [row['code'] for row in cur.fetchall()]
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(DatabaseQueries.ESTIMATES['buyer_ports'], (buyer_id,))
+                port_codes = [row['code'] for row in await cur.fetchall()]
 
                 if not port_codes:
+                    if wants_ndjson(accept):
+                        return empty_ndjson_response()
                     return {"success": True, "count": 0, "estimates": []}
 
-                query = DatabaseQueries.ESTIMATES['buyer_estimates_base']
-                params = [port_codes]
-
-                if date_range == "This Week":
-                    query += """
-                        AND q.created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
-                        AND q.created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day' + INTERVAL '7 days'
-                    """
-                elif date_range == "Last Week":
-                    query += """
-                        AND q.created_at >= DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '8 days'
-                        AND q.created_at < DATE_TRUNC('week', CURRENT_DATE + INTERVAL '1 day') - INTERVAL '1 day'
-                    """
-                elif date_range == "This Month":
-                    query += " AND q.created_at >= DATE_TRUNC('month', CURRENT_DATE)"
+                if not wants_ndjson(accept):
+                    await cur.execute(query, [port_codes])
+                    results = await cur.fetchall()
 
-                query += " ORDER BY q.id DESC, q.created_at DESC, d.code, f.common_name, qp.weight_range"
+                    estimates_in_lbs = price_search_results(results, with_totals=False)
 
-                cur.execute(query, params)
-                results = cur.fetchall()
-
-                estimates_in_lbs = [convert_vendor_price_to_buyer_price(dict(row)) for row in results]
-
-                return {
-                    "success": True,
-                    "count": len(estimates_in_lbs),
-                    "buyer_id": buyer_id,
-                    "port_codes": port_codes,
-                    "estimates": estimates_in_lbs
-                }
+                    return {
+                        "success": True,
+                        "count": len(estimates_in_lbs),
+                        "buyer_id": buyer_id,
+                        "port_codes": port_codes,
+                        "estimates": estimates_in_lbs
+                    }
         except Exception as e:
             logger.error(f"Error getting estimates for buyer {buyer_id}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error getting estimates: {str(e)}")
+
+    # Streamed on a connection of its own, once the ports lookup has released this one
+    try:
+        return await stream_async_query(
+            query, [port_codes], lambda rows: price_search_results(rows, with_totals=False), "estimates"
+        )
+    except Exception as e:
+        logger.error(f"Error getting estimates for buyer {buyer_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting estimates: {str(e)}")
@@ -0,0 +1,258 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.db.db import get_conn, get_pool_stats
+from app.db.async_db import get_async_pool_stats
+from app.db.instrumentation import query_metrics, estimate_percentile, LATENCY_BUCKETS
+from app.db.queries import DatabaseQueries
+from app.services.reference_cache import reference_cache
+from app.services.search_cache import search_cache
+from app.services.job_queue import get_job_worker_stats, job_summary, wake_workers
+from psycopg2.extras import RealDictCursor
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _render_query_metrics(lines: list):
+    snapshot = query_metrics.snapshot()
+
+    lines.append("# HELP bluelotus_db_query_duration_seconds Query execution time by DatabaseQueries name")
+    lines.append("# TYPE bluelotus_db_query_duration_seconds histogram")
+    for name, s in sorted(snapshot.items()):
+        label = _escape_label(name)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, s['buckets']):
+            cumulative += count
+            lines.append(f'bluelotus_db_query_duration_seconds_bucket{{query="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'bluelotus_db_query_duration_seconds_bucket{{query="{label}",le="+Inf"}} {s["calls"]}')
+        lines.append(f'bluelotus_db_query_duration_seconds_sum{{query="{label}"}} {s["total_time"]:.6f}')
+        lines.append(f'bluelotus_db_query_duration_seconds_count{{query="{label}"}} {s["calls"]}')
+
+    for metric, key, help_text in (
+        ('bluelotus_db_query_errors_total', 'errors', 'Queries that raised an error'),
+        ('bluelotus_db_query_rows_total', 'rows', 'Rows fetched'),
+        ('bluelotus_db_query_bytes_total', 'bytes', 'Approximate bytes of fetched values'),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, s in sorted(snapshot.items()):
+            lines.append(f'{metric}{{query="{_escape_label(name)}"}} {s[key]}')
+
+
+def _render_pool_metrics(lines: list, pool_label: str, stats: dict):
+    if not stats:
+        return
+    for key, value in sorted(stats.items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        lines.append(f'bluelotus_db_pool_{key}{{pool="{pool_label}"}} {value}')
+
+
+def _render_reference_cache_metrics(lines: list):
+    stats = reference_cache.stats()
+    for metric, key, help_text in (
+        ('bluelotus_reference_cache_hits_total', 'hits', 'Reference data reads served from memory'),
+        ('bluelotus_reference_cache_misses_total', 'misses', 'Reference data reads that found no fresh entry'),
+        ('bluelotus_reference_cache_loads_total', 'loads', 'Reference data loads from the database'),
+        ('bluelotus_reference_cache_load_errors_total', 'load_errors', 'Failed reference data loads'),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, s in sorted(stats.items()):
+            lines.append(f'{metric}{{key="{_escape_label(name)}"}} {s[key]}')
+
+
+def _render_search_cache_metrics(lines: list):
+    stats = search_cache.stats()
+    for metric, key, kind, help_text in (
+        ('bluelotus_search_cache_hits_total', 'hits', 'counter', 'Estimate searches answered from the cache'),
+        ('bluelotus_search_cache_misses_total', 'misses', 'counter', 'Estimate searches that ran the query'),
+        ('bluelotus_search_cache_evictions_total', 'evictions', 'counter', 'Cached search responses evicted for space'),
+        ('bluelotus_search_cache_entries', 'entries', 'gauge', 'Cached search responses'),
+        ('bluelotus_search_cache_bytes', 'bytes', 'gauge', 'Size of the cached search responses'),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {stats[key]}")
+
+
+def _render_job_metrics(lines: list):
+    stats = get_job_worker_stats()
+    for metric, key, kind, help_text in (
+        ('bluelotus_jobs_running', 'running', 'gauge', 'Jobs being run by this instance'),
+        ('bluelotus_jobs_claimed_total', 'claimed', 'counter', 'Jobs claimed by this instance'),
+        ('bluelotus_jobs_succeeded_total', 'succeeded', 'counter', 'Jobs completed by this instance'),
+        ('bluelotus_jobs_retried_total', 'retried', 'counter', 'Failed job attempts scheduled for retry'),
+        ('bluelotus_jobs_dead_total', 'dead', 'counter', 'Jobs moved to the dead-letter state'),
+        ('bluelotus_jobs_claim_errors_total', 'claim_errors', 'counter', 'Failed attempts to claim a job'),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {stats[key]}")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition of query and connection pool metrics"""
+    lines = []
+    _render_query_metrics(lines)
+    _render_pool_metrics(lines, "sync", get_pool_stats())
+    _render_pool_metrics(lines, "async", get_async_pool_stats())
+    _render_reference_cache_metrics(lines)
+    _render_search_cache_metrics(lines)
+    _render_job_metrics(lines)
+    return "\n".join(lines) + "\n"
+
+
+def _bucket_ms(seconds: float):
+    # Overflow bucket (+Inf) has no upper bound to report
+    return None if seconds == float('inf') else round(seconds * 1000, 3)
+
+
+@router.get("/debug/queries")
+def debug_queries(sort: str = "total_time"):
+    """Per-query stats, sorted descending by total_time (default), avg_time, max_time, calls, errors, rows or bytes"""
+    queries = []
+    for name, s in query_metrics.snapshot().items():
+        calls = s['calls']
+        queries.append({
+            'query': name,
+            'calls': calls,
+            'errors': s['errors'],
+            'total_time_ms': round(s['total_time'] * 1000, 3),
+            'avg_time_ms': round(s['total_time'] * 1000 / calls, 3) if calls else 0.0,
+            'max_time_ms': round(s['max_time'] * 1000, 3),
+            'p50_ms_le': _bucket_ms(estimate_percentile(s['buckets'], calls, 0.50)),
+            'p95_ms_le': _bucket_ms(estimate_percentile(s['buckets'], calls, 0.95)),
+            'p99_ms_le': _bucket_ms(estimate_percentile(s['buckets'], calls, 0.99)),
+            'rows': s['rows'],
+            'bytes': s['bytes'],
+            'avg_rows': round(s['rows'] / calls, 1) if calls else 0.0,
+        })
+
+    sort_key = {'total_time': 'total_time_ms', 'max_time': 'max_time_ms', 'avg_time': 'avg_time_ms'}.get(sort, sort)
+    if sort_key not in ('calls', 'errors', 'rows', 'bytes', 'total_time_ms', 'max_time_ms', 'avg_time_ms'):
+        sort_key = 'total_time_ms'
+    queries.sort(key=lambda q: q[sort_key], reverse=True)
+
+    return {
+        "success": True,
+        "queries": queries,
+        "pools": {
+            "sync": get_pool_stats(),
+            "async": get_async_pool_stats(),
+        }
+    }
+
+
+@router.get("/admin/reference-cache")
+def get_reference_cache_stats():
+    """Hit/miss/load counts, age and size of each cached reference dataset"""
+    return {
+        "success": True,
+        "ttl_seconds": reference_cache.ttl,
+        "keys": reference_cache.stats(),
+    }
+
+
+@router.post("/admin/reference-cache/refresh")
+def refresh_reference_cache(key: Optional[str] = None):
+    """Reload one cached dataset (e.g. key=fish_ids) or all of them after reference data changes"""
+    try:
+        refreshed = reference_cache.refresh(key)
+    except Exception as e:
+        logger.error(f"Error refreshing reference cache: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error refreshing reference cache: {str(e)}")
+    if key is not None and not refreshed:
+        raise HTTPException(status_code=404, detail=f"Reference cache key not found: {key}")
+    return {"success": True, "refreshed": refreshed}
+
+
+@router.get("/admin/search-cache")
+def get_search_cache_stats():
+    """Size, hit rate and evictions of the estimate search result cache"""
+    return {"success": True, **search_cache.stats()}
+
+
+@router.get("/admin/jobs")
+def get_job_queue_depth():
+    """Queued, running and dead job counts by kind, plus this instance's worker stats"""
+    try:
+        with get_conn() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(DatabaseQueries.JOBS['depth'])
+                rows = cur.fetchall()
+    except Exception as e:
+        logger.error(f"Error fetching job queue depth: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching job queue depth: {str(e)}")
+
+    totals = {'queued': 0, 'running': 0, 'dead': 0}
+    for row in rows:
+        totals[row['status']] += row['count']
+    return {
+        "success": True,
+        "totals": totals,
+        "by_kind": [
+            {
+                "kind": row['kind'],
+                "status": row['status'],
+                "count": row['count'],
+                "oldest_run_at": row['oldest_run_at'].isoformat() if row['oldest_run_at'] else None,
+            }
+            for row in rows
+        ],
+        "workers": get_job_worker_stats(),
+    }
+
+
+@router.get("/admin/jobs/dead")
+def get_dead_jobs(limit: int = 50):
+    """Most recently dead-lettered jobs with their last error"""
+    try:
+        with get_conn() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(DatabaseQueries.JOBS['get_dead'], (min(limit, 500),))
+                rows = cur.fetchall()
+    except Exception as e:
+        logger.error(f"Error fetching dead jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching dead jobs: {str(e)}")
+    return {"success": True, "jobs": [dict(job_summary(row), payload=row['payload']) for row in rows]}
+
+
+@router.get("/admin/jobs/{job_id}")
+def get_job(job_id: int):
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(DatabaseQueries.JOBS['get'], (job_id,))
+            row = cur.fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "success": True,
+        "job": dict(job_summary(row), payload=row['payload'], reference=row['reference'], locked_by=row['locked_by']),
+    }
+
+
+@router.post("/admin/jobs/{job_id}/retry")
+def retry_dead_job(job_id: int):
+    """Put a dead job back on the queue with a fresh set of attempts"""
+    with get_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(DatabaseQueries.JOBS['requeue_dead'], (job_id,))
+                requeued = cur.fetchone()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error requeueing job {job_id}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error requeueing job: {str(e)}")
+    if not requeued:
+        raise HTTPException(status_code=404, detail="No dead job with this id")
+    wake_workers()
+    return {"success": True, "job_id": job_id, "status": "queued"}
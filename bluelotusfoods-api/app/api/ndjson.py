@@ -0,0 +1,140 @@
+"""
+Streaming (application/x-ndjson) responses for large listings.
+
+A listing endpoint that sees ``Accept: application/x-ndjson`` returns its
+rows one JSON object per line instead of one JSON document. Rows are read
+from a server-side cursor settings.stream_fetch_size at a time, converted
+and written out chunk by chunk, so memory stays flat however many rows
+match and the client gets its first rows as soon as the first fetch is
+done.
+
+The query runs and the first chunk is fetched before the response starts,
+so a bad query still fails the request with the endpoint's usual error.
+An error after that can only end the stream; it is written as a final
+{"error": ...} line. The pooled connection is held until the stream ends
+or the client goes away; the response releases it when it finishes
+however it finishes, including when the body never gets to start.
+"""
+import json
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from psycopg.rows import dict_row
+from psycopg2.extras import RealDictCursor
+
+from app.core.settings import settings
+from app.db.async_db import get_async_conn
+from app.db.db import get_conn
+from app.db.instrumentation import query_metrics, query_name
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# One stream per connection at a time, so a fixed cursor name is enough
+CURSOR_NAME = "ndjson_stream"
+
+Convert = Callable[[List[dict]], List[dict]]
+
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for the streaming form."""
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+
+def _encode(rows: List[dict]) -> bytes:
+    # Same encoding as FastAPI's JSONResponse, one row per line
+    return "".join(
+        json.dumps(row, ensure_ascii=False, allow_nan=False, separators=(",", ":")) + "\n"
+        for row in jsonable_encoder(rows)
+    ).encode("utf-8")
+
+
+class _NDJSONStream(StreamingResponse):
+    """
+    Runs close() once the response is over: after the last chunk, after a
+    client disconnect, or when sending the headers already failed and the
+    body generator (whose own finally also closes) never ran.
+    """
+
+    def __init__(self, content, close: Callable[[], Awaitable[None]]):
+        super().__init__(content, media_type=NDJSON_MEDIA_TYPE)
+        self._close = close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._close()
+
+
+def empty_ndjson_response() -> StreamingResponse:
+    return StreamingResponse(iter(()), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def stream_async_query(query: str, params, convert: Convert, what: str) -> StreamingResponse:
+    """Stream query (run on the async pool) as NDJSON, convert applied to each fetched chunk."""
+    name = query_name(query)
+    stack = AsyncExitStack()
+    try:
+        conn = await stack.enter_async_context(get_async_conn())
+        cur = await stack.enter_async_context(conn.cursor(name=CURSOR_NAME, row_factory=dict_row))
+        start = time.perf_counter()
+        try:
+            await cur.execute(query, params)
+            rows = await cur.fetchmany(settings.stream_fetch_size)
+        except Exception:
+            query_metrics.record_execute(name, time.perf_counter() - start, error=True)
+            raise
+        query_metrics.record_execute(name, time.perf_counter() - start)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def body() -> AsyncIterator[bytes]:
+        nonlocal rows
+        try:
+            while rows:
+                query_metrics.record_fetch(name, rows)
+                yield _encode(convert(rows))
+                rows = await cur.fetchmany(settings.stream_fetch_size)
+        except Exception as e:
+            logger.error(f"Error streaming {what}: {str(e)}")
+            yield _encode([{"error": f"Error streaming {what}: {str(e)}"}])
+        finally:
+            await stack.aclose()
+
+    # Closing an exit stack twice is a no-op, so the body and the response may both close it
+    return _NDJSONStream(body(), stack.aclose)
+
+
+def stream_query(query: str, params, convert: Convert, what: str) -> StreamingResponse:
+    """Sync-pool counterpart of stream_async_query(), for def route handlers."""
+    stack = ExitStack()
+    try:
+        conn = stack.enter_context(get_conn())
+        cur = stack.enter_context(conn.cursor(name=CURSOR_NAME, cursor_factory=RealDictCursor))
+        cur.execute(query, params)
+        rows = cur.fetchmany(settings.stream_fetch_size)
+    except BaseException:
+        stack.close()
+        raise
+
+    def body() -> Iterator[bytes]:
+        nonlocal rows
+        try:
+            while rows:
+                yield _encode(convert(rows))
+                rows = cur.fetchmany(settings.stream_fetch_size)
+        except Exception as e:
+            logger.error(f"Error streaming {what}: {str(e)}")
+            yield _encode([{"error": f"Error streaming {what}: {str(e)}"}])
+        finally:
+            stack.close()
+
+    return _NDJSONStream(body(), lambda: run_in_threadpool(stack.close))
@@ -4,9 +4,11 @@ from app.db.queries import DatabaseQueries
 from psycopg2.extras import RealDictCursor
 from pydantic import BaseModel
 from typing import List, Optional
-import httpx
 import logging
-from app.core.settings import settings
+from app.services import reference_cache
+from app.services.reference_cache import resolve_ids
+from app.services.job_queue import wake_workers
+from app.services.quote_notifications import enqueue_quote_notifications
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -37,10 +39,90 @@ class Quote(BaseModel):
     destinations: List[Destination]
     products: List[Product]
 
+def _destination_code(destination: Destination) -> str:
+    # "Los Angeles (LAX)" -> "LAX"
+    return destination.destination.split("(")[-1].strip(")")
+
+
+def _resolve_quote_ids(quote: Quote) -> dict:
+    """
+    Resolve every distinct destination code and fish/cut/grade name in the
+    quote, one lookup per dimension. Raises a single 404 listing every
+    unknown name.
+    """
+    lookups = {
+        'Destinations': ('destination_ids', {_destination_code(d) for d in quote.destinations}),
+        'Fish': ('fish_ids', {p.fish_common_name for p in quote.products}),
+        'Cuts': ('cut_ids', {p.cut_name for p in quote.products}),
+        'Grades': ('grade_ids', {p.grade_name for p in quote.products}),
+    }
+    resolved = {}
+    unknown = []
+    for label, (kind, names) in lookups.items():
+        found, missing = resolve_ids(kind, names)
+        resolved[kind] = found
+        if missing:
+            unknown.append(f"{label}: {', '.join(missing)}")
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Not found - {'; '.join(unknown)}")
+    return resolved
+
+
+def _notification_data(quote: Quote, vendor: dict, created_at, destination_names: dict):
+    """
+    The quote row, destinations and products in the shape the notification
+    emails expect (see GET_VENDOR_QUOTE_FOR_EMAIL), built from the request
+    instead of read back from the database.
+    """
+    quote_row = {
+        "quote_id": quote.id,
+        "vendor_name": quote.vendor_name,
+        "country_of_origin": vendor['country'],
+        "quote_valid_till": quote.quote_valid_till,
+        "fish_type": ', '.join(sorted({p.fish_common_name for p in quote.products})) or 'N/A',
+        "notes": quote.notes,
+        "price_negotiable": quote.price_negotiable,
+        "exclusive_offer": quote.exclusive_offer,
+        "created_at": created_at,
+        "vendor_code": vendor['code'],
+        "contact_email": vendor['contact_email'],
+        "is_email_enabled": vendor['is_email_enabled'],
+    }
+    destinations = [
+        {
+            "destination": destination_names.get(_destination_code(d), d.destination),
+            "airfreight_per_kg": d.airfreight_per_kg,
+            "arrival_date": d.arrival_date,
+            "min_weight": d.min_weight,
+            "max_weight": d.max_weight,
+        }
+        for d in quote.destinations
+    ]
+    sizes = [
+        {
+            "fish_type": p.fish_common_name,
+            "cut_name": p.cut_name,
+            "grade_name": p.grade_name,
+            "weight_range": p.weight_range,
+            "price_per_kg": p.price_per_kg,
+            "quantity": p.quantity,
+        }
+        for p in quote.products
+    ]
+    return quote_row, destinations, sizes
+
+
 @router.post("")
-async def create_quote(quote: Quote):
-    with get_conn() as conn:
-        try:
+def create_quote(quote: Quote):
+    try:
+        # Resolved before taking a connection: a cache reload needs one of its own
+        ids = _resolve_quote_ids(quote)
+        destination_names = {
+            row['code']: row['name'] for row in reference_cache.get_dictionary('DESTINATION')
+        }
+
+        # An uncommitted transaction is rolled back when the connection goes back to the pool
+        with get_conn() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Look up vendor_id based on vendor name
                 cur.execute(DatabaseQueries.VENDORS['get_by_name'], (quote.vendor_name,))
@@ -54,86 +136,48 @@ async def create_quote(quote: Quote):
                     DatabaseQueries.QUOTES['insert'],
                     (quote.id, vendor_id, quote.quote_valid_till, quote.notes, quote.price_negotiable, quote.exclusive_offer)
                 )
-
-                # Insert into quote_destination table
-                for destination in quote.destinations:
-                    destination_code = destination.destination.split("(")[-1].strip(")")
-                    cur.execute(DatabaseQueries.DICTIONARY['get_by_code'], (destination_code,))
-                    destination_row = cur.fetchone()
-                    if not destination_row:
-                        raise HTTPException(status_code=404, detail=f"Destination not found: {destination.destination_id}")
-                    destination_id = destination_row["id"]
-
-                    cur.execute(
-                        DatabaseQueries.QUOTES['insert_destination'],
-                        (quote.id, destination_id, destination.airfreight_per_kg, destination.arrival_date, destination.min_weight, destination.max_weight)
-                    )
-
-                # Insert into quote_product table
-                for product in quote.products:
-                    cur.execute(DatabaseQueries.FISH['get_by_name'], (product.fish_common_name,))
-                    fish = cur.fetchone()
-                    if not fish:
-                        raise HTTPException(status_code=404, detail=f"Fish not found: {product.fish_common_name}")
-                    fish_id = fish["id"]
-
-                    cur.execute(DatabaseQueries.FISH['get_cut_by_name'], (product.cut_name,))
-                    cut = cur.fetchone()
-                    if not cut:
-                        raise HTTPException(status_code=404, detail=f"Cut not found: {product.cut_name}")
-                    cut_id = cut["id"]
-
-                    cur.execute(DatabaseQueries.FISH['get_grade_by_name'], (product.grade_name,))
-                    grade = cur.fetchone()
-                    if not grade:
-                        raise HTTPException(status_code=404, detail=f"Grade not found: {product.grade_name}")
-                    grade_id = grade["id"]
-
-                    cur.execute(
-                        DatabaseQueries.QUOTES['insert_product'],
-                        (quote.id, fish_id, product.weight_range, product.fish_size_id, cut_id, grade_id, product.price_per_kg, product.quantity)
-                    )
+                created_at = cur.fetchone()['created_at']
+
+                # Insert all destinations and all products, one statement each
+                if quote.destinations:
+                    cur.execute(DatabaseQueries.QUOTES['insert_destinations'], (
+                        quote.id,
+                        [ids['destination_ids'][_destination_code(d)] for d in quote.destinations],
+                        [d.airfreight_per_kg for d in quote.destinations],
+                        [d.arrival_date for d in quote.destinations],
+                        [d.min_weight for d in quote.destinations],
+                        [d.max_weight for d in quote.destinations],
+                    ))
+
+                if quote.products:
+                    cur.execute(DatabaseQueries.QUOTES['insert_products'], (
+                        quote.id,
+                        [ids['fish_ids'][p.fish_common_name] for p in quote.products],
+                        [p.weight_range for p in quote.products],
+                        [p.fish_size_id for p in quote.products],
+                        [ids['cut_ids'][p.cut_name] for p in quote.products],
+                        [ids['grade_ids'][p.grade_name] for p in quote.products],
+                        [p.price_per_kg for p in quote.products],
+                        [p.quantity for p in quote.products],
+                    ))
+
+                # Queue the vendor and owner emails from the data in hand, in
+                # the same transaction, so they go out exactly when the quote
+                # commits; progress is reported by GET /quotes/{id}/email-status
+                quote_row, destinations, sizes = _notification_data(quote, vendor, created_at, destination_names)
+                email_jobs = enqueue_quote_notifications(cur, quote_row, destinations, sizes)
 
                 conn.commit()
-
-            # Send email notifications asynchronously
-            email_results = {"vendor_email": None, "owner_email": None}
-            base_url = f"http://{settings.api_host}:{settings.api_port}"
-
-            try:
-                async with httpx.AsyncClient() as client:
-                    try:
-                        logger.info(f"Triggering vendor confirmation email for quote {quote.id}")
-                        vendor_email_response = await client.post(
-                            f"{base_url}/quotes/{quote.id}/email",
-                            timeout=10.0
-                        )
-                        logger.info(f"Vendor confirmation email response: {vendor_email_response.status_code}")
-                        email_results["vendor_email"] = vendor_email_response.status_code
-                    except Exception as vendor_error:
-                        logger.error(f"Vendor confirmation email error for quote {quote.id}: {str(vendor_error)}")
-                        email_results["vendor_email"] = f"error: {str(vendor_error)}"
-
-                    try:
-                        logger.info(f"Triggering owner notification email for quote {quote.id}")
-                        owner_email_response = await client.post(
-                            f"{base_url}/quotes/{quote.id}/owner-notification",
-                            timeout=10.0
-                        )
-                        logger.info(f"Owner notification email response: {owner_email_response.status_code}")
-                        email_results["owner_email"] = owner_email_response.status_code
-                    except Exception as owner_error:
-                        logger.error(f"Owner notification email error for quote {quote.id}: {str(owner_error)}")
-                        email_results["owner_email"] = f"error: {str(owner_error)}"
-            except Exception as email_error:
-                logger.error(f"Email notification error for quote {quote.id}: {str(email_error)}")
-
-            return {
-                "message": "Quote created successfully",
-                "quote_id": quote.id,
-                "id": quote.id,
-                "email_status": email_results
-            }
-        except Exception as e:
-            conn.rollback()
-            raise HTTPException(status_code=500, detail=f"Error creating quote: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating quote: {str(e)}")
+
+    wake_workers()
+
+    return {
+        "message": "Quote created successfully",
+        "quote_id": quote.id,
+        "id": quote.id,
+        "email_jobs": email_jobs
+    }
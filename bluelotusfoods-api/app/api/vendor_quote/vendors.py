@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, Header, HTTPException, Query, UploadFile, File, Form
+from app.api.ndjson import stream_query, wants_ndjson
 from app.db.db import get_conn
 from app.db.queries import DatabaseQueries
 from psycopg2.extras import RealDictCursor
 from pydantic import BaseModel
 from typing import Optional, List
 from app.core.settings import settings
-import httpx
+from app.services.email_client import post_email_service
+from app.services.bpl_store import save_bpl_boxes
+from app.services.job_queue import JobFailed, enqueue_job, idempotency_key, job_handler, wake_workers
+from fastapi.concurrency import run_in_threadpool
 import logging
 import base64
 
@@ -130,34 +134,23 @@ def get_bpl_for_po(po_id: int):
     with get_conn() as conn:
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get all BPLs for this PO
+                # Get all BPLs for this PO, boxes and pieces already nested
                 cur.execute(DatabaseQueries.BPL['get_for_po'], (po_id,))
                 bpls = [dict(r) for r in cur.fetchall()]
 
+                covered_item_ids = set()
                 for bpl in bpls:
                     bpl['created_at'] = str(bpl['created_at'])
                     bpl['updated_at'] = str(bpl['updated_at'])
                     bpl['packed_date'] = str(bpl['packed_date']) if bpl.get('packed_date') else None
                     bpl['expiry_date'] = str(bpl['expiry_date']) if bpl.get('expiry_date') else None
-                    # Get boxes for each BPL
-                    cur.execute(DatabaseQueries.BPL['get_boxes'], (bpl['id'],))
-                    boxes = [dict(r) for r in cur.fetchall()]
-
-                    # Fetch pieces for each box
-                    for box in boxes:
-                        cur.execute(DatabaseQueries.BPL['get_pieces'], (box['id'],))
-                        box['pieces'] = [dict(p) for p in cur.fetchall()]
-
-                    bpl['boxes'] = boxes
-
-                # Get set of po_item_ids that have BPL entries (for the green-check indicator)
-                cur.execute(DatabaseQueries.BPL['get_covered_items'], (po_id,))
-                covered_item_ids = [r['po_item_id'] for r in cur.fetchall()]
+                    # po_item_ids that have BPL entries (for the green-check indicator)
+                    covered_item_ids.update(box['po_item_id'] for box in bpl['boxes'])
 
                 return {
                     "success": True,
                     "bpls": bpls,
-                    "covered_po_item_ids": covered_item_ids,
+                    "covered_po_item_ids": sorted(covered_item_ids),
                 }
 
         except Exception as e:
@@ -169,7 +162,8 @@ def get_bpl_for_po(po_id: int):
 def save_bpl(request: SaveBPLRequest):
     """
     Save (create or update) a box packaging list for a PO + port.
-    If a BPL already exists for this PO+port, it is updated (boxes replaced).
+    If a BPL already exists for this PO+port, it is updated: only boxes and
+    pieces that were added, changed or removed since the last save are written.
     Prevents duplicate: one BPL per PO+port enforced.
     """
     if not request.boxes:
@@ -219,8 +213,6 @@ def save_bpl(request: SaveBPLRequest):
                          request.packed_date, request.expiry_date,
                          bpl_id)
                     )
-                    # Delete old boxes and re-insert
-                    cur.execute(DatabaseQueries.BPL['delete_items'], (bpl_id,))
                 else:
                     # Create new BPL
                     cur.execute(
@@ -231,32 +223,13 @@ def save_bpl(request: SaveBPLRequest):
                     )
                     bpl_id = cur.fetchone()['id']
 
-                # Insert box items + their pieces
-                for box in request.boxes:
-                    # Range mode: pieces is empty, net weight entered directly
-                    if box.pieces:
-                        net_wt = sum(p.weight_kg for p in box.pieces)
-                    else:
-                        net_wt = box.net_weight_kg or 0
-                    cur.execute(
-                        DatabaseQueries.BPL['insert_item'],
-                        (bpl_id, box.po_item_id, box.box_number, box.num_pieces,
-                         box.num_pieces, net_wt, net_wt,
-                         box.weight_range_from_kg, box.weight_range_to_kg)
-                    )
-                    bpl_item_id = cur.fetchone()['id']
-
-                    # Insert individual pieces (skipped for range mode)
-                    for piece in box.pieces:
-                        cur.execute(
-                            DatabaseQueries.BPL['insert_piece'],
-                            (bpl_item_id, piece.piece_number, piece.weight_kg)
-                        )
+                # Write only what changed since the last save, in bulk
+                changes = save_bpl_boxes(cur, bpl_id, request.boxes, existing=bool(existing))
 
                 conn.commit()
 
                 logger.info(f"Saved BPL {bpl_id} for PO {request.po_id} port {request.port_code} "
-                            f"with {len(request.boxes)} boxes (status={request.status})")
+                            f"with {len(request.boxes)} boxes (status={request.status}): {changes}")
 
                 return {
                     "success": True,
@@ -282,32 +255,43 @@ def get_vendor(vendor_code: str):
             return row
 
 
+def _purchase_order_rows(rows) -> List[dict]:
+    pos = []
+    for row in rows:
+        po = dict(row)
+        po['created_at'] = str(row['created_at'])
+        pos.append(po)
+    return pos
+
+
 @router.get("/{vendor_id}/purchase-orders")
-def get_vendor_purchase_orders(vendor_id: int, week_start: Optional[str] = Query(None)):
+def get_vendor_purchase_orders(vendor_id: int, week_start: Optional[str] = Query(None),
+                               accept: Optional[str] = Header(None)):
     """
     Get all purchase orders for a vendor, optionally filtered by week.
     week_start should be a Monday date (YYYY-MM-DD). If provided, returns POs
     created between week_start and week_start + 6 days.
+    With Accept: application/x-ndjson the POs are streamed one per line.
     """
+    if week_start:
+        query = DatabaseQueries.PURCHASE_ORDERS['get_vendor_pos_by_week']
+        params = (vendor_id, week_start, week_start)
+    else:
+        query = DatabaseQueries.PURCHASE_ORDERS['get_vendor_pos_all']
+        params = (vendor_id,)
+
+    if wants_ndjson(accept):
+        try:
+            return stream_query(query, params, _purchase_order_rows, "purchase orders")
+        except Exception as e:
+            logger.error(f"Error fetching POs for vendor {vendor_id}: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     with get_conn() as conn:
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                if week_start:
-                    cur.execute(
-                        DatabaseQueries.PURCHASE_ORDERS['get_vendor_pos_by_week'],
-                        (vendor_id, week_start, week_start)
-                    )
-                else:
-                    cur.execute(DatabaseQueries.PURCHASE_ORDERS['get_vendor_pos_all'], (vendor_id,))
-
-                rows = cur.fetchall()
-                pos = []
-                for row in rows:
-                    po = dict(row)
-                    po['created_at'] = str(row['created_at'])
-                    pos.append(po)
-
-                return {"success": True, "purchase_orders": pos}
+                cur.execute(query, params)
+                return {"success": True, "purchase_orders": _purchase_order_rows(cur.fetchall())}
 
         except Exception as e:
             logger.error(f"Error fetching POs for vendor {vendor_id}: {str(e)}")
@@ -317,189 +301,211 @@ def get_vendor_purchase_orders(vendor_id: int, week_start: Optional[str] = Query
 # ─── BPL Send Email ─────────────────────────────────────────
 
 
-@router.post("/purchase-orders/{po_id}/bpl/{port_code}/send-email")
-async def send_bpl_email(po_id: int, port_code: str):
+def _gather_bpl_email(po_id: int, port_code: str):
+    """
+    Load PO, vendor and BPL data for the BPL email.
+    Returns (po_row, bpl_row, email_payload, email_path). In upload mode the
+    payload is missing attachment_bytes; the caller fetches the file once
+    the connection has been released.
+    """
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # 1) Get PO header + vendor info
+            cur.execute(DatabaseQueries.BPL['get_po_for_email'], (po_id,))
+            po_row = cur.fetchone()
+            if not po_row:
+                raise HTTPException(status_code=404, detail="Purchase order not found")
+
+            # 2) Get BPL header for this PO + port
+            cur.execute(DatabaseQueries.BPL['get_header'], (po_id, port_code))
+            bpl_row = cur.fetchone()
+            if not bpl_row:
+                raise HTTPException(status_code=404, detail="No BPL found for this PO and port")
+
+            bpl_id = bpl_row['id']
+
+            email_payload = {
+                "po_number": po_row['po_number'],
+                "port_code": port_code,
+                "vendor_name": po_row['vendor_name'],
+                "vendor_email": po_row['vendor_email'] or "",
+                "vendor_country": po_row['vendor_country'] or "",
+                "owner_email": settings.owner_notification_email,
+                "invoice_number": bpl_row['invoice_number'] or "",
+                "air_way_bill": bpl_row['air_way_bill'] or "",
+                "packed_date": str(bpl_row['packed_date']) if bpl_row.get('packed_date') else "",
+                "expiry_date": str(bpl_row['expiry_date']) if bpl_row.get('expiry_date') else "",
+            }
+
+            if bpl_row.get('uploaded_file_path'):
+                # Upload mode: the uploaded file is forwarded as the attachment
+                email_payload["attachment_filename"] = bpl_row['uploaded_file_name']
+                return po_row, bpl_row, email_payload, "/email/bpl/send-uploaded"
+
+            # Manual mode: build structured data payload for PDF generation
+            # 3) Get BPL items (boxes) joined to PO item details
+            cur.execute(DatabaseQueries.BPL['get_items_for_email'], (bpl_id,))
+            box_rows = [dict(r) for r in cur.fetchall()]
+
+            # 4) Fetch pieces for each box
+            for box in box_rows:
+                cur.execute(DatabaseQueries.BPL['get_pieces_for_email'], (box['bpl_item_id'],))
+                box['pieces'] = [dict(p) for p in cur.fetchall()]
+
+    # 5) Group boxes by PO item (species line)
+    items_map = {}
+    for box in box_rows:
+        key = box['po_item_id']
+        if key not in items_map:
+            items_map[key] = {
+                "fish_name": box['fish_name'],
+                "cut_name": box['cut_name'],
+                "grade_name": box['grade_name'],
+                "fish_size": box['fish_size'],
+                "order_weight_kg": float(box['order_weight_kg']) if box.get('order_weight_kg') else 0,
+                "boxes": [],
+            }
+        total_weight = sum(
+            float(p['weight_kg']) for p in box['pieces']
+        ) if box['pieces'] else (float(box['net_weight_kg']) if box.get('net_weight_kg') else 0)
+
+        items_map[key]["boxes"].append({
+            "box_number": box['box_number'],
+            "num_pieces": box['num_pieces'],
+            "net_weight_kg": total_weight,
+            "weight_range_from_kg": float(box['weight_range_from_kg']) if box.get('weight_range_from_kg') is not None else None,
+            "weight_range_to_kg": float(box['weight_range_to_kg']) if box.get('weight_range_to_kg') is not None else None,
+            "pieces": [
+                {"piece_number": p['piece_number'], "weight_kg": float(p['weight_kg'])}
+                for p in box['pieces']
+            ],
+        })
+
+    items_list = list(items_map.values())
+    email_payload["total_boxes"] = sum(len(item['boxes']) for item in items_list)
+    email_payload["items"] = items_list
+    return po_row, bpl_row, email_payload, "/email/bpl/send-emails"
+
+
+def _download_bpl_file(path: str) -> bytes:
+    from google.cloud import storage as gcs_storage
+    gcs_client = gcs_storage.Client()
+    bucket = gcs_client.bucket(settings.gcs_bucket_name)
+    return bucket.blob(path).download_as_bytes()
+
+
+def _mark_bpl_sent(cur, po_id: int, port_code: str):
+    """Set the BPL to 'sent' and auto-fulfil the PO once every accepted port has been sent."""
+    cur.execute(DatabaseQueries.BPL['update_status_sent'], (po_id, port_code))
+    logger.info(f"Updated BPL status to 'sent' for PO {po_id} port {port_code}")
+
+    # Auto-fulfill: if all accepted ports now have a sent/completed BPL → fulfill
+    cur.execute(DatabaseQueries.BPL['get_accepted_port_count'], (po_id,))
+    accepted_count = cur.fetchone()['cnt']
+
+    cur.execute(DatabaseQueries.BPL['get_sent_bpl_count'], (po_id,))
+    sent_count = cur.fetchone()['cnt']
+
+    if accepted_count > 0 and sent_count >= accepted_count:
+        try:
+            _transition_po_status(
+                cur, po_id,
+                allowed_from=['accepted'],
+                new_status='fulfilled',
+                actor_role='system',
+                actor_name='system',
+                actor_code='auto'
+            )
+            logger.info(f"PO {po_id} auto-fulfilled: all {accepted_count} accepted port(s) sent")
+        except HTTPException as te:
+            # Non-fatal: PO might already be fulfilled or in unexpected state
+            logger.warning(f"Auto-fulfill skipped for PO {po_id}: {te.detail}")
+
+
+SEND_BPL_JOB = 'bpl.send'
+
+
+@job_handler(SEND_BPL_JOB)
+async def _send_bpl_email_job(payload: dict) -> dict:
     """
     Gather BPL data + vendor info for a PO/port, then call the
     email service to send branded PDF to owner and plain PDF to vendor.
     """
+    po_id, port_code = payload['po_id'], payload['port_code']
+
+    # Data gathering and the final status write use the threaded sync pool;
+    # no connection is held while GCS or the email service are working
+    po_row, bpl_row, email_payload, email_path = await run_in_threadpool(_gather_bpl_email, po_id, port_code)
+    is_upload_mode = bool(bpl_row.get('uploaded_file_path'))
+
+    if is_upload_mode:
+        try:
+            file_bytes = await run_in_threadpool(_download_bpl_file, bpl_row['uploaded_file_path'])
+            email_payload["attachment_bytes"] = base64.b64encode(file_bytes).decode('utf-8')
+            logger.info(f"Fetched BPL file from GCS for email: {bpl_row['uploaded_file_path']} ({len(file_bytes)} bytes)")
+        except Exception as gcs_err:
+            logger.error(f"GCS download failed: {gcs_err}")
+            raise HTTPException(status_code=500, detail=f"Failed to fetch uploaded file: {str(gcs_err)}")
+        logger.info(f"📧 Sending uploaded BPL email for PO {po_row['po_number']} port {port_code}")
+    else:
+        logger.info(f"📧 Sending BPL email for PO {po_row['po_number']} port {port_code}")
+
+    logger.info(f"   Vendor: {po_row['vendor_name']} ({po_row['vendor_email']})")
+    logger.info(f"   Email service: {settings.email_service_url}, upload_mode={is_upload_mode}")
+
+    # 6) Call email service
+    response = await post_email_service(email_path, email_payload, idempotency_key=idempotency_key())
+
+    if response.status_code != 200:
+        logger.error(f"❌ Email service error: {response.status_code} - {response.text}")
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Email service error: {response.text}",
+        )
+
+    email_result = response.json()
+    if not email_result.get("success", True):
+        raise JobFailed(email_result.get("message", "BPL email failed"))
+    logger.info(f"✅ BPL email sent: {email_result}")
+
+    return {"message": email_result.get("message", "BPL emails sent"), "recipients": email_result.get("recipients")}
+
+
+@router.post("/purchase-orders/{po_id}/bpl/{port_code}/send-email", status_code=202)
+def send_bpl_email(po_id: int, port_code: str):
+    """
+    Mark the BPL sent (auto-fulfilling the PO when it was the last accepted
+    port) and queue its email in the same transaction; a job worker sends it.
+    """
     with get_conn() as conn:
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # 1) Get PO header + vendor info
-                cur.execute(DatabaseQueries.BPL['get_po_for_email'], (po_id,))
-                po_row = cur.fetchone()
-                if not po_row:
-                    raise HTTPException(status_code=404, detail="Purchase order not found")
-
-                # 2) Get BPL header for this PO + port
                 cur.execute(DatabaseQueries.BPL['get_header'], (po_id, port_code))
-                bpl_row = cur.fetchone()
-                if not bpl_row:
+                if not cur.fetchone():
                     raise HTTPException(status_code=404, detail="No BPL found for this PO and port")
 
-                bpl_id = bpl_row['id']
-                is_upload_mode = bool(bpl_row.get('uploaded_file_path'))
-
-                if is_upload_mode:
-                    # Upload mode: fetch file from GCS and forward as attachment
-                    email_payload = {
-                        "po_number": po_row['po_number'],
-                        "port_code": port_code,
-                        "vendor_name": po_row['vendor_name'],
-                        "vendor_email": po_row['vendor_email'] or "",
-                        "vendor_country": po_row['vendor_country'] or "",
-                        "owner_email": settings.owner_notification_email,
-                        "invoice_number": bpl_row['invoice_number'] or "",
-                        "air_way_bill": bpl_row['air_way_bill'] or "",
-                        "packed_date": str(bpl_row['packed_date']) if bpl_row.get('packed_date') else "",
-                        "expiry_date": str(bpl_row['expiry_date']) if bpl_row.get('expiry_date') else "",
-                        "attachment_filename": bpl_row['uploaded_file_name'],
-                    }
-                    try:
-                        from google.cloud import storage as gcs_storage
-                        gcs_client = gcs_storage.Client()
-                        bucket = gcs_client.bucket(settings.gcs_bucket_name)
-                        blob = bucket.blob(bpl_row['uploaded_file_path'])
-                        file_bytes = blob.download_as_bytes()
-                        email_payload["attachment_bytes"] = base64.b64encode(file_bytes).decode('utf-8')
-                        logger.info(f"Fetched BPL file from GCS for email: {bpl_row['uploaded_file_path']} ({len(file_bytes)} bytes)")
-                    except Exception as gcs_err:
-                        logger.error(f"GCS download failed: {gcs_err}")
-                        raise HTTPException(status_code=500, detail=f"Failed to fetch uploaded file: {str(gcs_err)}")
-
-                    email_endpoint = f"{settings.email_service_url}/email/bpl/send-uploaded"
-                    logger.info(f"📧 Sending uploaded BPL email for PO {po_row['po_number']} port {port_code}")
-                else:
-                    # Manual mode: build structured data payload for PDF generation
-                    # 3) Get BPL items (boxes) joined to PO item details
-                    cur.execute(DatabaseQueries.BPL['get_items_for_email'], (bpl_id,))
-                    box_rows = [dict(r) for r in cur.fetchall()]
-
-                    # 4) Fetch pieces for each box
-                    for box in box_rows:
-                        cur.execute(DatabaseQueries.BPL['get_pieces_for_email'], (box['bpl_item_id'],))
-                        box['pieces'] = [dict(p) for p in cur.fetchall()]
-
-                    # 5) Group boxes by PO item (species line)
-                    items_map = {}
-                    for box in box_rows:
-                        key = box['po_item_id']
-                        if key not in items_map:
-                            items_map[key] = {
-                                "fish_name": box['fish_name'],
-                                "cut_name": box['cut_name'],
-                                "grade_name": box['grade_name'],
-                                "fish_size": box['fish_size'],
-                                "order_weight_kg": float(box['order_weight_kg']) if box.get('order_weight_kg') else 0,
-                                "boxes": [],
-                            }
-                        total_weight = sum(
-                            float(p['weight_kg']) for p in box['pieces']
-                        ) if box['pieces'] else (float(box['net_weight_kg']) if box.get('net_weight_kg') else 0)
-
-                        items_map[key]["boxes"].append({
-                            "box_number": box['box_number'],
-                            "num_pieces": box['num_pieces'],
-                            "net_weight_kg": total_weight,
-                            "weight_range_from_kg": float(box['weight_range_from_kg']) if box.get('weight_range_from_kg') is not None else None,
-                            "weight_range_to_kg": float(box['weight_range_to_kg']) if box.get('weight_range_to_kg') is not None else None,
-                            "pieces": [
-                                {"piece_number": p['piece_number'], "weight_kg": float(p['weight_kg'])}
-                                for p in box['pieces']
-                            ],
-                        })
-
-                    items_list = list(items_map.values())
-                    total_boxes = sum(len(item['boxes']) for item in items_list)
-
-                    email_payload = {
-                        "po_number": po_row['po_number'],
-                        "port_code": port_code,
-                        "vendor_name": po_row['vendor_name'],
-                        "vendor_email": po_row['vendor_email'] or "",
-                        "vendor_country": po_row['vendor_country'] or "",
-                        "owner_email": settings.owner_notification_email,
-                        "invoice_number": bpl_row['invoice_number'] or "",
-                        "air_way_bill": bpl_row['air_way_bill'] or "",
-                        "packed_date": str(bpl_row['packed_date']) if bpl_row.get('packed_date') else "",
-                        "expiry_date": str(bpl_row['expiry_date']) if bpl_row.get('expiry_date') else "",
-                        "total_boxes": total_boxes,
-                        "items": items_list,
-                    }
-                    email_endpoint = f"{settings.email_service_url}/email/bpl/send-emails"
-                    logger.info(f"📧 Sending BPL email for PO {po_row['po_number']} port {port_code}")
-
-                logger.info(f"   Vendor: {po_row['vendor_name']} ({po_row['vendor_email']})")
-                logger.info(f"   Email service: {settings.email_service_url}, upload_mode={is_upload_mode}")
-
-            # 7) Call email service (outside the DB cursor context)
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    email_endpoint,
-                    json=email_payload,
-                    timeout=60.0,
+                _mark_bpl_sent(cur, po_id, port_code)
+                job_id = enqueue_job(
+                    cur, SEND_BPL_JOB, {"po_id": po_id, "port_code": port_code},
+                    reference=f"bpl:{po_id}:{port_code}"
                 )
-
-                if response.status_code != 200:
-                    logger.error(f"❌ Email service error: {response.status_code} - {response.text}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Email service error: {response.text}",
-                    )
-
-                email_result = response.json()
-                logger.info(f"✅ BPL email sent: {email_result}")
-
-                # 8) Update BPL status to 'sent' in DB, then check for auto-fulfill
-                if email_result.get("success"):
-                    with get_conn() as conn2:
-                        try:
-                            with conn2.cursor(cursor_factory=RealDictCursor) as cur2:
-                                cur2.execute(DatabaseQueries.BPL['update_status_sent'], (po_id, port_code))
-                                logger.info(f"Updated BPL status to 'sent' for PO {po_id} port {port_code}")
-
-                                # Auto-fulfill: if all accepted ports now have a sent/completed BPL → fulfill
-                                cur2.execute(DatabaseQueries.BPL['get_accepted_port_count'], (po_id,))
-                                accepted_count = cur2.fetchone()['cnt']
-
-                                cur2.execute(DatabaseQueries.BPL['get_sent_bpl_count'], (po_id,))
-                                sent_count = cur2.fetchone()['cnt']
-
-                                if accepted_count > 0 and sent_count >= accepted_count:
-                                    try:
-                                        _transition_po_status(
-                                            cur2, po_id,
-                                            allowed_from=['accepted'],
-                                            new_status='fulfilled',
-                                            actor_role='system',
-                                            actor_name='system',
-                                            actor_code='auto'
-                                        )
-                                        logger.info(f"PO {po_id} auto-fulfilled: all {accepted_count} accepted port(s) sent")
-                                    except HTTPException as te:
-                                        # Non-fatal: PO might already be fulfilled or in unexpected state
-                                        logger.warning(f"Auto-fulfill skipped for PO {po_id}: {te.detail}")
-
-                                conn2.commit()
-                        except Exception as db_err:
-                            logger.error(f"Failed to update BPL status: {db_err}")
-
-                return {
-                    "success": email_result.get("success", True),
-                    "message": email_result.get("message", "BPL emails sent"),
-                }
-
-        except httpx.RequestError as e:
-            logger.error(f"Email service connection error: {str(e)}")
-            raise HTTPException(status_code=503, detail="Email service unavailable")
+                conn.commit()
         except HTTPException:
+            conn.rollback()
             raise
         except Exception as e:
-            import traceback
-            logger.error(f"Error sending BPL email: {str(e)}\n{traceback.format_exc()}")
+            conn.rollback()
+            logger.error(f"Error sending BPL email: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    wake_workers()
+    return {
+        "success": True,
+        "queued": True,
+        "job_id": job_id,
+        "message": "BPL emails queued",
+    }
+
 
 # ─── PO Status Workflow ──────────────────────────────────────
 
@@ -11,7 +11,33 @@ class Settings(BaseSettings):
     db_password: str
     db_host: str
     db_port: int
-    
+
+    # Database Connection Pool
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_pool_acquire_timeout: float = 10.0  # seconds a request waits for a free connection
+    db_pool_max_lifetime: float = 1800.0  # recycle connections older than this (seconds)
+    db_pool_max_idle: float = 300.0  # close connections idle longer than this (seconds)
+    db_pool_pre_ping: bool = True  # validate idle connections before handing them out
+    db_async_pool_min_size: int = 1  # async pool (psycopg 3) used by async def handlers
+    db_async_pool_max_size: int = 10
+    db_prepared_statements: bool = True  # run catalog queries as server-side prepared statements
+    reference_cache_ttl: float = 3600.0  # seconds dictionary/fish/cut/grade/size data is served from memory
+    job_workers: int = 2  # job queue worker coroutines per instance (0 disables them)
+    job_poll_interval: float = 2.0  # seconds an idle worker waits before checking for due jobs
+    job_timeout: float = 240.0  # seconds a job handler may run
+    job_lease_seconds: float = 300.0  # a running job not finished by then is claimed again
+    job_max_attempts: int = 6
+    job_retry_base_delay: float = 30.0  # seconds before the first retry, doubling after each failure
+    job_retry_max_delay: float = 1800.0
+    job_retention_days: int = 14  # finished jobs are purged after this many days
+    job_shutdown_timeout: float = 20.0  # seconds to let running jobs finish on shutdown
+    estimate_search_page_size: int = 200  # rows per page of /estimates/search when the client sends no limit
+    estimate_search_max_page_size: int = 1000
+    estimate_search_cache_max_bytes: int = 32 * 1024 * 1024  # cached search responses per instance (0 disables)
+    stream_fetch_size: int = 500  # rows per server-side cursor fetch in application/x-ndjson responses
+    db_connection_guard_strict: bool = False  # raise instead of logging when external I/O runs while a pooled connection is held (tests)
+
     # CORS Configuration - comma-separated origins
     cors_origins: str
     cors_allow_credentials: bool
@@ -25,6 +51,12 @@ class Settings(BaseSettings):
     # External Services
     email_service_url: str
     owner_notification_email: str
+    email_service_max_connections: int = 20  # shared keep-alive client to the email service
+    email_service_max_keepalive: int = 10
+    email_service_http2: bool = False  # needs the h2 package (httpx[http2])
+    email_service_retries: int = 2  # retries for calls that never reached the service / 502 / 503
+    email_service_breaker_threshold: int = 5  # consecutive failures before calls fail fast
+    email_service_breaker_reset: float = 30.0  # seconds before a trial call is let through
 
     # GCS (file uploads)
     gcs_bucket_name: Optional[str] = None
@@ -0,0 +1,75 @@
+"""
+Async data-access path for ``async def`` route handlers.
+
+psycopg2 blocks the event loop on every query, so async handlers use a
+psycopg 3 AsyncConnectionPool instead. The SQL in DatabaseQueries runs
+unchanged - psycopg 3 uses the same %s placeholders.
+"""
+from contextlib import asynccontextmanager
+from psycopg import pq
+from psycopg_pool import AsyncConnectionPool
+from app.core.settings import settings
+from app.db.instrumentation import InstrumentedAsyncCursor
+from app.db.prepared import PreparedAsyncCursor
+from app.db.guard import track_connection
+
+async_db_pool = None
+
+# Room for every catalog query plus the filtered search variants; psycopg's
+# default of 100 would start evicting prepared plans.
+PREPARED_MAX = 256
+
+async def _configure_connection(conn):
+    conn.prepared_max = PREPARED_MAX
+
+async def init_async_db_pool():
+    global async_db_pool
+    if async_db_pool is None:
+        async_db_pool = AsyncConnectionPool(
+            conninfo="",
+            kwargs={
+                "dbname": settings.db_name,
+                "user": settings.db_user,
+                "password": settings.db_password,
+                "host": settings.db_host,
+                "port": settings.db_port,
+                "cursor_factory": PreparedAsyncCursor if settings.db_prepared_statements else InstrumentedAsyncCursor,
+            },
+            min_size=settings.db_async_pool_min_size,
+            max_size=settings.db_async_pool_max_size,
+            timeout=settings.db_pool_acquire_timeout,
+            max_lifetime=settings.db_pool_max_lifetime,
+            max_idle=settings.db_pool_max_idle,
+            check=AsyncConnectionPool.check_connection if settings.db_pool_pre_ping else None,
+            configure=_configure_connection,
+            open=False,
+        )
+        await async_db_pool.open(wait=True)
+    return async_db_pool
+
+async def close_async_db_pool():
+    global async_db_pool
+    if async_db_pool:
+        await async_db_pool.close()
+        async_db_pool = None
+
+def get_async_pool_stats():
+    """Snapshot of async pool counters, or None if the pool isn't initialized"""
+    return async_db_pool.get_stats() if async_db_pool else None
+
+@asynccontextmanager
+async def get_async_conn():
+    """
+    Async counterpart of get_conn(). Like the sync pool, anything left
+    uncommitted when the block exits is rolled back, never committed.
+    """
+    conn = await async_db_pool.getconn()
+    try:
+        with track_connection():
+            yield conn
+    finally:
+        try:
+            if conn.info.transaction_status in (pq.TransactionStatus.INTRANS, pq.TransactionStatus.INERROR):
+                await conn.rollback()
+        finally:
+            await async_db_pool.putconn(conn)
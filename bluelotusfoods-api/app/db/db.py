@@ -1,5 +1,8 @@
 from contextlib import contextmanager
-from psycopg2 import pool
+from app.db.pool import ConnectionPool
+from app.db.instrumentation import InstrumentedConnection
+from app.db.prepared import PreparedStatementConnection
+from app.db.guard import track_connection
 from app.core.settings import settings
 
 db_pool = None
@@ -7,21 +10,27 @@ db_pool = None
 def init_db_pool():
     global db_pool
     if db_pool is None:
-        db_pool = pool.SimpleConnectionPool(
-            minconn=1,
-            maxconn=10,
+        db_pool = ConnectionPool(
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            acquire_timeout=settings.db_pool_acquire_timeout,
+            max_lifetime=settings.db_pool_max_lifetime,
+            max_idle=settings.db_pool_max_idle,
+            pre_ping=settings.db_pool_pre_ping,
             dbname=settings.db_name,
             user=settings.db_user,
             password=settings.db_password,
             host=settings.db_host,
-            port=settings.db_port
+            port=settings.db_port,
+            connection_factory=PreparedStatementConnection if settings.db_prepared_statements else InstrumentedConnection
         )
+        db_pool.open()
     return db_pool
 
 def close_db_pool():
     global db_pool
     if db_pool:
-        db_pool.closeall()
+        db_pool.close()
         db_pool = None
 
 def get_connection():
@@ -30,10 +39,15 @@ def get_connection():
 def release_connection(conn):
     db_pool.putconn(conn)
 
+def get_pool_stats():
+    """Snapshot of pool counters, or None if the pool isn't initialized"""
+    return db_pool.stats() if db_pool else None
+
 @contextmanager
 def get_conn():
     conn = db_pool.getconn()
     try:
-        yield conn
+        with track_connection():
+            yield conn
     finally:
         db_pool.putconn(conn)
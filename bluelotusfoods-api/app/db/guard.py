@@ -0,0 +1,49 @@
+"""
+Tracks pooled connections held by the current request.
+
+get_conn() and get_async_conn() register the connection in a ContextVar
+for as long as it is checked out. Code about to wait on something outside
+the database, such as a call to the email service, checks with
+ensure_no_connection_held() that it isn't tying up a pooled connection
+while it waits. A violation is logged; with
+settings.db_connection_guard_strict (as the tests run) it raises instead.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_held_connections: ContextVar[int] = ContextVar('held_db_connections', default=0)
+
+
+class ConnectionHeldError(RuntimeError):
+    """External I/O was attempted while a pooled connection was checked out."""
+
+
+@contextmanager
+def track_connection():
+    _held_connections.set(_held_connections.get() + 1)
+    try:
+        yield
+    finally:
+        # Decrement rather than reset a token: a streaming response releases
+        # its connection from the response's task, a copy of this context
+        _held_connections.set(_held_connections.get() - 1)
+
+
+def connections_held() -> int:
+    return _held_connections.get()
+
+
+def ensure_no_connection_held(action: str):
+    held = _held_connections.get()
+    if not held:
+        return
+    message = (f"{action} attempted while holding {held} pooled database connection(s); "
+               f"commit and release the connection first")
+    if settings.db_connection_guard_strict:
+        raise ConnectionHeldError(message)
+    logger.warning(message)
@@ -0,0 +1,268 @@
+"""
+Per-query instrumentation keyed by DatabaseQueries name.
+
+Every cursor handed out by the sync and async pools records, for the query
+it ran, call count, errors, a latency histogram, rows fetched and an
+approximate byte count of the fetched values. Queries are identified by
+their catalog name (e.g. ``BUYER_ESTIMATES.get_items``); base queries that
+get filters appended in code (``*_base``) are matched by prefix, and SQL
+written inline in a route is reported as ``inline``.
+"""
+import threading
+import time
+
+import psycopg2.extensions
+from psycopg import AsyncCursor
+
+from app.db.queries import DatabaseQueries
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+INLINE_QUERY = 'inline'
+
+
+def _build_catalog():
+    exact = {}
+    prefixes = []
+    for group, queries in vars(DatabaseQueries).items():
+        if group.startswith('_') or not isinstance(queries, dict):
+            continue
+        for key, sql in queries.items():
+            name = f"{group}.{key}"
+            # The same SQL can be registered under several keys; keep the first
+            exact.setdefault(sql, name)
+            if key.endswith('_base'):
+                prefixes.append((sql, name))
+    return exact, prefixes
+
+
+_EXACT_NAMES, _BASE_PREFIXES = _build_catalog()
+
+
+def query_name(sql) -> str:
+    """Resolve SQL text to its DatabaseQueries name."""
+    if not isinstance(sql, str):
+        return INLINE_QUERY
+    name = _EXACT_NAMES.get(sql)
+    if name:
+        return name
+    for base, base_name in _BASE_PREFIXES:
+        if sql.startswith(base):
+            return base_name
+    return INLINE_QUERY
+
+
+def _row_bytes(row) -> int:
+    values = row.values() if isinstance(row, dict) else row
+    size = 0
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, (str, bytes, bytearray, memoryview)):
+            size += len(v)
+        else:
+            size += 8
+    return size
+
+
+class _QueryStats:
+    __slots__ = ('calls', 'errors', 'total_time', 'max_time', 'buckets', 'rows', 'bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.rows = 0
+        self.bytes = 0
+
+
+class QueryMetrics:
+    """Thread-safe registry of per-query stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _get(self, name) -> _QueryStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _QueryStats()
+        return stats
+
+    def record_execute(self, name: str, duration: float, error: bool = False):
+        idx = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                idx = i
+                break
+        with self._lock:
+            stats = self._get(name)
+            stats.calls += 1
+            stats.total_time += duration
+            if duration > stats.max_time:
+                stats.max_time = duration
+            stats.buckets[idx] += 1
+            if error:
+                stats.errors += 1
+
+    def record_fetch(self, name: str, rows):
+        if not rows:
+            return
+        size = sum(_row_bytes(r) for r in rows)
+        with self._lock:
+            stats = self._get(name)
+            stats.rows += len(rows)
+            stats.bytes += size
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> dict:
+        """Copy of the raw stats: {name: {calls, errors, total_time, max_time, buckets, rows, bytes}}"""
+        with self._lock:
+            return {
+                name: {
+                    'calls': s.calls,
+                    'errors': s.errors,
+                    'total_time': s.total_time,
+                    'max_time': s.max_time,
+                    'buckets': list(s.buckets),
+                    'rows': s.rows,
+                    'bytes': s.bytes,
+                }
+                for name, s in self._stats.items()
+            }
+
+
+query_metrics = QueryMetrics()
+
+
+def estimate_percentile(buckets: list, calls: int, pct: float) -> float:
+    """Upper bound of the histogram bucket containing the given percentile (seconds)."""
+    if not calls:
+        return 0.0
+    target = calls * pct
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= target:
+            return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float('inf')
+    return float('inf')
+
+
+# ─── psycopg2 (sync pool) ──────────────────────────────────
+
+
+class _InstrumentedCursorMixin:
+    _query_name = INLINE_QUERY
+
+    def execute(self, query, vars=None):
+        self._query_name = query_name(query)
+        start = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            query_metrics.record_execute(self._query_name, time.perf_counter() - start, error=True)
+            raise
+        query_metrics.record_execute(self._query_name, time.perf_counter() - start)
+        return result
+
+    def executemany(self, query, vars_list):
+        self._query_name = query_name(query)
+        start = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        except Exception:
+            query_metrics.record_execute(self._query_name, time.perf_counter() - start, error=True)
+            raise
+        query_metrics.record_execute(self._query_name, time.perf_counter() - start)
+        return result
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            query_metrics.record_fetch(self._query_name, (row,))
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        query_metrics.record_fetch(self._query_name, rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        query_metrics.record_fetch(self._query_name, rows)
+        return rows
+
+
+_cursor_classes = {}
+
+
+def _cursor_class(mixins: tuple, base):
+    cls = _cursor_classes.get((mixins, base))
+    if cls is None:
+        cls = type(f"Instrumented{base.__name__}", mixins + (base,), {})
+        _cursor_classes[(mixins, base)] = cls
+    return cls
+
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """psycopg2 connection whose cursors (any cursor_factory) record query metrics."""
+
+    _cursor_mixins = (_InstrumentedCursorMixin,)
+
+    def cursor(self, *args, **kwargs):
+        base = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = _cursor_class(self._cursor_mixins, base)
+        return super().cursor(*args, **kwargs)
+
+
+# ─── psycopg 3 (async pool) ────────────────────────────────
+
+
+class InstrumentedAsyncCursor(AsyncCursor):
+    """psycopg 3 async cursor that records query metrics."""
+
+    _query_name = INLINE_QUERY
+
+    async def execute(self, query, params=None, **kwargs):
+        self._query_name = query_name(query)
+        start = time.perf_counter()
+        try:
+            result = await super().execute(query, params, **kwargs)
+        except Exception:
+            query_metrics.record_execute(self._query_name, time.perf_counter() - start, error=True)
+            raise
+        query_metrics.record_execute(self._query_name, time.perf_counter() - start)
+        return result
+
+    async def executemany(self, query, params_seq, **kwargs):
+        self._query_name = query_name(query)
+        start = time.perf_counter()
+        try:
+            result = await super().executemany(query, params_seq, **kwargs)
+        except Exception:
+            query_metrics.record_execute(self._query_name, time.perf_counter() - start, error=True)
+            raise
+        query_metrics.record_execute(self._query_name, time.perf_counter() - start)
+        return result
+
+    async def fetchone(self):
+        row = await super().fetchone()
+        if row is not None:
+            query_metrics.record_fetch(self._query_name, (row,))
+        return row
+
+    async def fetchmany(self, size=0):
+        rows = await super().fetchmany(size)
+        query_metrics.record_fetch(self._query_name, rows)
+        return rows
+
+    async def fetchall(self):
+        rows = await super().fetchall()
+        query_metrics.record_fetch(self._query_name, rows)
+        return rows
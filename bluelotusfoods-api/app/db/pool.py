@@ -0,0 +1,314 @@
+"""
+Thread-safe, bounded connection pool for psycopg2.
+
+FastAPI runs our sync ``def`` routes in its threadpool, so connections are
+handed out under a lock. When every connection is checked out, callers wait
+in line (up to ``acquire_timeout``) instead of failing immediately the way
+psycopg2's SimpleConnectionPool does.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+# A connection that finished a query this recently is known to be alive,
+# so pre-ping is skipped for it.
+_PING_GRACE_SECONDS = 5.0
+
+
+class PoolError(Exception):
+    """Base error for connection pool failures."""
+
+
+class PoolTimeoutError(PoolError):
+    """No connection became available within the acquire timeout."""
+
+
+class _PooledConnection:
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Bounded pool with a wait queue, acquire timeout, max-lifetime and idle
+    recycling, and pre-ping validation of idle connections.
+
+    Keeps the getconn()/putconn() interface of psycopg2.pool so callers
+    don't change.
+    """
+
+    def __init__(self, min_size: int, max_size: int, acquire_timeout: float,
+                 max_lifetime: float, max_idle: float, pre_ping: bool = True,
+                 **connect_kwargs):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.pre_ping = pre_ping
+        self._connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        self._idle = deque()       # most recently used on the right
+        self._in_use = {}          # id(conn) -> (_PooledConnection, checkout start)
+        self._size = 0             # open connections, including ones being opened
+        self._waiting = 0
+        self._closed = False
+
+        self._counters = {
+            'acquisitions': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'checkout_time_total': 0.0,
+            'checkout_time_max': 0.0,
+            'exhausted': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+        }
+
+    # ─── Lifecycle ─────────────────────────────────────────────
+
+    def open(self):
+        """Open min_size connections up front. Failures propagate to the caller."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+            with self._cond:
+                self._idle.appendleft(entry)
+                self._cond.notify()
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_conn(entry.conn)
+
+    closeall = close
+
+    # ─── Checkout / return ─────────────────────────────────────
+
+    def getconn(self, timeout: float = None):
+        """
+        Check out a connection, waiting up to ``timeout`` seconds (defaults to
+        acquire_timeout) for one to be returned when the pool is at max_size.
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['exhausted'] += 1
+                    logger.warning(f"Connection pool exhausted: {self.max_size} in use, "
+                                   f"{self._waiting} waiting, gave up after {timeout:.1f}s")
+                    raise PoolTimeoutError(
+                        f"Timed out after {timeout:.1f}s waiting for a database connection"
+                    )
+                waited = True
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        try:
+            entry = self._connect() if entry is None else self._validate(entry)
+        except Exception:
+            self._release_slot()
+            raise
+
+        now = time.monotonic()
+        wait_time = now - start
+        with self._cond:
+            self._in_use[id(entry.conn)] = (entry, now)
+            self._counters['acquisitions'] += 1
+            if waited:
+                self._counters['waits'] += 1
+                self._counters['wait_time_total'] += wait_time
+                self._counters['wait_time_max'] = max(self._counters['wait_time_max'], wait_time)
+        return entry.conn
+
+    def putconn(self, conn):
+        """Return a connection. Open transactions are rolled back; broken connections are dropped."""
+        now = time.monotonic()
+        with self._cond:
+            checked_out = self._in_use.pop(id(conn), None)
+        if checked_out is None:
+            raise PoolError("connection was not checked out from this pool")
+        entry, checkout_start = checked_out
+
+        keep = not self._closed and self._reset(conn)
+
+        with self._cond:
+            held = now - checkout_start
+            self._counters['checkout_time_total'] += held
+            self._counters['checkout_time_max'] = max(self._counters['checkout_time_max'], held)
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+                self._cond.notify()
+            expired = self._pop_expired_idle(now)
+
+        if not keep:
+            self._close_conn(conn)
+            self._release_slot()
+        for stale in expired:
+            self._close_conn(stale.conn)
+
+    # ─── Stats ─────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._cond:
+            c = dict(self._counters)
+            size, idle, waiting = self._size, len(self._idle), self._waiting
+            in_use = len(self._in_use)
+        returned = c['acquisitions'] - in_use
+        return {
+            'size': size,
+            'idle': idle,
+            'in_use': in_use,
+            'waiting': waiting,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'acquisitions': c['acquisitions'],
+            'waits': c['waits'],
+            'wait_time_total_ms': round(c['wait_time_total'] * 1000, 3),
+            'wait_time_avg_ms': round(c['wait_time_total'] * 1000 / c['waits'], 3) if c['waits'] else 0.0,
+            'wait_time_max_ms': round(c['wait_time_max'] * 1000, 3),
+            'checkout_time_total_ms': round(c['checkout_time_total'] * 1000, 3),
+            'checkout_time_avg_ms': round(c['checkout_time_total'] * 1000 / returned, 3) if returned > 0 else 0.0,
+            'checkout_time_max_ms': round(c['checkout_time_max'] * 1000, 3),
+            'exhausted': c['exhausted'],
+            'connections_created': c['connections_created'],
+            'connections_closed': c['connections_closed'],
+            'recycled': c['recycled'],
+            'ping_failures': c['ping_failures'],
+        }
+
+    # ─── Internals ─────────────────────────────────────────────
+
+    def _connect(self) -> _PooledConnection:
+        conn = psycopg2.connect(**self._connect_kwargs)
+        with self._cond:
+            self._counters['connections_created'] += 1
+        return _PooledConnection(conn)
+
+    def _validate(self, entry: _PooledConnection) -> _PooledConnection:
+        """Replace the connection if it is expired, closed, or fails pre-ping."""
+        now = time.monotonic()
+        expired = (
+            (self.max_lifetime and now - entry.created_at > self.max_lifetime)
+            or (self.max_idle and now - entry.last_used > self.max_idle)
+        )
+        if expired:
+            with self._cond:
+                self._counters['recycled'] += 1
+            self._close_conn(entry.conn)
+            return self._connect()
+
+        if entry.conn.closed:
+            self._close_conn(entry.conn)
+            return self._connect()
+
+        if self.pre_ping and now - entry.last_used > _PING_GRACE_SECONDS and not self._ping(entry.conn):
+            with self._cond:
+                self._counters['ping_failures'] += 1
+            logger.warning("Discarding pooled connection that failed pre-ping")
+            self._close_conn(entry.conn)
+            return self._connect()
+
+        return entry
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        try:
+            conn.autocommit = True
+            try:
+                cur = extensions.cursor(conn)
+                cur.execute("SELECT 1")
+                cur.close()
+            finally:
+                conn.autocommit = False
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        """Roll back anything left open. Returns False if the connection is unusable."""
+        if conn.closed:
+            return False
+        status = conn.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+
+    def _pop_expired_idle(self, now: float) -> list:
+        """Detach idle connections past max_idle, keeping at least min_size open. Caller holds the lock."""
+        expired = []
+        while (self.max_idle and self._idle and self._size > self.min_size
+               and now - self._idle[0].last_used > self.max_idle):
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self._counters['recycled'] += 1
+        return expired
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _close_conn(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+        with self._cond:
+            self._counters['connections_closed'] += 1
@@ -0,0 +1,162 @@
+"""
+Server-side prepared statements for the static query catalog.
+
+Each fixed query in DatabaseQueries is PREPAREd once per pooled psycopg2
+connection, the first time that connection runs it, and afterwards executed
+by name so Postgres reuses the parse/plan work. Queries that get filters
+appended in code (``*_base``) aren't in the catalog as final SQL and run
+as before, as does inline SQL.
+
+The async (psycopg 3) path doesn't need the PREPARE/EXECUTE rewrite since
+psycopg prepares statements natively; PreparedAsyncCursor just asks it to
+prepare catalog queries on first use instead of after the default threshold.
+"""
+import logging
+import re
+import threading
+
+import psycopg2
+import psycopg2.extensions
+
+from app.db.queries import DatabaseQueries
+from app.db.instrumentation import InstrumentedConnection, InstrumentedAsyncCursor, _InstrumentedCursorMixin
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r'%%|%s|%\(')
+
+
+class PreparedStatement:
+    __slots__ = ('name', 'prepare_sql', 'execute_sql', 'param_count')
+
+    def __init__(self, name: str, prepare_sql: str, param_count: int):
+        self.name = name
+        self.prepare_sql = prepare_sql
+        self.param_count = param_count
+        if param_count:
+            self.execute_sql = f"EXECUTE {name} ({', '.join(['%s'] * param_count)})"
+        else:
+            self.execute_sql = f"EXECUTE {name}"
+
+
+def _to_server_params(sql: str):
+    """Rewrite %s placeholders to $1..$n. Returns (sql, count), or None for named (%(x)s) params."""
+    count = 0
+    parts = []
+    pos = 0
+    for m in _PLACEHOLDER.finditer(sql):
+        token = m.group()
+        if token == '%(':
+            return None
+        parts.append(sql[pos:m.start()])
+        if token == '%%':
+            parts.append('%')
+        else:
+            count += 1
+            parts.append(f'${count}')
+        pos = m.end()
+    parts.append(sql[pos:])
+    return ''.join(parts), count
+
+
+def _build_registry():
+    registry = {}
+    for group, queries in vars(DatabaseQueries).items():
+        if group.startswith('_') or not isinstance(queries, dict):
+            continue
+        for key, sql in queries.items():
+            if key.endswith('_base') or sql in registry:
+                continue
+            converted = _to_server_params(sql)
+            if converted is None:
+                continue
+            server_sql, count = converted
+            name = f"q_{group}_{key}".lower()
+            registry[sql] = PreparedStatement(name, f"PREPARE {name} AS {server_sql}", count)
+    return registry
+
+
+_REGISTRY = _build_registry()
+
+# Statements Postgres can never prepare because a parameter's type can't be
+# inferred from the SQL. They run unprepared from then on.
+_UNPREPARABLE_CODES = {'42P18', '42P08', '42804'}
+_unpreparable = set()
+_unpreparable_lock = threading.Lock()
+
+
+def statement_for(sql):
+    """The catalog PreparedStatement for this exact SQL, or None."""
+    if not isinstance(sql, str):
+        return None
+    return _REGISTRY.get(sql)
+
+
+def is_catalog_query(sql) -> bool:
+    return statement_for(sql) is not None
+
+
+class _PreparedCursorMixin:
+
+    def execute(self, query, vars=None):
+        stmt = statement_for(query) if self.name is None else None
+        if stmt is None or stmt.name in _unpreparable:
+            return super().execute(query, vars)
+
+        if stmt.param_count:
+            if not isinstance(vars, (tuple, list)) or len(vars) != stmt.param_count:
+                return super().execute(query, vars)
+        elif vars:
+            return super().execute(query, vars)
+
+        prepared = self.connection._prepared_statements
+        if stmt.name not in prepared:
+            if not self._prepare(stmt):
+                return super().execute(query, vars)
+            prepared.add(stmt.name)
+
+        return super().execute(stmt.execute_sql, vars if stmt.param_count else None)
+
+    def _prepare(self, stmt: PreparedStatement) -> bool:
+        # A failed PREPARE would abort the caller's transaction, so guard it
+        # with a savepoint. Prepared statements aren't transactional: one
+        # created here survives a later rollback of the surrounding transaction.
+        conn = self.connection
+        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            return False
+        try:
+            if conn.autocommit:
+                super().execute(stmt.prepare_sql)
+            else:
+                super().execute(f"SAVEPOINT _prepare; {stmt.prepare_sql}; RELEASE SAVEPOINT _prepare")
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise
+        except psycopg2.Error as e:
+            if not conn.autocommit:
+                super().execute("ROLLBACK TO SAVEPOINT _prepare; RELEASE SAVEPOINT _prepare")
+            if e.pgcode in _UNPREPARABLE_CODES:
+                with _unpreparable_lock:
+                    _unpreparable.add(stmt.name)
+                logger.warning(f"Could not prepare {stmt.name}, running it unprepared: {e}")
+            # Anything else (missing table, etc.) will surface from the plain execute
+            return False
+
+
+class PreparedStatementConnection(InstrumentedConnection):
+    """Instrumented psycopg2 connection that runs catalog queries as prepared statements."""
+
+    _cursor_mixins = (_InstrumentedCursorMixin, _PreparedCursorMixin)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared_statements = set()
+
+
+class PreparedAsyncCursor(InstrumentedAsyncCursor):
+    """Async cursor that has psycopg prepare catalog queries on their first execution."""
+
+    async def execute(self, query, params=None, *, prepare=None, **kwargs):
+        if prepare is None and params is not None and is_catalog_query(query):
+            prepare = True
+        return await super().execute(query, params, prepare=prepare, **kwargs)
@@ -29,7 +29,8 @@ GET_VENDOR_BY_CODE = """
 """
 
 GET_VENDOR_BY_NAME = """
-    SELECT id FROM vendors WHERE name = %s AND active = TRUE
+    SELECT id, code, country, contact_email, is_email_enabled
+    FROM vendors WHERE name = %s AND active = TRUE
 """
 
 GET_VENDOR_CODE = """
@@ -39,16 +40,17 @@ GET_VENDOR_CODE = """
 # =====================================================
 # DICTIONARY QUERIES
 # =====================================================
-GET_DICTIONARY_BY_CATEGORY = """
-    SELECT id, code, name, description
+# Every active entry, grouped by category in the reference-data cache
+GET_DICTIONARY_ALL = """
+    SELECT category, id, code, name, description
     FROM dictionary
-    WHERE category = %s AND active = TRUE
-    ORDER BY name
+    WHERE active = TRUE
+    ORDER BY category, name
 """
 
-GET_DICTIONARY_BY_CODE = """
-    SELECT id FROM dictionary
-    WHERE category = 'DESTINATION' AND code = %s AND active = TRUE
+GET_DESTINATION_IDS = """
+    SELECT code, id FROM dictionary
+    WHERE category = 'DESTINATION' AND active = TRUE
 """
 
 # =====================================================
@@ -69,17 +71,26 @@ GET_FISH_GRADES = """
     SELECT name FROM fish_grade ORDER BY name
 """
 
-GET_FISH_BY_NAME = """
-    SELECT id FROM fish_species
-    WHERE common_name = %s AND is_active = TRUE
+# name -> id maps for the reference-data cache
+GET_FISH_IDS = """
+    SELECT common_name, id FROM fish_species WHERE is_active = TRUE
+"""
+
+GET_CUT_IDS = """
+    SELECT name, id FROM fish_cut
 """
 
-GET_CUT_BY_NAME = """
-    SELECT id FROM fish_cut WHERE name = %s
+GET_GRADE_IDS = """
+    SELECT name, id FROM fish_grade
 """
 
-GET_GRADE_BY_NAME = """
-    SELECT id FROM fish_grade WHERE name = %s
+GET_FISH_SIZES = """
+    SELECT fs.*, sp.common_name as species_name, fc.name as cut_name
+    FROM fish_size fs
+    JOIN fish_species sp ON fs.fish_species_id = sp.id
+    LEFT JOIN fish_cut fc ON fs.cut_id = fc.id
+    WHERE fs.active = TRUE
+    ORDER BY sp.common_name, fs.sort_order
 """
 
 # =====================================================
@@ -88,16 +99,24 @@ GET_GRADE_BY_NAME = """
 INSERT_QUOTE = """
     INSERT INTO quote (id, vendor_id, quote_valid_till, notes, price_negotiable, exclusive_offer)
     VALUES (%s, %s, %s, %s, %s, %s)
+    RETURNING created_at
 """
 
-INSERT_QUOTE_DESTINATION = """
+# Destinations and products of a quote are inserted in one statement each;
+# every column is passed as an array, one element per row. arrival_date is
+# passed as text and cast per row, since EXECUTE of the prepared statement
+# won't coerce a text[] argument to date[].
+INSERT_QUOTE_DESTINATIONS = """
     INSERT INTO quote_destination (quote_id, destination_id, airfreight_per_kg, arrival_date, min_weight, max_weight)
-    VALUES (%s, %s, %s, %s, %s, %s)
+    SELECT %s, d.destination_id, d.airfreight_per_kg, d.arrival_date::date, d.min_weight, d.max_weight
+    FROM unnest(%s::int[], %s::numeric[], %s::text[], %s::numeric[], %s::numeric[])
+        AS d(destination_id, airfreight_per_kg, arrival_date, min_weight, max_weight)
 """
 
-INSERT_QUOTE_PRODUCT = """
+INSERT_QUOTE_PRODUCTS = """
     INSERT INTO quote_product (quote_id, fish_id, weight_range, fish_size_id, cut, grade, price_per_kg, quantity)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    SELECT %s, p.*
+    FROM unnest(%s::int[], %s::text[], %s::int[], %s::int[], %s::int[], %s::numeric[], %s::int[]) AS p
 """
 
 GET_VENDOR_QUOTE_FOR_EMAIL = """
@@ -159,54 +178,79 @@ INSERT_EMAIL_LOG = """
     VALUES (%s, %s, %s, NOW())
 """
 
+GET_LAST_EMAIL_LOG = """
+    SELECT vendor_email, status, sent_at
+    FROM email_log
+    WHERE quote_id = %s
+    ORDER BY sent_at DESC
+    LIMIT 1
+"""
+
 # =====================================================
 # ESTIMATES QUERIES  (buyer_pricing/estimates.py)
 # =====================================================
 
+# Search reads the denormalized estimate_search table (db/migrations/002_create_estimate_search.sql),
+# whose idx_estimate_search_page covers every column below.
 # Base query — dynamic vendor/port/date filters and ORDER BY are appended in code
 SEARCH_ESTIMATES_BASE = """
     SELECT
-        q.id as quote_id,
-        q.created_at::date as quote_date,
-        v.id as vendor_id,
-        v.name as vendor_name,
-        d.code as port,
-        f.id as fish_species_id,
-        f.common_name,
-        f.scientific_name,
-        fc.id as cut_id,
-        fc.name as cut,
-        fg.id as grade_id,
-        fg.name as grade,
-        CASE
-            WHEN fsz.lbs_max IS NOT NULL
-                THEN fsz.lbs_label::float8::text || '–' || fsz.lbs_max::float8::text
-            WHEN fsz.lbs_label IS NOT NULL
-                THEN fsz.lbs_label::float8::text
-            ELSE qp.weight_range::text
-        END AS fish_size,
-        qp.fish_size_id,
-        qp.quantity as offer_quantity,
-        qp.price_per_kg as fish_price,
-        qd.airfreight_per_kg as freight_price,
-        COALESCE(t.reciprocal_tariff + t.secondary_tariff, 0)
-        + COALESCE(tg.reciprocal_tariff + tg.secondary_tariff, 0) as tariff_percent,
+        es.quote_id,
+        es.quote_created_at::date as quote_date,
+        es.vendor_id,
+        es.vendor_name,
+        es.port,
+        es.fish_species_id,
+        es.common_name,
+        es.scientific_name,
+        es.cut_id,
+        es.cut,
+        es.grade_id,
+        es.grade,
+        es.fish_size,
+        es.fish_size_id,
+        es.offer_quantity,
+        es.fish_price,
+        es.freight_price,
+        es.tariff_percent,
         0 as margin,
-        0 as clearing_charges
-    FROM quote q
-    JOIN vendors v ON q.vendor_id = v.id
-    LEFT JOIN tariff t ON v.country = t.country AND t.active = true AND t.country != 'Global'
-    LEFT JOIN tariff tg ON tg.country = 'Global' AND tg.active = true
-    JOIN quote_destination qd ON q.id = qd.quote_id
-    JOIN dictionary d ON qd.destination_id = d.id
-    JOIN quote_product qp ON q.id = qp.quote_id
-    LEFT JOIN fish_size fsz ON qp.fish_size_id = fsz.id
-    JOIN fish_species f ON qp.fish_id = f.id
-    JOIN fish_cut fc ON qp.cut = fc.id
-    JOIN fish_grade fg ON qp.grade = fg.id
+        0 as clearing_charges,
+        es.quote_destination_id,
+        es.quote_product_id,
+        es.weight_range::text as weight_range
+    FROM estimate_search es
     WHERE 1=1
 """
 
+COUNT_SEARCH_ESTIMATES_BASE = """
+    SELECT COUNT(*) AS total
+    FROM estimate_search es
+    WHERE 1=1
+"""
+
+# Keyset pagination of the search. The sort key ends with the destination and
+# product row ids so it is unique; the cursor is the key of the previous page's
+# last row: (quote_id, port, common_name, weight_range, quote_destination_id,
+# quote_product_id), with quote_id passed three times. The quote_id <= bound is
+# implied by the OR but lets the page index scan start at the cursor.
+SEARCH_ESTIMATES_AFTER_CURSOR = """
+    AND es.quote_id <= %s
+    AND (es.quote_id < %s OR (es.quote_id = %s AND
+        (es.port, es.common_name, COALESCE(es.weight_range::text, ''), es.quote_destination_id, es.quote_product_id)
+        > (%s, %s, %s, %s, %s)))
+"""
+
+SEARCH_ESTIMATES_PAGE = """
+    ORDER BY es.quote_id DESC, es.port, es.common_name, COALESCE(es.weight_range::text, ''),
+        es.quote_destination_id, es.quote_product_id
+    LIMIT %s
+"""
+
+# Bumped by a trigger on every change to estimate_search; keys the search result cache
+GET_ESTIMATE_SEARCH_VERSION = """
+    SELECT version, CURRENT_DATE AS today FROM estimate_search_version
+"""
+
 GET_BUYER_PORTS = """
     SELECT d.code
     FROM buyers b
@@ -218,29 +262,19 @@ GET_BUYER_PORTS = """
 # Base query — dynamic date filters and ORDER BY are appended in code
 GET_BUYER_ESTIMATES_BY_PORT_BASE = """
     SELECT
-        q.id as quote_id,
-        q.created_at::date as quote_date,
-        d.code as port,
-        f.common_name,
-        fc.name as cut,
-        fg.name as grade,
-        qp.weight_range as fish_size,
-        qp.price_per_kg as fish_price,
-        qd.airfreight_per_kg as freight_price,
-        COALESCE(t.reciprocal_tariff + t.secondary_tariff, 0)
-        + COALESCE(tg.reciprocal_tariff + tg.secondary_tariff, 0) as tariff_percent,
+        es.quote_id,
+        es.quote_created_at::date as quote_date,
+        es.port,
+        es.common_name,
+        es.cut,
+        es.grade,
+        es.weight_range as fish_size,
+        es.fish_price,
+        es.freight_price,
+        es.tariff_percent,
         0 as margin
-    FROM quote q
-    JOIN vendors v ON q.vendor_id = v.id
-    LEFT JOIN tariff t ON v.country = t.country AND t.active = true AND t.country != 'Global'
-    LEFT JOIN tariff tg ON tg.country = 'Global' AND tg.active = true
-    JOIN quote_destination qd ON q.id = qd.quote_id
-    JOIN dictionary d ON qd.destination_id = d.id
-    JOIN quote_product qp ON q.id = qp.quote_id
-    JOIN fish_species f ON qp.fish_id = f.id
-    JOIN fish_cut fc ON qp.cut = fc.id
-    JOIN fish_grade fg ON qp.grade = fg.id
-    WHERE d.code = ANY(%s)
+    FROM estimate_search es
+    WHERE es.port = ANY(%s)
 """
 
 # =====================================================
@@ -260,15 +294,39 @@ UPDATE_ESTIMATE_NUMBER = """
     UPDATE buyer_estimate SET estimate_number = %s WHERE id = %s
 """
 
-INSERT_BUYER_ESTIMATE_ITEM = """
-    INSERT INTO buyer_estimate_item (
-        buyer_estimate_id, vendor_id, quote_id, port_code,
-        fish_species_id, cut_id, grade_id, fish_size, fish_size_id,
-        fish_price, freight_price, tariff_percent, tariff_amount,
-        margin, price, clearing_charges, offer_quantity, total_price
-    ) VALUES (
-        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+# Inserts every item of an estimate in one statement. Each column is passed as
+# an array (one element per item) and the inserted rows come back joined to
+# their display names, in the same shape and order as GET_ESTIMATE_ITEMS.
+INSERT_BUYER_ESTIMATE_ITEMS = """
+    WITH inserted AS (
+        INSERT INTO buyer_estimate_item (
+            buyer_estimate_id, vendor_id, quote_id, port_code,
+            fish_species_id, cut_id, grade_id, fish_size, fish_size_id,
+            fish_price, freight_price, tariff_percent, tariff_amount,
+            margin, price, clearing_charges, offer_quantity, total_price
+        )
+        SELECT %s::int, item.*
+        FROM unnest(
+            %s::int[], %s::int[], %s::text[],
+            %s::int[], %s::int[], %s::int[], %s::text[], %s::int[],
+            %s::numeric[], %s::numeric[], %s::numeric[], %s::numeric[],
+            %s::numeric[], %s::numeric[], %s::numeric[], %s::numeric[], %s::numeric[]
+        ) AS item
+        RETURNING *
     )
+    SELECT
+        inserted.*,
+        v.name as vendor_name,
+        fs.common_name,
+        fs.scientific_name,
+        fc.name as cut_name,
+        fg.name as grade_name
+    FROM inserted
+    JOIN vendors v ON inserted.vendor_id = v.id
+    JOIN fish_species fs ON inserted.fish_species_id = fs.id
+    JOIN fish_cut fc ON inserted.cut_id = fc.id
+    JOIN fish_grade fg ON inserted.grade_id = fg.id
+    ORDER BY v.name, fs.common_name
 """
 
 INSERT_BUYER_ESTIMATE_REGION_GROUP = """
@@ -365,6 +423,7 @@ UPDATE_ESTIMATE_STATUS_SENT = """
     UPDATE buyer_estimate SET status = 'sent', updated_at = NOW() WHERE id = %s
 """
 
+# LIMIT NULL returns every estimate in the week
 GET_COMPANY_ESTIMATES = """
     SELECT
         be.id,
@@ -391,9 +450,11 @@ GET_COMPANY_ESTIMATES = """
     WHERE be.company_id = %s
       AND be.created_at >= %s::date
       AND be.created_at < %s::date + INTERVAL '7 days'
-    ORDER BY be.created_at DESC
+    ORDER BY be.created_at DESC, be.id DESC
+    LIMIT %s OFFSET %s
 """
 
+# Items for a batch of estimates; callers group them by buyer_estimate_id
 GET_COMPANY_ESTIMATE_ITEMS = """
     SELECT
         bei.id,
@@ -425,8 +486,8 @@ GET_COMPANY_ESTIMATE_ITEMS = """
     JOIN fish_species fs ON bei.fish_species_id = fs.id
     JOIN fish_cut fc ON bei.cut_id = fc.id
     JOIN fish_grade fg ON bei.grade_id = fg.id
-    WHERE bei.buyer_estimate_id = %s
-    ORDER BY bei.offer_quantity, v.name, fs.common_name
+    WHERE bei.buyer_estimate_id = ANY(%s)
+    ORDER BY bei.buyer_estimate_id, bei.offer_quantity, v.name, fs.common_name
 """
 
 GET_BUYER_EMAILS_FOR_ESTIMATE = """
@@ -620,39 +681,45 @@ GET_VENDOR_POS_ALL = """
 # =====================================================
 # BOX PACKAGING LIST (BPL) QUERIES
 # =====================================================
+# BPLs for a PO with their boxes and each box's pieces nested as JSON, in one round trip
 GET_BPLS_FOR_PO = """
-    SELECT id, po_id, port_code, status, notes,
-           invoice_number, air_way_bill, packed_date, expiry_date,
-           created_at, updated_at
-    FROM box_packaging_list
-    WHERE po_id = %s
-    ORDER BY port_code
-"""
-
-GET_BPL_BOXES = """
-    SELECT
-        bi.id, bi.po_item_id, bi.box_number, bi.num_pieces,
-        bi.net_weight_kg, bi.gross_weight_kg,
-        bi.weight_range_from_kg, bi.weight_range_to_kg,
-        poi.fish_name, poi.cut_name, poi.grade_name, poi.fish_size
-    FROM box_packaging_list_item bi
-    JOIN purchase_order_item poi ON bi.po_item_id = poi.id
-    WHERE bi.bpl_id = %s
-    ORDER BY bi.box_number
-"""
-
-GET_BPL_PIECES = """
-    SELECT id, piece_number, weight_kg
-    FROM box_packaging_list_piece
-    WHERE bpl_item_id = %s
-    ORDER BY piece_number
-"""
-
-GET_COVERED_PO_ITEMS = """
-    SELECT DISTINCT bi.po_item_id
-    FROM box_packaging_list_item bi
-    JOIN box_packaging_list bpl ON bi.bpl_id = bpl.id
+    SELECT bpl.id, bpl.po_id, bpl.port_code, bpl.status, bpl.notes,
+           bpl.invoice_number, bpl.air_way_bill, bpl.packed_date, bpl.expiry_date,
+           bpl.created_at, bpl.updated_at,
+           COALESCE(b.boxes, '[]'::json) AS boxes
+    FROM box_packaging_list bpl
+    LEFT JOIN LATERAL (
+        SELECT json_agg(
+            json_build_object(
+                'id', bi.id,
+                'po_item_id', bi.po_item_id,
+                'box_number', bi.box_number,
+                'num_pieces', bi.num_pieces,
+                'net_weight_kg', bi.net_weight_kg,
+                'gross_weight_kg', bi.gross_weight_kg,
+                'weight_range_from_kg', bi.weight_range_from_kg,
+                'weight_range_to_kg', bi.weight_range_to_kg,
+                'fish_name', poi.fish_name,
+                'cut_name', poi.cut_name,
+                'grade_name', poi.grade_name,
+                'fish_size', poi.fish_size,
+                'pieces', COALESCE(p.pieces, '[]'::json)
+            ) ORDER BY bi.box_number
+        ) AS boxes
+        FROM box_packaging_list_item bi
+        JOIN purchase_order_item poi ON bi.po_item_id = poi.id
+        LEFT JOIN LATERAL (
+            SELECT json_agg(
+                json_build_object('id', pc.id, 'piece_number', pc.piece_number, 'weight_kg', pc.weight_kg)
+                ORDER BY pc.piece_number
+            ) AS pieces
+            FROM box_packaging_list_piece pc
+            WHERE pc.bpl_item_id = bi.id
+        ) p ON true
+        WHERE bi.bpl_id = bpl.id
+    ) b ON true
     WHERE bpl.po_id = %s
+    ORDER BY bpl.port_code
 """
 
 CHECK_PORT_ACCEPTED = """
@@ -686,19 +753,67 @@ INSERT_BPL = """
     RETURNING id
 """
 
-INSERT_BPL_ITEM = """
+# Current boxes of a BPL with their pieces as [id, piece_number, weight_kg]
+# triples, used to diff a save against what's stored
+GET_BPL_BOXES_WITH_PIECES = """
+    SELECT bi.id, bi.po_item_id, bi.box_number, bi.num_pieces, bi.net_weight_kg,
+           bi.weight_range_from_kg, bi.weight_range_to_kg,
+           COALESCE(
+               json_agg(json_build_array(pc.id, pc.piece_number, pc.weight_kg))
+                   FILTER (WHERE pc.id IS NOT NULL),
+               '[]'::json
+           ) AS pieces
+    FROM box_packaging_list_item bi
+    LEFT JOIN box_packaging_list_piece pc ON pc.bpl_item_id = bi.id
+    WHERE bi.bpl_id = %s
+    GROUP BY bi.id
+"""
+
+# Bulk box/piece writes: each column is passed as an array, one element per row
+INSERT_BPL_BOXES = """
     INSERT INTO box_packaging_list_item
         (bpl_id, po_item_id, box_number, box_count, num_pieces,
          net_weight_kg, gross_weight_kg,
          weight_range_from_kg, weight_range_to_kg)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-    RETURNING id
+    SELECT %s::int, b.po_item_id, b.box_number, b.num_pieces, b.num_pieces,
+           b.net_weight_kg, b.net_weight_kg,
+           b.weight_range_from_kg, b.weight_range_to_kg
+    FROM unnest(%s::int[], %s::int[], %s::int[], %s::numeric[], %s::numeric[], %s::numeric[])
+        AS b(po_item_id, box_number, num_pieces, net_weight_kg,
+             weight_range_from_kg, weight_range_to_kg)
+    RETURNING id, po_item_id, box_number
+"""
+
+UPDATE_BPL_BOXES = """
+    UPDATE box_packaging_list_item bi
+    SET box_count = b.num_pieces, num_pieces = b.num_pieces,
+        net_weight_kg = b.net_weight_kg, gross_weight_kg = b.net_weight_kg,
+        weight_range_from_kg = b.weight_range_from_kg,
+        weight_range_to_kg = b.weight_range_to_kg
+    FROM unnest(%s::int[], %s::int[], %s::numeric[], %s::numeric[], %s::numeric[])
+        AS b(id, num_pieces, net_weight_kg, weight_range_from_kg, weight_range_to_kg)
+    WHERE bi.id = b.id
 """
 
-INSERT_BPL_PIECE = """
+DELETE_BPL_BOXES = """
+    DELETE FROM box_packaging_list_item WHERE id = ANY(%s::int[])
+"""
+
+INSERT_BPL_PIECES = """
     INSERT INTO box_packaging_list_piece
         (bpl_item_id, piece_number, weight_kg)
-    VALUES (%s, %s, %s)
+    SELECT * FROM unnest(%s::int[], %s::int[], %s::numeric[])
+"""
+
+UPDATE_BPL_PIECES = """
+    UPDATE box_packaging_list_piece pc
+    SET weight_kg = p.weight_kg
+    FROM unnest(%s::int[], %s::numeric[]) AS p(id, weight_kg)
+    WHERE pc.id = p.id
+"""
+
+DELETE_BPL_PIECES = """
+    DELETE FROM box_packaging_list_piece WHERE id = ANY(%s::int[])
 """
 
 GET_PO_FOR_BPL_EMAIL = """
@@ -839,6 +954,112 @@ INSERT_BPL_UPLOAD = """
 """
 
 
+# =====================================================
+# JOB QUEUE
+# =====================================================
+
+ENQUEUE_JOB = """
+    INSERT INTO job_queue (kind, payload, reference, max_attempts)
+    VALUES (%s, %s::jsonb, %s, %s)
+    RETURNING id
+"""
+
+# Takes the oldest due job, or one whose lease has run out because the
+# instance running it went away. SKIP LOCKED lets concurrent workers claim
+# different jobs instead of queueing behind each other's row locks.
+CLAIM_JOB = """
+    UPDATE job_queue
+    SET status = 'running', attempts = attempts + 1,
+        locked_at = NOW(), locked_by = %s, updated_at = NOW()
+    WHERE id = (
+        SELECT id FROM job_queue
+        WHERE (status = 'queued' AND run_at <= NOW())
+           OR (status = 'running' AND locked_at < NOW() - make_interval(secs => %s))
+        ORDER BY run_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, max_attempts
+"""
+
+COMPLETE_JOB = """
+    UPDATE job_queue
+    SET status = 'done', result = %s::jsonb, last_error = NULL,
+        locked_at = NULL, locked_by = NULL,
+        updated_at = NOW(), finished_at = NOW()
+    WHERE id = %s
+"""
+
+RETRY_JOB = """
+    UPDATE job_queue
+    SET status = 'queued', run_at = NOW() + make_interval(secs => %s),
+        last_error = %s, locked_at = NULL, locked_by = NULL, updated_at = NOW()
+    WHERE id = %s
+"""
+
+DEAD_JOB = """
+    UPDATE job_queue
+    SET status = 'dead', last_error = %s,
+        locked_at = NULL, locked_by = NULL,
+        updated_at = NOW(), finished_at = NOW()
+    WHERE id = %s
+"""
+
+# Hands back a job interrupted by shutdown without using up an attempt
+RELEASE_JOB = """
+    UPDATE job_queue
+    SET status = 'queued', attempts = GREATEST(attempts - 1, 0),
+        locked_at = NULL, locked_by = NULL, updated_at = NOW()
+    WHERE id = %s AND status = 'running'
+"""
+
+GET_JOB_QUEUE_DEPTH = """
+    SELECT kind, status, COUNT(*) AS count,
+           MIN(run_at) FILTER (WHERE status = 'queued') AS oldest_run_at
+    FROM job_queue
+    WHERE status IN ('queued', 'running', 'dead')
+    GROUP BY kind, status
+    ORDER BY kind, status
+"""
+
+GET_JOB = """
+    SELECT id, kind, payload, reference, status, attempts, max_attempts, run_at,
+           locked_at, locked_by, last_error, result, created_at, updated_at, finished_at
+    FROM job_queue
+    WHERE id = %s
+"""
+
+GET_JOBS_BY_REFERENCE = """
+    SELECT id, kind, payload, reference, status, attempts, max_attempts, run_at,
+           locked_at, locked_by, last_error, result, created_at, updated_at, finished_at
+    FROM job_queue
+    WHERE reference = %s
+    ORDER BY id DESC
+"""
+
+GET_DEAD_JOBS = """
+    SELECT id, kind, payload, reference, status, attempts, max_attempts, run_at,
+           locked_at, locked_by, last_error, result, created_at, updated_at, finished_at
+    FROM job_queue
+    WHERE status = 'dead'
+    ORDER BY finished_at DESC
+    LIMIT %s
+"""
+
+REQUEUE_DEAD_JOB = """
+    UPDATE job_queue
+    SET status = 'queued', attempts = 0, run_at = NOW(),
+        finished_at = NULL, updated_at = NOW()
+    WHERE id = %s AND status = 'dead'
+    RETURNING id
+"""
+
+PURGE_FINISHED_JOBS = """
+    DELETE FROM job_queue
+    WHERE status = 'done' AND finished_at < NOW() - make_interval(days => %s)
+"""
+
+
 # =====================================================
 # QUERY MANAGER CLASS
 # =====================================================
@@ -864,23 +1085,24 @@ class DatabaseQueries:
     }
 
     DICTIONARY = {
-        'get_by_category': GET_DICTIONARY_BY_CATEGORY,
-        'get_by_code': GET_DICTIONARY_BY_CODE,
+        'get_all': GET_DICTIONARY_ALL,
+        'get_destination_ids': GET_DESTINATION_IDS,
     }
 
     FISH = {
         'get_types': GET_FISH_TYPES,
         'get_cuts': GET_FISH_CUTS,
         'get_grades': GET_FISH_GRADES,
-        'get_by_name': GET_FISH_BY_NAME,
-        'get_cut_by_name': GET_CUT_BY_NAME,
-        'get_grade_by_name': GET_GRADE_BY_NAME,
+        'get_ids': GET_FISH_IDS,
+        'get_cut_ids': GET_CUT_IDS,
+        'get_grade_ids': GET_GRADE_IDS,
+        'get_sizes': GET_FISH_SIZES,
     }
 
     QUOTES = {
         'insert': INSERT_QUOTE,
-        'insert_destination': INSERT_QUOTE_DESTINATION,
-        'insert_product': INSERT_QUOTE_PRODUCT,
+        'insert_destinations': INSERT_QUOTE_DESTINATIONS,
+        'insert_products': INSERT_QUOTE_PRODUCTS,
         'get_destinations': GET_QUOTE_DESTINATIONS,
         'get_products': GET_QUOTE_PRODUCTS,
         'get_for_email': GET_VENDOR_QUOTE_FOR_EMAIL,
@@ -889,11 +1111,16 @@ class DatabaseQueries:
 
     EMAIL = {
         'insert_log': INSERT_EMAIL_LOG,
+        'get_last_log': GET_LAST_EMAIL_LOG,
         'get_vendor_quote': GET_VENDOR_QUOTE_FOR_EMAIL,
     }
 
     ESTIMATES = {
         'search_base': SEARCH_ESTIMATES_BASE,
+        'search_count_base': COUNT_SEARCH_ESTIMATES_BASE,
+        'search_after_cursor': SEARCH_ESTIMATES_AFTER_CURSOR,
+        'search_page': SEARCH_ESTIMATES_PAGE,
+        'search_version': GET_ESTIMATE_SEARCH_VERSION,
         'buyer_ports': GET_BUYER_PORTS,
         'buyer_estimates_base': GET_BUYER_ESTIMATES_BY_PORT_BASE,
     }
@@ -901,7 +1128,7 @@ class DatabaseQueries:
     BUYER_ESTIMATES = {
         'insert_estimate': INSERT_BUYER_ESTIMATE,
         'update_estimate_number': UPDATE_ESTIMATE_NUMBER,
-        'insert_item': INSERT_BUYER_ESTIMATE_ITEM,
+        'insert_items': INSERT_BUYER_ESTIMATE_ITEMS,
         'insert_region_group': INSERT_BUYER_ESTIMATE_REGION_GROUP,
         'get_items': GET_ESTIMATE_ITEMS,
         'list_by_buyer': GET_BUYER_ESTIMATES_LIST,
@@ -941,16 +1168,18 @@ class DatabaseQueries:
 
     BPL = {
         'get_for_po': GET_BPLS_FOR_PO,
-        'get_boxes': GET_BPL_BOXES,
-        'get_pieces': GET_BPL_PIECES,
-        'get_covered_items': GET_COVERED_PO_ITEMS,
         'check_port_accepted': CHECK_PORT_ACCEPTED,
         'get_by_po_port': GET_BPL_BY_PO_PORT,
         'update': UPDATE_BPL,
         'delete_items': DELETE_BPL_ITEMS,
         'insert': INSERT_BPL,
-        'insert_item': INSERT_BPL_ITEM,
-        'insert_piece': INSERT_BPL_PIECE,
+        'get_boxes_with_pieces': GET_BPL_BOXES_WITH_PIECES,
+        'insert_boxes': INSERT_BPL_BOXES,
+        'update_boxes': UPDATE_BPL_BOXES,
+        'delete_boxes': DELETE_BPL_BOXES,
+        'insert_pieces': INSERT_BPL_PIECES,
+        'update_pieces': UPDATE_BPL_PIECES,
+        'delete_pieces': DELETE_BPL_PIECES,
         'get_po_for_email': GET_PO_FOR_BPL_EMAIL,
         'get_header': GET_BPL_HEADER,
         'get_items_for_email': GET_BPL_ITEMS_FOR_EMAIL,
@@ -961,3 +1190,18 @@ class DatabaseQueries:
         'update_upload': UPDATE_BPL_UPLOAD,
         'insert_upload': INSERT_BPL_UPLOAD,
     }
+
+    JOBS = {
+        'enqueue': ENQUEUE_JOB,
+        'claim': CLAIM_JOB,
+        'complete': COMPLETE_JOB,
+        'retry': RETRY_JOB,
+        'dead': DEAD_JOB,
+        'release': RELEASE_JOB,
+        'depth': GET_JOB_QUEUE_DEPTH,
+        'get': GET_JOB,
+        'get_by_reference': GET_JOBS_BY_REFERENCE,
+        'get_dead': GET_DEAD_JOBS,
+        'requeue_dead': REQUEUE_DEAD_JOB,
+        'purge': PURGE_FINISHED_JOBS,
+    }
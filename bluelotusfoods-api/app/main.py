@@ -1,9 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.api.vendor_quote import dictionary, vendors, fish, quotes, email
-from app.api import buyer_pricing
+from app.api import buyer_pricing, monitoring
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.db.db import init_db_pool,close_db_pool
+from app.db.db import init_db_pool,close_db_pool,get_pool_stats
+from app.db.pool import PoolTimeoutError
+from app.db.async_db import init_async_db_pool,close_async_db_pool,get_async_pool_stats
+from psycopg_pool import PoolTimeout
+from fastapi.concurrency import run_in_threadpool
+from app.services import reference_cache
+from app.services.job_queue import start_workers, stop_workers, get_job_worker_stats
+from app.services.email_client import open_email_client, close_email_client, get_email_client_stats
 from app.core.settings import settings
 import os
 import sys
@@ -27,6 +35,22 @@ async def lifespan(app: FastAPI):
         print(f"⚠️  Continuing startup without database connection", flush=True)
         # Don't raise - allow app to start even if DB is unavailable
         # DB errors will be caught per-request
+
+    try:
+        await init_async_db_pool()
+        print("✅ Async database pool initialized successfully", flush=True)
+    except Exception as e:
+        print(f"❌ Failed to initialize async database pool: {e}", flush=True)
+
+    await open_email_client()
+
+    try:
+        await run_in_threadpool(reference_cache.warm)
+        print("✅ Reference data cache loaded", flush=True)
+    except Exception as e:
+        print(f"⚠️  Reference data cache not loaded, it will load on first use: {e}", flush=True)
+
+    await start_workers()
     
     print("✅ Application startup complete - ready to accept requests", flush=True)
     yield 
@@ -34,8 +58,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     try:
         print("🛑 Shutting down Blue Lotus Foods API...", flush=True)
+        # Workers go first: a job cut short is released back to the queue,
+        # which needs the async pool
+        await stop_workers(settings.job_shutdown_timeout)
+        await close_email_client()
         close_db_pool()
-        print("✅ Database pool closed", flush=True)
+        await close_async_db_pool()
+        print("✅ Database pools closed", flush=True)
     except Exception as e:
         print(f"⚠️ Error closing database pool: {e}", flush=True)
 
@@ -50,6 +79,16 @@ app.add_middleware(
     allow_headers=settings.cors_allow_headers,
 )
 
+# Pool exhaustion is back-pressure, not a server error - tell clients to retry
+@app.exception_handler(PoolTimeoutError)
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: Exception):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -73,6 +112,7 @@ app.include_router(fish.router, prefix="/fish", tags=["Fish"])
 app.include_router(quotes.router, prefix="/quotes", tags=["Quotes"])
 app.include_router(email.router, prefix="/quotes", tags=["Email"])
 app.include_router(buyer_pricing.router, prefix="/buyer-pricing", tags=["Buyer Pricing"])
+app.include_router(monitoring.router, tags=["Monitoring"])
 
 @app.get("/health")
 async def health_check():
@@ -80,5 +120,9 @@ async def health_check():
     return {
         "status": "healthy", 
         "service": "bluelotusfoods-api",
-        "port": os.environ.get('PORT', 'unknown')
+        "port": os.environ.get('PORT', 'unknown'),
+        "db_pool": get_pool_stats(),
+        "async_db_pool": get_async_pool_stats(),
+        "job_workers": get_job_worker_stats(),
+        "email_client": get_email_client_stats()
     }
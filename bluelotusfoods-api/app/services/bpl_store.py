@@ -0,0 +1,144 @@
+"""
+Diff-based persistence of BPL boxes and pieces.
+
+A save compares the submitted boxes (keyed by po_item_id + box_number) and
+their pieces (keyed by piece_number) with what's stored, then applies only
+the differences, with one bulk statement per kind of change. Autosaving an
+unchanged draft costs the diff query and nothing else, however many boxes
+the shipment has.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict
+
+from app.db.queries import DatabaseQueries
+
+
+# Scale of the stored weight columns (NUMERIC(..., 2)); PostgreSQL rounds half away from zero
+WEIGHT_SCALE = Decimal('0.01')
+
+
+def _num(value):
+    """
+    A weight as the column stores it, so a submitted float or piece sum
+    (0.1 + 0.2) compares equal to the stored value it rounds to.
+    """
+    return None if value is None else Decimal(str(value)).quantize(WEIGHT_SCALE, rounding=ROUND_HALF_UP)
+
+
+def _box_values(box) -> tuple:
+    """(num_pieces, net_weight_kg, weight_range_from_kg, weight_range_to_kg) as stored."""
+    # Range mode: pieces is empty, net weight entered directly
+    if box.pieces:
+        net_wt = sum(p.weight_kg for p in box.pieces)
+    else:
+        net_wt = box.net_weight_kg or 0
+    return (box.num_pieces, net_wt, box.weight_range_from_kg, box.weight_range_to_kg)
+
+
+def _box_changed(row, values) -> bool:
+    num_pieces, net_wt, range_from, range_to = values
+    return (
+        row['num_pieces'] != num_pieces
+        or _num(row['net_weight_kg']) != _num(net_wt)
+        or _num(row['weight_range_from_kg']) != _num(range_from)
+        or _num(row['weight_range_to_kg']) != _num(range_to)
+    )
+
+
+def _columns(rows) -> tuple:
+    """Transpose rows into one list per column, for the unnest()-based queries."""
+    return tuple(list(column) for column in zip(*rows))
+
+
+def save_bpl_boxes(cur, bpl_id: int, boxes, existing: bool) -> Dict[str, int]:
+    """
+    Bring the stored boxes and pieces of a BPL in line with `boxes`.
+
+    Args:
+        cur: psycopg2 RealDictCursor inside the caller's transaction
+        bpl_id: BPL being saved
+        boxes: submitted BPLBoxItem list
+        existing: False for a BPL created in this transaction (nothing to diff)
+
+    Returns:
+        Counts of boxes inserted/updated/deleted and pieces written/deleted
+    """
+    stored = {}
+    stale_box_ids = []
+    if existing:
+        cur.execute(DatabaseQueries.BPL['get_boxes_with_pieces'], (bpl_id,))
+        for row in cur.fetchall():
+            key = (row['po_item_id'], row['box_number'])
+            if key in stored:
+                # Duplicate left behind by an older save; the first one is kept
+                stale_box_ids.append(row['id'])
+            else:
+                stored[key] = row
+
+    new_boxes = []
+    box_updates = []
+    piece_inserts = []
+    piece_updates = []
+    stale_piece_ids = []
+
+    for box in boxes:
+        values = _box_values(box)
+        row = stored.pop((box.po_item_id, box.box_number), None)
+        if row is None:
+            new_boxes.append((box, values))
+            continue
+
+        if _box_changed(row, values):
+            box_updates.append((row['id'], *values))
+
+        stored_pieces = {}
+        for piece_id, piece_number, weight_kg in row['pieces']:
+            if piece_number in stored_pieces:
+                stale_piece_ids.append(piece_id)
+            else:
+                stored_pieces[piece_number] = (piece_id, weight_kg)
+
+        for piece in box.pieces:
+            current = stored_pieces.pop(piece.piece_number, None)
+            if current is None:
+                piece_inserts.append((row['id'], piece.piece_number, piece.weight_kg))
+            elif _num(current[1]) != _num(piece.weight_kg):
+                piece_updates.append((current[0], piece.weight_kg))
+        stale_piece_ids.extend(piece_id for piece_id, _ in stored_pieces.values())
+
+    # Boxes no longer submitted; their pieces go with them (ON DELETE CASCADE)
+    stale_box_ids.extend(row['id'] for row in stored.values())
+
+    if stale_box_ids:
+        cur.execute(DatabaseQueries.BPL['delete_boxes'], (stale_box_ids,))
+    if stale_piece_ids:
+        cur.execute(DatabaseQueries.BPL['delete_pieces'], (stale_piece_ids,))
+    if box_updates:
+        cur.execute(DatabaseQueries.BPL['update_boxes'], _columns(box_updates))
+    if piece_updates:
+        cur.execute(DatabaseQueries.BPL['update_pieces'], _columns(piece_updates))
+
+    if new_boxes:
+        cur.execute(
+            DatabaseQueries.BPL['insert_boxes'],
+            (bpl_id, *_columns((box.po_item_id, box.box_number, *values) for box, values in new_boxes))
+        )
+        # Map the new box ids back through RETURNING by (po_item_id, box_number)
+        new_ids = defaultdict(list)
+        for row in cur.fetchall():
+            new_ids[(row['po_item_id'], row['box_number'])].append(row['id'])
+        for box, _ in new_boxes:
+            box_id = new_ids[(box.po_item_id, box.box_number)].pop()
+            piece_inserts.extend((box_id, p.piece_number, p.weight_kg) for p in box.pieces)
+
+    if piece_inserts:
+        cur.execute(DatabaseQueries.BPL['insert_pieces'], _columns(piece_inserts))
+
+    return {
+        'boxes_inserted': len(new_boxes),
+        'boxes_updated': len(box_updates),
+        'boxes_deleted': len(stale_box_ids),
+        'pieces_written': len(piece_inserts) + len(piece_updates),
+        'pieces_deleted': len(stale_piece_ids),
+    }
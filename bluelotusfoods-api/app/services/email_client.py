@@ -0,0 +1,205 @@
+"""
+Client for the bluelotusfoods-email service.
+
+Every call checks that the caller isn't holding a pooled DB connection: the
+email service renders PDFs and talks SMTP, so a request can take tens of
+seconds. Handlers gather what they need, commit and release the connection,
+call the email service, then reacquire a connection only for the final
+status write.
+
+All calls share one httpx.AsyncClient, opened in the lifespan hook, so
+connections to the email service are kept alive and reused instead of
+paying a TCP/TLS handshake per send. Each endpoint has its own timeout.
+Failures where the request never reached the email service (connect
+errors, a full connection pool) and 502/503 responses are retried with
+exponential backoff; read timeouts are not, since the email may already
+have gone out. Job handlers pass the job's idempotency key, sent as the
+Idempotency-Key header, so the email service can recognise a repeat of a
+send that already went out. A circuit breaker opens after
+settings.email_service_breaker_threshold consecutive failures and rejects
+calls immediately for settings.email_service_breaker_reset seconds, so an
+outage fails fast instead of tying up handlers.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+import httpx
+
+from app.core.settings import settings
+from app.db.guard import ensure_no_connection_held
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+
+# PDF-heavy sends get longer than the default
+ENDPOINT_TIMEOUTS = {
+    "/email/bpl/send-emails": 60.0,
+    "/email/bpl/send-uploaded": 60.0,
+}
+
+# Gateway answers that mean the request wasn't handled
+RETRY_STATUSES = {502, 503}
+RETRY_BACKOFF = 0.5
+
+
+class EmailServiceUnavailable(httpx.RequestError):
+    """The circuit breaker is open; the email service wasn't called."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open trial call."""
+
+    def __init__(self, threshold: int, reset_after: float):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_after:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def abort_trial(self):
+        """The trial call ended without an answer (cancelled, or an unexpected error); let another one through."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.threshold:
+            if self.opened_at is None or self._trial_in_flight:
+                logger.warning(f"Email service circuit opened after {self.failures} consecutive failure(s)")
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+_breaker = CircuitBreaker(settings.email_service_breaker_threshold, settings.email_service_breaker_reset)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_enabled() -> bool:
+    if not settings.email_service_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("email_service_http2 is set but the h2 package isn't installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.email_service_url,
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=settings.email_service_max_connections,
+                max_keepalive_connections=settings.email_service_max_keepalive,
+            ),
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+    return _client
+
+
+async def open_email_client():
+    """Create the shared client; called from the lifespan hook."""
+    _get_client()
+
+
+async def close_email_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_email_client_stats() -> dict:
+    return {
+        "open": _client is not None,
+        "circuit": _breaker.state,
+        "consecutive_failures": _breaker.failures,
+    }
+
+
+async def _backoff(attempt: int):
+    delay = RETRY_BACKOFF * (2 ** attempt)
+    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+
+async def post_email_service(path: str, payload: dict, timeout: Optional[float] = None,
+                             idempotency_key: Optional[str] = None) -> httpx.Response:
+    """POST a JSON payload to the email service, e.g. path='/email/vendor-notification'."""
+    ensure_no_connection_held(f"Email service call {path}")
+    trial = _breaker.state == "half_open"
+    if not _breaker.allow():
+        raise EmailServiceUnavailable(f"Email service circuit is open, not calling {path}")
+
+    timeout = timeout or ENDPOINT_TIMEOUTS.get(path, DEFAULT_TIMEOUT)
+    request_timeout = httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout))
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+    client = _get_client()
+
+    try:
+        return await _post_with_retries(client, path, payload, headers, request_timeout)
+    finally:
+        # A trial that recorded an outcome has already cleared the flag; one
+        # that was cancelled or raised something else must not block later trials
+        if trial:
+            _breaker.abort_trial()
+
+
+async def _post_with_retries(client: httpx.AsyncClient, path: str, payload: dict,
+                             headers: Optional[dict], request_timeout: httpx.Timeout) -> httpx.Response:
+    attempt = 0
+    while True:
+        try:
+            response = await client.post(path, json=payload, headers=headers, timeout=request_timeout)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # Never reached the email service, so safe to send again
+            if attempt < settings.email_service_retries:
+                logger.warning(f"Email service call {path} failed ({type(e).__name__}), retrying")
+                await _backoff(attempt)
+                attempt += 1
+                continue
+            _breaker.record_failure()
+            raise
+        except httpx.RequestError:
+            _breaker.record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUSES and attempt < settings.email_service_retries:
+            logger.warning(f"Email service call {path} returned {response.status_code}, retrying")
+            await _backoff(attempt)
+            attempt += 1
+            continue
+
+        if response.status_code >= 500:
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()
+        return response
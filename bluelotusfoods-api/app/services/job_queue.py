@@ -0,0 +1,302 @@
+"""
+Durable, Postgres-backed job queue for slow side effects (emails, PDFs).
+
+Jobs are rows in job_queue (db/migrations/001_create_job_queue.sql). A send
+endpoint enqueues a job, in the same transaction as the change it belongs
+to where there is one, and answers 202 straight away. Worker coroutines
+started in the lifespan hook claim due jobs with FOR UPDATE SKIP LOCKED, so
+any number of instances can drain the queue without running a job twice
+concurrently, and run the handler registered for the job's kind with no
+connection held.
+
+A handler that raises is retried with exponential backoff until the job's
+max_attempts, then parked as 'dead' for inspection under /admin/jobs. A 4xx
+HTTPException (bad input, missing rows) goes straight to 'dead', since
+retrying won't fix it. A job whose instance went away mid-run (shutdown,
+scale to zero) is claimed again once its lease expires.
+
+Delivery is therefore at-least-once. Handlers pass idempotency_key() with
+their email service calls; it is the same on every attempt of a job, so the
+email service can drop a repeat of a send that already went out.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import socket
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+from psycopg.rows import dict_row
+
+from app.core.settings import settings
+from app.db.async_db import get_async_conn
+from app.db.queries import DatabaseQueries
+
+logger = logging.getLogger(__name__)
+
+# 4xx answers that are still worth retrying
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+
+# Finished jobs older than settings.job_retention_days are purged this often
+PURGE_INTERVAL = 3600.0
+
+JobHandler = Callable[[dict], Awaitable[Optional[dict]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+_current_job_id: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar('current_job_id', default=None)
+
+
+class JobFailed(Exception):
+    """Raised by a handler for a failure that should be retried."""
+
+
+def job_handler(kind: str):
+    """Register the coroutine that runs jobs of this kind: async fn(payload) -> result dict or None."""
+    def register(fn: JobHandler) -> JobHandler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def idempotency_key() -> Optional[str]:
+    """Key identifying the job being run, stable across its retries; None outside a job."""
+    job_id = _current_job_id.get()
+    return None if job_id is None else f"job-{job_id}"
+
+
+def _enqueue_params(kind: str, payload: dict, reference: Optional[str], max_attempts: Optional[int]) -> tuple:
+    return (
+        kind,
+        json.dumps(payload, default=str),
+        reference,
+        max_attempts or settings.job_max_attempts,
+    )
+
+
+def enqueue_job(cur, kind: str, payload: dict, reference: str = None, max_attempts: int = None) -> int:
+    """
+    Queue a job through a psycopg2 cursor, inside the caller's transaction.
+    Call wake_workers() once the transaction has committed.
+    """
+    cur.execute(DatabaseQueries.JOBS['enqueue'], _enqueue_params(kind, payload, reference, max_attempts))
+    row = cur.fetchone()
+    return row['id'] if isinstance(row, dict) else row[0]
+
+
+async def enqueue_job_async(cur, kind: str, payload: dict, reference: str = None, max_attempts: int = None) -> int:
+    """enqueue_job() for a psycopg 3 async cursor."""
+    await cur.execute(DatabaseQueries.JOBS['enqueue'], _enqueue_params(kind, payload, reference, max_attempts))
+    row = await cur.fetchone()
+    return row['id'] if isinstance(row, dict) else row[0]
+
+
+class _WorkerPool:
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wake: Optional[asyncio.Event] = None
+        self.tasks = []
+        self.stopping = False
+        self.running = 0
+        self.claimed = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.dead = 0
+        self.claim_errors = 0
+        self.last_purge = 0.0
+
+
+_pool = _WorkerPool()
+
+
+def wake_workers():
+    """Have idle workers look for jobs now instead of at their next poll. Safe from any thread."""
+    loop, wake = _pool.loop, _pool.wake
+    if loop is None or wake is None or loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        wake.set()
+    else:
+        loop.call_soon_threadsafe(wake.set)
+
+
+async def _idle(seconds: float):
+    try:
+        await asyncio.wait_for(_pool.wake.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+    _pool.wake.clear()
+
+
+async def _execute(query_key: str, params: tuple):
+    async with get_async_conn() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(DatabaseQueries.JOBS[query_key], params)
+        await conn.commit()
+
+
+async def _claim(worker_name: str) -> Optional[dict]:
+    async with get_async_conn() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(DatabaseQueries.JOBS['claim'], (worker_name, settings.job_lease_seconds))
+            job = await cur.fetchone()
+        await conn.commit()
+    return job
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(settings.job_retry_base_delay * (2 ** (attempts - 1)), settings.job_retry_max_delay)
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def _fail(job: dict, error: str, permanent: bool = False):
+    if permanent or job['attempts'] >= job['max_attempts']:
+        _pool.dead += 1
+        logger.error(f"Job {job['id']} ({job['kind']}) dead after {job['attempts']} attempt(s): {error}")
+        await _execute('dead', (error, job['id']))
+    else:
+        _pool.retried += 1
+        delay = _retry_delay(job['attempts'])
+        logger.warning(f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} failed, "
+                       f"retrying in {delay:.0f}s: {error}")
+        await _execute('retry', (delay, error, job['id']))
+
+
+async def _run(job: dict):
+    handler = _handlers.get(job['kind'])
+    if handler is None:
+        await _fail(job, f"No handler registered for job kind '{job['kind']}'", permanent=True)
+        return
+
+    _pool.running += 1
+    token = _current_job_id.set(job['id'])
+    try:
+        result = await asyncio.wait_for(handler(job['payload']), timeout=settings.job_timeout)
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back rather than waiting for its lease
+        await _execute('release', (job['id'],))
+        raise
+    except HTTPException as e:
+        permanent = 400 <= e.status_code < 500 and e.status_code not in RETRYABLE_CLIENT_ERRORS
+        await _fail(job, f"HTTP {e.status_code}: {e.detail}", permanent=permanent)
+    except asyncio.TimeoutError:
+        await _fail(job, f"Timed out after {settings.job_timeout}s")
+    except Exception as e:
+        await _fail(job, f"{type(e).__name__}: {str(e)}")
+    else:
+        _pool.succeeded += 1
+        await _execute('complete', (json.dumps(result, default=str) if result is not None else None, job['id']))
+    finally:
+        _current_job_id.reset(token)
+        _pool.running -= 1
+
+
+async def _purge_finished():
+    if time.monotonic() - _pool.last_purge < PURGE_INTERVAL:
+        return
+    _pool.last_purge = time.monotonic()
+    try:
+        await _execute('purge', (settings.job_retention_days,))
+    except Exception as e:
+        logger.warning(f"Purging finished jobs failed: {e}")
+
+
+async def _worker(worker_name: str, purges: bool):
+    while not _pool.stopping:
+        if purges:
+            await _purge_finished()
+        try:
+            job = await _claim(worker_name)
+        except Exception as e:
+            # Table missing, DB down or pool exhausted: back off and retry
+            _pool.claim_errors += 1
+            logger.error(f"Job worker {worker_name} could not claim jobs: {e}")
+            await _idle(settings.job_poll_interval * 10)
+            continue
+
+        if job is None:
+            await _idle(settings.job_poll_interval)
+            continue
+
+        _pool.claimed += 1
+        try:
+            await _run(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Couldn't record the outcome; the lease expiry brings the job back
+            logger.error(f"Job worker {worker_name} failed to record job {job['id']}: {e}")
+
+
+async def start_workers():
+    """Start settings.job_workers worker coroutines; called from the lifespan hook."""
+    if _pool.tasks or settings.job_workers <= 0:
+        return
+    _pool.loop = asyncio.get_running_loop()
+    _pool.wake = asyncio.Event()
+    _pool.stopping = False
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    _pool.tasks = [
+        asyncio.create_task(_worker(f"{prefix}:{n}", purges=(n == 0)), name=f"job-worker-{n}")
+        for n in range(settings.job_workers)
+    ]
+    logger.info(f"Started {settings.job_workers} job worker(s)")
+
+
+async def stop_workers(timeout: float):
+    """Let running jobs finish for up to timeout seconds, then cancel them (they are released back to the queue)."""
+    if not _pool.tasks:
+        return
+    _pool.stopping = True
+    _pool.wake.set()
+    _, pending = await asyncio.wait(_pool.tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*_pool.tasks, return_exceptions=True)
+    _pool.tasks = []
+
+
+def get_job_worker_stats() -> dict:
+    return {
+        "workers": len(_pool.tasks),
+        "running": _pool.running,
+        "claimed": _pool.claimed,
+        "succeeded": _pool.succeeded,
+        "retried": _pool.retried,
+        "dead": _pool.dead,
+        "claim_errors": _pool.claim_errors,
+        "handlers": sorted(_handlers),
+    }
+
+
+async def get_jobs_by_reference(reference: str) -> list:
+    """Every job queued for one entity (e.g. 'quote:42'), newest first."""
+    async with get_async_conn() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(DatabaseQueries.JOBS['get_by_reference'], (reference,))
+            return await cur.fetchall()
+
+
+def job_summary(job: dict) -> dict:
+    """The fields of a job row worth showing to API clients."""
+    return {
+        "job_id": job['id'],
+        "kind": job['kind'],
+        "status": job['status'],
+        "attempts": job['attempts'],
+        "max_attempts": job['max_attempts'],
+        "run_at": job['run_at'].isoformat() if job['run_at'] else None,
+        "last_error": job['last_error'],
+        "result": job['result'],
+        "created_at": job['created_at'].isoformat() if job['created_at'] else None,
+        "finished_at": job['finished_at'].isoformat() if job['finished_at'] else None,
+    }
@@ -3,7 +3,7 @@ Pricing calculation utilities for buyer pricing estimates.
 """
 
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import re
 
 # Canonical conversion factor: 1 kg = 2.205 lbs
@@ -141,6 +141,138 @@ def calculate_estimate_totals(estimate: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def convert_vendor_price_to_buyer_price(estimate: dict) -> dict:
+    """
+    Convert vendor prices from KG to LBS for buyer pricing display.
+    Vendor quotes are submitted in KG, but buyer pricing is displayed in LBS.
+
+    The single-row reference for price_search_results(), which must produce
+    the same values.
+    """
+    # Convert per-kg prices/quantities to per-lb
+    fish_price_lb    = lbs_to_kg(Decimal(str(estimate.get('fish_price', 0))))
+    freight_price_lb = lbs_to_kg(Decimal(str(estimate.get('freight_price', 0))))
+    margin_lb        = lbs_to_kg(Decimal(str(estimate.get('margin', 0))))
+    offer_quantity_lb = kg_to_lbs(Decimal(str(estimate.get('offer_quantity', 0))))
+    
+    # If fish_size_id is set, fish_size is already the correct lbs/range label from the DB CASE expression.
+    # Only run the legacy kg→lbs conversion for old quotes that have no fish_size_id.
+    if estimate.get('fish_size_id') is not None:
+        fish_size_display = estimate.get('fish_size')
+    else:
+        fish_size_display = convert_fish_size_to_lbs(estimate.get('fish_size'))
+
+    # Return updated estimate with LB prices
+    return {
+        **estimate,
+        'offer_quantity': float(offer_quantity_lb),
+        'fish_price': float(fish_price_lb),
+        'freight_price': float(freight_price_lb),
+        'margin': float(margin_lb),
+        'fish_size': fish_size_display
+    }
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Decimal(str(value)), skipping the string round trip when it can't change the value."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def price_search_results(rows: Iterable[Dict[str, Any]], with_totals: bool = True) -> List[Dict[str, Any]]:
+    """
+    Buyer (per-LB) pricing of a whole result set of vendor quote rows.
+
+    Row for row the same output as convert_vendor_price_to_buyer_price
+    followed by calculate_estimate_totals when
+    with_totals is set, including their float round trips. The work is done
+    per column value instead of per row: search columns repeat heavily (every
+    product of a quote shares its freight, every vendor in a country its
+    tariff, sizes and prices recur across destinations), so each distinct
+    price, quantity, size and tariff combination is converted once, and each
+    row is copied into a single new dict.
+    """
+    per_lb: Dict[Any, Tuple[float, Decimal]] = {}
+    quantities: Dict[Any, float] = {}
+    sizes: Dict[Any, Optional[str]] = {}
+    totals: Dict[Tuple[Decimal, Decimal, Any, Decimal], Tuple[float, float, float]] = {}
+
+    def price_per_lb(price_per_kg: Any) -> Tuple[float, Decimal]:
+        # The float the row reports, and the Decimal the totals are computed from
+        converted = per_lb.get(price_per_kg)
+        if converted is None:
+            value = float(lbs_to_kg(_as_decimal(price_per_kg)))
+            converted = per_lb[price_per_kg] = (value, Decimal(str(value)))
+        return converted
+
+    results = []
+    for row in rows:
+        fish_price, fish_price_dec = price_per_lb(row.get('fish_price', 0))
+        freight_price, freight_price_dec = price_per_lb(row.get('freight_price', 0))
+        margin, margin_dec = price_per_lb(row.get('margin', 0))
+
+        quantity = row.get('offer_quantity', 0)
+        offer_quantity = quantities.get(quantity)
+        if offer_quantity is None:
+            offer_quantity = quantities[quantity] = float(kg_to_lbs(_as_decimal(quantity)))
+
+        # fish_size_id rows already carry the lbs label; older quotes need the kg->lbs conversion
+        if row.get('fish_size_id') is not None:
+            fish_size = row.get('fish_size')
+        else:
+            size = row.get('fish_size')
+            if size in sizes:
+                fish_size = sizes[size]
+            else:
+                fish_size = sizes[size] = convert_fish_size_to_lbs(size)
+
+        priced = {
+            **row,
+            'offer_quantity': offer_quantity,
+            'fish_price': fish_price,
+            'freight_price': freight_price,
+            'margin': margin,
+            'fish_size': fish_size,
+        }
+
+        if with_totals:
+            tariff_percent = row.get('tariff_percent', 0)
+            key = (fish_price_dec, freight_price_dec, tariff_percent, margin_dec)
+            row_totals = totals.get(key)
+            if row_totals is None:
+                tariff_amount = calculate_tariff_amount(fish_price_dec, _as_decimal(tariff_percent))
+                fish_price_with_tariff = fish_price_dec + tariff_amount
+                total = fish_price_with_tariff + margin_dec + freight_price_dec
+                row_totals = totals[key] = (float(tariff_amount), float(fish_price_with_tariff), float(total))
+            priced['tariff_amount'], priced['base_cost'], priced['total_price'] = row_totals
+
+        results.append(priced)
+    return results
+
+
+def calculate_line_item_prices(
+    fish_price: Decimal,
+    freight_price: Decimal,
+    tariff_percent: Decimal,
+    margin: Decimal,
+    clearing_charges: Decimal = Decimal('0')
+) -> Tuple[Decimal, Decimal, Decimal]:
+    """
+    Price a saved estimate line item, staying in Decimal throughout.
+
+    Returns:
+        (tariff_amount, price, total_price) where
+        price = fish_price_with_tariff + margin + freight_price and
+        total_price = price + clearing_charges
+    """
+    tariff_amount = calculate_tariff_amount(fish_price, tariff_percent)
+    price = fish_price + tariff_amount + margin + freight_price
+    return tariff_amount, price, price + clearing_charges
+
+
 def round_to_nearest_hundred(value: Decimal) -> Decimal:
     """
     Round a value to the nearest 100 using Excel-style logic.
@@ -0,0 +1,195 @@
+"""
+Quote notifications: the vendor's confirmation email and the owner
+notification, sent as 'quote.vendor_email' and 'quote.owner_notification'
+jobs on the job queue.
+
+create_quote enqueues both in the transaction that inserts the quote, with
+the quote, destinations and products it has in hand, so the emails go out
+without re-reading the quote and survive a restart. Jobs queued by the
+resend endpoints carry only the quote_id and load the quote when they run.
+Each job's reference is 'quote:<id>', which GET /quotes/{quote_id}/email-status
+reads back.
+"""
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException
+from psycopg.rows import dict_row
+
+from app.core.settings import settings
+from app.db.async_db import get_async_conn
+from app.db.queries import DatabaseQueries
+from app.services.email_client import post_email_service
+from app.services.job_queue import JobFailed, enqueue_job, idempotency_key, job_handler
+
+logger = logging.getLogger(__name__)
+
+VENDOR_EMAIL_JOB = 'quote.vendor_email'
+OWNER_NOTIFICATION_JOB = 'quote.owner_notification'
+
+
+def convert_for_json(obj):
+    """Convert Decimal, date, and datetime objects for JSON serialization."""
+    if isinstance(obj, dict):
+        return {key: convert_for_json(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_for_json(item) for item in obj]
+    elif isinstance(obj, Decimal):
+        return float(obj) if obj is not None else 0.0
+    elif isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    return obj
+
+
+def build_quote_data(quote_row: dict, destinations: list, sizes: list) -> dict:
+    """Quote summary sent to the email service for vendor and owner notifications."""
+    return {
+        "quote_id": quote_row['quote_id'],
+        "vendor_name": quote_row['vendor_name'],
+        "vendor_code": quote_row.get('vendor_code', 'N/A'),
+        "country_of_origin": quote_row['country_of_origin'],
+        "quote_valid_till": f"{quote_row['quote_valid_till']}T00:00:00" if quote_row['quote_valid_till'] else None,
+        "fish_type": quote_row['fish_type'],
+        "destinations": convert_for_json([dict(dest) for dest in destinations]),
+        "sizes": convert_for_json([dict(size) for size in sizes]),
+        "notes": quote_row.get('notes'),
+        "price_negotiable": quote_row.get('price_negotiable', False),
+        "exclusive_offer": quote_row.get('exclusive_offer', False),
+        "created_at": convert_for_json(quote_row['created_at']) if quote_row['created_at'] else None
+    }
+
+
+def vendor_email_payload(quote_row: dict, destinations: list, sizes: list) -> dict:
+    return {
+        "quote_id": quote_row['quote_id'],
+        "vendor_email": quote_row['contact_email'],
+        "vendor_name": quote_row['vendor_name'],
+        "quote_data": convert_for_json(build_quote_data(quote_row, destinations, sizes))
+    }
+
+
+def owner_email_payload(quote_row: dict, destinations: list, sizes: list) -> dict:
+    return {
+        "quote_id": quote_row['quote_id'],
+        "owner_email": settings.owner_notification_email,
+        "vendor_name": quote_row['vendor_name'],
+        "quote_data": convert_for_json(build_quote_data(quote_row, destinations, sizes))
+    }
+
+
+async def log_vendor_email(quote_id: int, vendor_email: str, sent: bool):
+    """Record a vendor email in email_log, if that table exists."""
+    async with get_async_conn() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(DatabaseQueries.SCHEMA['check_email_log'])
+            if not await cur.fetchone():
+                return
+            await cur.execute(
+                DatabaseQueries.EMAIL['insert_log'],
+                (quote_id, vendor_email, 'sent' if sent else 'failed')
+            )
+        await conn.commit()
+
+
+def quote_reference(quote_id: int) -> str:
+    return f"quote:{quote_id}"
+
+
+async def load_quote_for_email(cur, quote_id: int):
+    """Quote row plus its destinations and sizes, or (None, [], []) if the quote doesn't exist."""
+    await cur.execute(DatabaseQueries.EMAIL['get_vendor_quote'], (quote_id,))
+    quote_row = await cur.fetchone()
+    if not quote_row:
+        return None, [], []
+
+    await cur.execute(DatabaseQueries.QUOTES['get_destinations'], (quote_id,))
+    destinations = await cur.fetchall()
+
+    await cur.execute(DatabaseQueries.QUOTES['get_products'], (quote_id,))
+    sizes = await cur.fetchall()
+    return quote_row, destinations, sizes
+
+
+def enqueue_quote_notifications(cur, quote_row: dict, destinations: list, sizes: list) -> dict:
+    """
+    Queue both notifications for a new quote through the caller's psycopg2
+    cursor, so they commit (or roll back) with the quote itself.
+
+    Args:
+        quote_row: the fields GET_VENDOR_QUOTE_FOR_EMAIL returns, built from
+            the quote being inserted rather than re-read
+        destinations: rows shaped like QUOTES['get_destinations']
+        sizes: rows shaped like QUOTES['get_products']
+
+    Returns:
+        {job kind: job id}
+    """
+    payload = {
+        "quote_id": quote_row['quote_id'],
+        "quote": convert_for_json({"row": quote_row, "destinations": destinations, "sizes": sizes}),
+    }
+    reference = quote_reference(quote_row['quote_id'])
+    return {
+        kind: enqueue_job(cur, kind, payload, reference=reference)
+        for kind in (VENDOR_EMAIL_JOB, OWNER_NOTIFICATION_JOB)
+    }
+
+
+async def _quote_email_data(payload: dict):
+    quote = payload.get('quote')
+    if quote:
+        return quote['row'], quote['destinations'], quote['sizes']
+
+    async with get_async_conn() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            quote_row, destinations, sizes = await load_quote_for_email(cur, payload['quote_id'])
+    if not quote_row:
+        raise HTTPException(status_code=404, detail="Quote not found")
+    return quote_row, destinations, sizes
+
+
+async def _post(path: str, payload: dict) -> dict:
+    response = await post_email_service(path, payload, idempotency_key=idempotency_key())
+    if response.status_code != 200:
+        logger.error(f"Email service error: {response.status_code} - {response.text}")
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Email service error: {response.text}"
+        )
+    return response.json()
+
+
+@job_handler(VENDOR_EMAIL_JOB)
+async def send_vendor_confirmation(payload: dict) -> dict:
+    """Job handler: email the vendor a confirmation of their quote."""
+    quote_row, destinations, sizes = await _quote_email_data(payload)
+    quote_id = quote_row['quote_id']
+
+    if not quote_row.get('is_email_enabled', False):
+        return {"success": False, "skipped": True, "message": "Email notifications disabled for this vendor"}
+
+    if not quote_row.get('contact_email'):
+        raise HTTPException(status_code=400, detail="No email address found for this vendor")
+
+    vendor_email = quote_row['contact_email']
+    logger.info(f"Sending vendor confirmation for quote {quote_id}, vendor: {quote_row['vendor_name']}")
+    email_result = await _post("/email/vendor-notification", vendor_email_payload(quote_row, destinations, sizes))
+    await log_vendor_email(quote_id, vendor_email, email_result['success'])
+
+    if not email_result['success']:
+        raise JobFailed(email_result['message'])
+    return {"success": True, "message": email_result['message'], "vendor_email": vendor_email}
+
+
+@job_handler(OWNER_NOTIFICATION_JOB)
+async def send_owner_notification(payload: dict) -> dict:
+    """Job handler: tell the owner a vendor has submitted a quote."""
+    quote_row, destinations, sizes = await _quote_email_data(payload)
+
+    logger.info(f"Sending owner notification for quote {quote_row['quote_id']}, vendor: {quote_row['vendor_name']}")
+    email_result = await _post("/email/owner-notification", owner_email_payload(quote_row, destinations, sizes))
+
+    if not email_result['success']:
+        raise JobFailed(email_result['message'])
+    return {"success": True, "message": email_result['message'], "owner_email": settings.owner_notification_email}
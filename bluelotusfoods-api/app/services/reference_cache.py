@@ -0,0 +1,260 @@
+"""
+In-process cache of reference data: dictionary categories, fish species,
+cuts, grades and sizes, and the name -> id maps used when ingesting quotes.
+
+This data changes about once a month but is read on every portal page load,
+so it is served from memory for settings.reference_cache_ttl seconds and
+reloaded from Postgres on the first read after that. Each dataset is loaded
+by one thread at a time; concurrent readers of a dataset that is being
+(re)loaded wait for that load instead of querying as well. If a reload
+fails the stale copy keeps being served. warm() runs in the lifespan hook,
+and POST /admin/reference-cache/refresh forces a reload after data changes.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+from app.core.settings import settings
+from app.db.db import get_conn
+from app.db.queries import DatabaseQueries
+
+logger = logging.getLogger(__name__)
+
+# A name missing from an id map triggers at most one reload per interval,
+# so rows added since the last load are picked up without letting a stream
+# of bad names turn every lookup into a query.
+MISS_RELOAD_INTERVAL = 30.0
+
+
+class _Entry:
+    __slots__ = ('value', 'loaded_at')
+
+    def __init__(self, value, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class _KeyStats:
+    __slots__ = ('hits', 'misses', 'loads', 'load_errors', 'load_time')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.load_time = 0.0
+
+
+class ReferenceCache:
+    """Thread-safe TTL cache of loader results, with per-key hit/miss stats."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._loaders: Dict[str, Callable] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, _KeyStats] = {}
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _stats_for(self, key: str) -> _KeyStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _KeyStats()
+        return stats
+
+    def _fresh(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+        return None
+
+    def get(self, key: str, loader: Callable):
+        """Cached value for key, calling loader() to (re)load it when missing or expired."""
+        with self._lock:
+            self._loaders[key] = loader
+            entry = self._fresh(key)
+            stats = self._stats_for(key)
+            if entry is not None:
+                stats.hits += 1
+                return entry.value
+            stats.misses += 1
+
+        with self._key_lock(key):
+            # Another thread may have loaded it while we waited
+            with self._lock:
+                entry = self._fresh(key)
+            if entry is not None:
+                return entry.value
+            return self._load(key, loader)
+
+    def _load(self, key: str, loader: Callable, serve_stale: bool = True):
+        start = time.monotonic()
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._stats_for(key).load_errors += 1
+                stale = self._entries.get(key)
+            if stale is None or not serve_stale:
+                raise
+            logger.warning(f"Reloading reference data '{key}' failed, serving stale copy: {e}")
+            return stale.value
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(value, now)
+            stats = self._stats_for(key)
+            stats.loads += 1
+            stats.load_time += now - start
+        return value
+
+    def age(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else time.monotonic() - entry.loaded_at
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one key (or everything); the next read reloads it."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def refresh(self, key: Optional[str] = None) -> List[str]:
+        """Reload one key (or every key read so far) now. Returns the keys reloaded; raises if a load fails."""
+        with self._lock:
+            if key is None:
+                targets = list(self._loaders.items())
+            else:
+                targets = [(key, self._loaders[key])] if key in self._loaders else []
+        for target, loader in targets:
+            with self._key_lock(target):
+                self._load(target, loader, serve_stale=False)
+        return [target for target, _ in targets]
+
+    def stats(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    'hits': s.hits,
+                    'misses': s.misses,
+                    'loads': s.loads,
+                    'load_errors': s.load_errors,
+                    'load_time': s.load_time,
+                    'age_seconds': (now - self._entries[key].loaded_at) if key in self._entries else None,
+                    'size': len(self._entries[key].value) if key in self._entries else 0,
+                }
+                for key, s in self._stats.items()
+            }
+
+
+reference_cache = ReferenceCache(ttl=settings.reference_cache_ttl)
+
+
+def _fetch_all(sql: str, params: tuple = None) -> List[dict]:
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, params)
+            return [dict(row) for row in cur.fetchall()]
+
+
+def _fetch_ids(sql: str) -> Dict[str, int]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            return {name: row_id for name, row_id in cur.fetchall()}
+
+
+# ─── Lists served by the dictionary and fish endpoints ─────
+
+
+def _load_dictionary() -> Dict[str, List[dict]]:
+    # One entry for all categories keeps the cache bounded whatever
+    # category names clients ask for
+    by_category = {}
+    for row in _fetch_all(DatabaseQueries.DICTIONARY['get_all']):
+        by_category.setdefault(row.pop('category'), []).append(row)
+    return by_category
+
+
+def get_dictionary(category: str) -> List[dict]:
+    return reference_cache.get('dictionary', _load_dictionary).get(category.upper(), [])
+
+
+def get_fish_types() -> List[dict]:
+    return reference_cache.get('fish_types', lambda: _fetch_all(DatabaseQueries.FISH['get_types']))
+
+
+def get_fish_cuts() -> List[dict]:
+    return reference_cache.get('fish_cuts', lambda: _fetch_all(DatabaseQueries.FISH['get_cuts']))
+
+
+def get_fish_grades() -> List[dict]:
+    return reference_cache.get('fish_grades', lambda: _fetch_all(DatabaseQueries.FISH['get_grades']))
+
+
+def get_fish_sizes(fish_species_id: Optional[int] = None) -> List[dict]:
+    sizes = reference_cache.get('fish_sizes', lambda: _fetch_all(DatabaseQueries.FISH['get_sizes']))
+    if fish_species_id is None:
+        return sizes
+    # Sizes are ordered by species then sort_order, so this keeps sort_order
+    return [size for size in sizes if size['fish_species_id'] == fish_species_id]
+
+
+# ─── name -> id maps used by quote ingestion ───────────────
+
+_ID_MAPS = {
+    'destination_ids': DatabaseQueries.DICTIONARY['get_destination_ids'],
+    'fish_ids': DatabaseQueries.FISH['get_ids'],
+    'cut_ids': DatabaseQueries.FISH['get_cut_ids'],
+    'grade_ids': DatabaseQueries.FISH['get_grade_ids'],
+}
+
+
+def resolve_ids(kind: str, names: Iterable[str]) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Map names to ids from the cached `kind` map ('destination_ids', 'fish_ids',
+    'cut_ids' or 'grade_ids').
+
+    Returns:
+        ({name: id} for the names found, sorted list of names not found)
+    """
+    sql = _ID_MAPS[kind]
+    loader = lambda: _fetch_ids(sql)
+    names = set(names)
+    ids = reference_cache.get(kind, loader)
+    if not names.issubset(ids):
+        age = reference_cache.age(kind)
+        if age is None or age >= MISS_RELOAD_INTERVAL:
+            reference_cache.refresh(kind)
+            ids = reference_cache.get(kind, loader)
+    found = {name: ids[name] for name in names if name in ids}
+    return found, sorted(names - found.keys())
+
+
+def resolve_id(kind: str, name: str) -> Optional[int]:
+    """Single-name form of resolve_ids(); None if the name is unknown."""
+    found, _ = resolve_ids(kind, (name,))
+    return found.get(name)
+
+
+def warm():
+    """Load every dataset the portals read on startup."""
+    get_dictionary('DESTINATION')
+    get_fish_types()
+    get_fish_cuts()
+    get_fish_grades()
+    get_fish_sizes()
+    for kind in _ID_MAPS:
+        resolve_ids(kind, ())
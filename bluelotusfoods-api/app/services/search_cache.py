@@ -0,0 +1,75 @@
+"""
+In-process cache of estimate search responses.
+
+Pricing staff re-run the same search (same vendors, ports and date range)
+over and over while building an estimate. Each response is cached as its
+encoded JSON body, keyed by the normalized filters, page and the
+estimate_search version stamp (db/migrations/003_create_estimate_search_version.sql)
+read at the start of the request. Any committed change to the search
+table - a new quote, a tariff or size edit, from this instance or any
+other - bumps the version, so older entries are simply never asked for
+again and age out of the LRU.
+
+The cache is bounded by the total size of the cached bodies
+(settings.estimate_search_cache_max_bytes), least recently used first.
+It is only used from async handlers on the event loop, so it takes no lock.
+"""
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.core.settings import settings
+
+
+class SearchCache:
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: Hashable, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = body
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+search_cache = SearchCache(max_bytes=settings.estimate_search_cache_max_bytes)
@@ -0,0 +1,35 @@
+-- Durable queue for emails, PDFs and other slow side effects
+-- (app/services/job_queue.py). Workers claim rows with FOR UPDATE SKIP LOCKED.
+
+CREATE TABLE IF NOT EXISTS job_queue (
+    id            BIGSERIAL PRIMARY KEY,
+    kind          VARCHAR(100) NOT NULL,
+    payload       JSONB NOT NULL DEFAULT '{}'::jsonb,
+    reference     VARCHAR(100),
+    status        VARCHAR(20) NOT NULL DEFAULT 'queued'
+                  CHECK (status IN ('queued', 'running', 'done', 'dead')),
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 6,
+    run_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_at     TIMESTAMPTZ,
+    locked_by     VARCHAR(200),
+    last_error    TEXT,
+    result        JSONB,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at   TIMESTAMPTZ
+);
+
+-- Claim scan: due queued jobs, and running jobs whose lease has expired
+CREATE INDEX IF NOT EXISTS idx_job_queue_queued_run_at
+    ON job_queue (run_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_job_queue_running_locked_at
+    ON job_queue (locked_at) WHERE status = 'running';
+
+-- Status lookups for one entity, e.g. reference = 'quote:42'
+CREATE INDEX IF NOT EXISTS idx_job_queue_reference
+    ON job_queue (reference) WHERE reference IS NOT NULL;
+
+-- Retention purge of finished jobs
+CREATE INDEX IF NOT EXISTS idx_job_queue_finished_at
+    ON job_queue (finished_at) WHERE status = 'done';
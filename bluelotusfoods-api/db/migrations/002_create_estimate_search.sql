@@ -0,0 +1,185 @@
+-- Denormalized estimate search (app/api/buyer_pricing/estimates.py).
+-- One row per quote destination x quote product, with the vendor, port,
+-- species, cut, grade, size label and tariff already resolved, so a search
+-- is a range scan of one covering index instead of a 10-way join.
+--
+-- Triggers keep it current: rows are rebuilt from estimate_search_source
+-- whenever a quote, its destinations or products, or a vendor, port,
+-- species, cut, grade, fish_size or tariff row they were built from changes.
+
+-- The join the search used to run; every row of estimate_search is a row of this view
+CREATE OR REPLACE VIEW estimate_search_source AS
+SELECT
+    qd.id AS quote_destination_id,
+    qp.id AS quote_product_id,
+    q.id AS quote_id,
+    q.created_at AS quote_created_at,
+    v.id AS vendor_id,
+    v.name AS vendor_name,
+    v.country AS vendor_country,
+    d.id AS destination_id,
+    d.code AS port,
+    f.id AS fish_species_id,
+    f.common_name,
+    f.scientific_name,
+    fc.id AS cut_id,
+    fc.name AS cut,
+    fg.id AS grade_id,
+    fg.name AS grade,
+    qp.fish_size_id,
+    qp.weight_range,
+    CASE
+        WHEN fsz.lbs_max IS NOT NULL
+            THEN fsz.lbs_label::float8::text || '–' || fsz.lbs_max::float8::text
+        WHEN fsz.lbs_label IS NOT NULL
+            THEN fsz.lbs_label::float8::text
+        ELSE qp.weight_range::text
+    END AS fish_size,
+    qp.quantity AS offer_quantity,
+    qp.price_per_kg AS fish_price,
+    qd.airfreight_per_kg AS freight_price,
+    COALESCE(t.reciprocal_tariff + t.secondary_tariff, 0)
+    + COALESCE(tg.reciprocal_tariff + tg.secondary_tariff, 0) AS tariff_percent
+FROM quote q
+JOIN vendors v ON q.vendor_id = v.id
+LEFT JOIN tariff t ON v.country = t.country AND t.active = true AND t.country != 'Global'
+LEFT JOIN tariff tg ON tg.country = 'Global' AND tg.active = true
+JOIN quote_destination qd ON q.id = qd.quote_id
+JOIN dictionary d ON qd.destination_id = d.id
+JOIN quote_product qp ON q.id = qp.quote_id
+LEFT JOIN fish_size fsz ON qp.fish_size_id = fsz.id
+JOIN fish_species f ON qp.fish_id = f.id
+JOIN fish_cut fc ON qp.cut = fc.id
+JOIN fish_grade fg ON qp.grade = fg.id;
+
+-- Built from the view, so the column types and order are the view's and
+-- INSERT ... SELECT * FROM estimate_search_source lines up
+CREATE TABLE IF NOT EXISTS estimate_search AS
+    SELECT * FROM estimate_search_source WITH NO DATA;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'estimate_search_pkey') THEN
+        ALTER TABLE estimate_search ADD CONSTRAINT estimate_search_pkey
+            PRIMARY KEY (quote_destination_id, quote_product_id);
+    END IF;
+END $$;
+
+-- Search page scan, in the search's sort order. Every column the search and
+-- the buyer estimates list return is included, so both are index-only scans.
+CREATE INDEX IF NOT EXISTS idx_estimate_search_page
+    ON estimate_search (quote_id DESC, port, common_name, (COALESCE(weight_range::text, '')),
+                        quote_destination_id, quote_product_id)
+    INCLUDE (quote_created_at, vendor_id, vendor_name, fish_species_id, scientific_name,
+             cut_id, cut, grade_id, grade, fish_size_id, weight_range, fish_size,
+             offer_quantity, fish_price, freight_price, tariff_percent);
+
+-- Date-range searches without a page limit (buyer estimates list)
+CREATE INDEX IF NOT EXISTS idx_estimate_search_created_at
+    ON estimate_search (quote_created_at);
+
+-- Rebuilds on quote_product changes look rows up by product
+CREATE INDEX IF NOT EXISTS idx_estimate_search_quote_product
+    ON estimate_search (quote_product_id);
+
+-- Rows carry tariff_percent, so a rebuild and a tariff refresh in
+-- concurrent transactions could each miss the other's uncommitted change
+-- and leave rows with a stale tariff. Rebuilds take this transaction lock
+-- shared (they don't block each other) and tariff refreshes exclusive, so
+-- whichever runs second waits for the first to commit and, with a fresh
+-- READ COMMITTED snapshot, sees its rows or its tariffs.
+CREATE OR REPLACE FUNCTION estimate_search_tariff_lock_key() RETURNS BIGINT
+LANGUAGE sql IMMUTABLE AS $$ SELECT hashtext('estimate_search.tariff_percent')::BIGINT $$;
+
+-- Rebuilds the rows whose TG_ARGV[0] column matches the id of a changed row.
+-- Statement-level, so inserting a quote's products in one statement
+-- rebuilds them in one pass.
+CREATE OR REPLACE FUNCTION estimate_search_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    ids BIGINT[];
+BEGIN
+    PERFORM pg_advisory_xact_lock_shared(estimate_search_tariff_lock_key());
+
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(id) INTO ids FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(id) INTO ids FROM (SELECT id FROM new_rows UNION SELECT id FROM old_rows) changed;
+    ELSE
+        SELECT array_agg(id) INTO ids FROM old_rows;
+    END IF;
+
+    IF ids IS NOT NULL THEN
+        EXECUTE format('DELETE FROM estimate_search WHERE %I = ANY($1)', TG_ARGV[0]) USING ids;
+        EXECUTE format('INSERT INTO estimate_search SELECT * FROM estimate_search_source WHERE %I = ANY($1)',
+                       TG_ARGV[0]) USING ids;
+    END IF;
+    RETURN NULL;
+END $$;
+
+-- A tariff change moves tariff_percent for every vendor in that country
+-- (or every vendor, for 'Global'); only rows whose value changed are written
+CREATE OR REPLACE FUNCTION estimate_search_refresh_tariffs() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(estimate_search_tariff_lock_key());
+
+    UPDATE estimate_search es
+    SET tariff_percent = c.tariff_percent
+    FROM (
+        SELECT v.country,
+               COALESCE(t.reciprocal_tariff + t.secondary_tariff, 0)
+               + COALESCE(tg.reciprocal_tariff + tg.secondary_tariff, 0) AS tariff_percent
+        FROM (SELECT DISTINCT vendor_country AS country FROM estimate_search) v
+        LEFT JOIN tariff t ON v.country = t.country AND t.active = true AND t.country != 'Global'
+        LEFT JOIN tariff tg ON tg.country = 'Global' AND tg.active = true
+    ) c
+    WHERE es.vendor_country IS NOT DISTINCT FROM c.country
+      AND es.tariff_percent IS DISTINCT FROM c.tariff_percent;
+    RETURN NULL;
+END $$;
+
+-- (table, estimate_search column its id maps to, events)
+DO $$
+DECLARE
+    src RECORD;
+    event TEXT;
+    transition TEXT;
+BEGIN
+    FOR src IN SELECT * FROM (VALUES
+        ('quote_destination', 'quote_destination_id', ARRAY['INSERT', 'UPDATE', 'DELETE']),
+        ('quote_product',     'quote_product_id',     ARRAY['INSERT', 'UPDATE', 'DELETE']),
+        ('quote',             'quote_id',             ARRAY['UPDATE']),
+        ('vendors',           'vendor_id',            ARRAY['UPDATE']),
+        ('dictionary',        'destination_id',       ARRAY['UPDATE']),
+        ('fish_species',      'fish_species_id',      ARRAY['UPDATE']),
+        ('fish_cut',          'cut_id',               ARRAY['UPDATE']),
+        ('fish_grade',        'grade_id',             ARRAY['UPDATE']),
+        ('fish_size',         'fish_size_id',         ARRAY['UPDATE', 'DELETE'])
+    ) AS s(tbl, col, events)
+    LOOP
+        FOREACH event IN ARRAY src.events
+        LOOP
+            transition := CASE event
+                WHEN 'INSERT' THEN 'NEW TABLE AS new_rows'
+                WHEN 'UPDATE' THEN 'OLD TABLE AS old_rows NEW TABLE AS new_rows'
+                ELSE 'OLD TABLE AS old_rows'
+            END;
+            EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I',
+                           'estimate_search_' || lower(event), src.tbl);
+            EXECUTE format('CREATE TRIGGER %I AFTER %s ON %I REFERENCING %s '
+                           'FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_refresh(%L)',
+                           'estimate_search_' || lower(event), event, src.tbl, transition, src.col);
+        END LOOP;
+    END LOOP;
+END $$;
+
+DROP TRIGGER IF EXISTS estimate_search_tariff ON tariff;
+CREATE TRIGGER estimate_search_tariff
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tariff
+    FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_refresh_tariffs();
+
+-- Backfill existing quotes
+TRUNCATE estimate_search;
+INSERT INTO estimate_search SELECT * FROM estimate_search_source;
+ANALYZE estimate_search;
@@ -0,0 +1,56 @@
+-- Version stamp of estimate_search (002_create_estimate_search.sql). Every
+-- statement that changes estimate_search (a quote being created, a tariff
+-- or size edit, ...) bumps it in the same transaction, so the API's search
+-- result cache (app/services/search_cache.py) keys entries by it and never
+-- serves results from before a committed change, on any instance.
+
+CREATE TABLE IF NOT EXISTS estimate_search_version (
+    id          BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),  -- a single row
+    version     BIGINT NOT NULL DEFAULT 0,
+    changed_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO estimate_search_version (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
+
+-- Statements that change no rows (a tariff edit that moves no
+-- tariff_percent, a delete that matches nothing) leave the version alone,
+-- so they neither invalidate the cache nor queue behind other writers for
+-- the version row
+CREATE OR REPLACE FUNCTION estimate_search_bump_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    changed BOOLEAN;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        changed := EXISTS (SELECT 1 FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed := EXISTS (SELECT 1 FROM old_rows);
+    ELSE
+        changed := TRUE;
+    END IF;
+
+    IF changed THEN
+        UPDATE estimate_search_version SET version = version + 1, changed_at = NOW();
+    END IF;
+    RETURN NULL;
+END $$;
+
+-- Transition tables need one trigger per event; TRUNCATE has none
+DROP TRIGGER IF EXISTS estimate_search_version ON estimate_search;
+DROP TRIGGER IF EXISTS estimate_search_version_insert ON estimate_search;
+DROP TRIGGER IF EXISTS estimate_search_version_update ON estimate_search;
+DROP TRIGGER IF EXISTS estimate_search_version_delete ON estimate_search;
+DROP TRIGGER IF EXISTS estimate_search_version_truncate ON estimate_search;
+
+CREATE TRIGGER estimate_search_version_insert
+    AFTER INSERT ON estimate_search REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_bump_version();
+CREATE TRIGGER estimate_search_version_update
+    AFTER UPDATE ON estimate_search REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_bump_version();
+CREATE TRIGGER estimate_search_version_delete
+    AFTER DELETE ON estimate_search REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_bump_version();
+CREATE TRIGGER estimate_search_version_truncate
+    AFTER TRUNCATE ON estimate_search
+    FOR EACH STATEMENT EXECUTE FUNCTION estimate_search_bump_version();
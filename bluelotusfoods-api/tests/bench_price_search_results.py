@@ -0,0 +1,62 @@
+"""
+Benchmark of price_search_results against the per-row scalar path it
+replaced (convert_vendor_price_to_buyer_price + calculate_estimate_totals).
+
+Run from bluelotusfoods-api:  PYTHONPATH=. python tests/bench_price_search_results.py
+"""
+import random
+import time
+from decimal import Decimal
+
+from app.services.pricing_calculations import (
+    calculate_estimate_totals,
+    convert_vendor_price_to_buyer_price,
+    price_search_results,
+)
+
+REPEAT = 30
+
+
+def search_rows(n: int, quotes: int, seed: int = 7) -> list:
+    """Rows shaped like an estimate search page: n quote product x destination rows over `quotes` quotes."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        sized = rnd.random() < 0.6
+        rows.append({
+            'quote_id': i // (n // quotes or 1),
+            'quote_date': '2026-10-01',
+            'vendor_name': 'Vendor',
+            'port': rnd.choice(['LAX', 'JFK', 'ORD']),
+            'common_name': 'Tuna',
+            'cut': 'Loin',
+            'grade': 'A',
+            'fish_size_id': 3 if sized else None,
+            'fish_size': rnd.choice(['4.0–6.0', '2.0']) if sized
+            else rnd.choice(['2-3 kg', '5+ kg', '0.5', None, '45']),
+            'offer_quantity': rnd.choice([Decimal('100'), Decimal('250.5'), 300, Decimal('1000.00')]),
+            'fish_price': Decimal(rnd.randint(300, 2500)) / 100,
+            'freight_price': rnd.choice([Decimal('2.50'), Decimal('3.10'), Decimal('2.755'), 1.7]),
+            'tariff_percent': rnd.choice([Decimal('12'), Decimal('0'), Decimal('27.5'), 0]),
+            'margin': 0,
+        })
+    return rows
+
+
+def _ms(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    for n, quotes in [(200, 20), (1000, 100), (5000, 500)]:
+        rows = search_rows(n, quotes)
+        scalar = _ms(lambda: [calculate_estimate_totals(convert_vendor_price_to_buyer_price(dict(r))) for r in rows])
+        batch = _ms(lambda: price_search_results(rows))
+        print(f"{n:5d} rows: scalar {scalar:7.2f} ms  batch {batch:7.2f} ms  x{scalar / batch:.1f}")
+
+
+if __name__ == '__main__':
+    main()
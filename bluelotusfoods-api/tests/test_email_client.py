@@ -0,0 +1,122 @@
+"""
+Email service calls must not run while a pooled DB connection is held.
+
+Drives post_email_service inside and outside get_conn() / get_async_conn()
+with the connection guard in strict mode. The pools are stand-ins that hand
+out placeholder connections, and the email service is an httpx
+MockTransport, so no database or email service is needed.
+
+Run from bluelotusfoods-api:  python -m unittest discover tests
+"""
+import asyncio
+import os
+import unittest
+
+# Required settings without defaults; values are never used to connect
+for name, value in {
+    'DB_NAME': 'test', 'DB_USER': 'test', 'DB_PASSWORD': '', 'DB_HOST': 'localhost', 'DB_PORT': '5432',
+    'CORS_ORIGINS': '*', 'CORS_ALLOW_CREDENTIALS': 'false', 'CORS_ALLOW_METHODS': '*', 'CORS_ALLOW_HEADERS': '*',
+    'API_HOST': 'localhost', 'API_PORT': '8000',
+    'EMAIL_SERVICE_URL': 'http://email.test', 'OWNER_NOTIFICATION_EMAIL': 'owner@example.com',
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+
+from app.core.settings import settings
+from app.db import async_db, db
+from app.db.async_db import get_async_conn
+from app.db.db import get_conn
+from app.db.guard import ConnectionHeldError, connections_held
+from app.services import email_client
+from app.services.email_client import post_email_service
+
+
+class _Pool:
+    def getconn(self):
+        return object()
+
+    def putconn(self, conn):
+        pass
+
+
+class _AsyncConnection:
+    class info:
+        transaction_status = None
+
+
+class _AsyncPool:
+    async def getconn(self):
+        return _AsyncConnection()
+
+    async def putconn(self, conn):
+        pass
+
+
+class EmailServiceConnectionGuardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request.url.path)
+            return httpx.Response(200, json={"success": True})
+
+        self._saved = (db.db_pool, async_db.async_db_pool, email_client._client, settings.db_connection_guard_strict)
+        db.db_pool = _Pool()
+        async_db.async_db_pool = _AsyncPool()
+        email_client._client = httpx.AsyncClient(base_url="http://email.test", transport=httpx.MockTransport(handler))
+        settings.db_connection_guard_strict = True
+
+    def tearDown(self):
+        asyncio.run(email_client._client.aclose())
+        db.db_pool, async_db.async_db_pool, email_client._client, settings.db_connection_guard_strict = self._saved
+
+    def test_passes_without_a_connection(self):
+        response = asyncio.run(post_email_service("/email/vendor-notification", {}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.requests, ["/email/vendor-notification"])
+
+    def test_refuses_inside_get_conn(self):
+        async def send():
+            with get_conn():
+                await post_email_service("/email/vendor-notification", {})
+
+        with self.assertRaises(ConnectionHeldError):
+            asyncio.run(send())
+        self.assertEqual(self.requests, [])
+
+    def test_refuses_inside_get_async_conn(self):
+        async def send():
+            async with get_async_conn():
+                await post_email_service("/email/vendor-notification", {})
+
+        with self.assertRaises(ConnectionHeldError):
+            asyncio.run(send())
+        self.assertEqual(self.requests, [])
+
+    def test_passes_after_the_connection_is_released(self):
+        async def send():
+            with get_conn():
+                pass
+            async with get_async_conn():
+                pass
+            self.assertEqual(connections_held(), 0)
+            return await post_email_service("/email/vendor-notification", {})
+
+        self.assertEqual(asyncio.run(send()).status_code, 200)
+        self.assertEqual(self.requests, ["/email/vendor-notification"])
+
+    def test_only_logs_when_not_strict(self):
+        settings.db_connection_guard_strict = False
+
+        async def send():
+            with get_conn():
+                return await post_email_service("/email/vendor-notification", {})
+
+        with self.assertLogs("app.db.guard", level="WARNING"):
+            self.assertEqual(asyncio.run(send()).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Parity of the batch search pricing (price_search_results) with the scalar
+reference (convert_vendor_price_to_buyer_price + calculate_estimate_totals).
+
+Run from bluelotusfoods-api:  python -m unittest discover tests
+"""
+import random
+import unittest
+from decimal import Decimal
+
+from app.services.pricing_calculations import (
+    calculate_estimate_totals,
+    convert_vendor_price_to_buyer_price,
+    price_search_results,
+)
+
+
+def _row(**values) -> dict:
+    row = {
+        'quote_id': 1,
+        'vendor_name': 'Vendor',
+        'port': 'LAX',
+        'fish_size_id': None,
+        'fish_size': None,
+        'offer_quantity': Decimal('100'),
+        'fish_price': Decimal('12.50'),
+        'freight_price': Decimal('2.75'),
+        'tariff_percent': Decimal('15'),
+        'margin': 0,
+    }
+    row.update(values)
+    return row
+
+
+def _random_rows(n: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        sized = rnd.random() < 0.5
+        rows.append(_row(
+            quote_id=i // 10,
+            fish_size_id=3 if sized else None,
+            fish_size=rnd.choice(['4.0–6.0', '2.0', None]) if sized
+            else rnd.choice(['2-3 kg', '5+ kg', '0.5 kg', '45', 'large', '', None]),
+            offer_quantity=rnd.choice([Decimal('100'), Decimal('250.5'), 300, 12.75, Decimal('0')]),
+            fish_price=rnd.choice([Decimal(rnd.randint(300, 2500)) / 100, rnd.randint(1, 30), rnd.uniform(1, 30)]),
+            freight_price=rnd.choice([Decimal('2.50'), Decimal('3.10'), Decimal('2.755'), 1.7, 2, 0]),
+            tariff_percent=rnd.choice([Decimal('12'), Decimal('0'), Decimal('27.5'), 0, 10, 12.5]),
+            margin=rnd.choice([0, Decimal('0'), Decimal('1.25'), 0.5]),
+        ))
+    return rows
+
+
+class PriceSearchResultsParityTest(unittest.TestCase):
+
+    def assert_parity(self, rows):
+        expected = [calculate_estimate_totals(convert_vendor_price_to_buyer_price(dict(r))) for r in rows]
+        actual = price_search_results(rows)
+        self.assertEqual(len(actual), len(expected))
+        for i, (want, got) in enumerate(zip(expected, actual)):
+            # Same fields in the same order, each with the same value and type
+            self.assertEqual(list(got), list(want), f"row {i}")
+            for field, value in want.items():
+                self.assertEqual(got[field], value, f"row {i} {field}")
+                self.assertIs(type(got[field]), type(value), f"row {i} {field}")
+
+        expected = [convert_vendor_price_to_buyer_price(dict(r)) for r in rows]
+        actual = price_search_results(rows, with_totals=False)
+        self.assertEqual([list(d.items()) for d in actual], [list(d.items()) for d in expected])
+
+    def test_decimal_inputs(self):
+        self.assert_parity([
+            _row(),
+            _row(fish_price=Decimal('7.333'), freight_price=Decimal('3.10'), tariff_percent=Decimal('27.5')),
+        ])
+
+    def test_int_inputs(self):
+        self.assert_parity([_row(fish_price=12, freight_price=3, offer_quantity=300, tariff_percent=10, margin=1)])
+
+    def test_float_inputs(self):
+        self.assert_parity([
+            _row(fish_price=12.1, freight_price=0.1 + 0.2, offer_quantity=12.75, tariff_percent=12.5, margin=0.5),
+        ])
+
+    def test_equal_values_of_different_types(self):
+        # Equal values share a cache entry in the batch path
+        self.assert_parity([
+            _row(fish_price=Decimal('2.50'), tariff_percent=Decimal('12')),
+            _row(fish_price=2.5, tariff_percent=12),
+            _row(fish_price=Decimal('2.5'), tariff_percent=12.0),
+        ])
+
+    def test_none_fish_size(self):
+        self.assert_parity([_row(fish_size=None), _row(fish_size_id=4, fish_size=None), _row(fish_size='')])
+
+    def test_legacy_kg_size_labels(self):
+        self.assert_parity([_row(fish_size=size) for size in ['2-3 kg', '5+ kg', '0.5 kg', '45', 'large']])
+
+    def test_sized_rows_keep_their_label(self):
+        self.assert_parity([_row(fish_size_id=3, fish_size='4.0–6.0'), _row(fish_size_id=5, fish_size='2-3 kg')])
+
+    def test_zero_tariff_and_margin(self):
+        self.assert_parity([
+            _row(tariff_percent=0, margin=0),
+            _row(tariff_percent=Decimal('0'), margin=Decimal('0.00')),
+            _row(tariff_percent=0.0, margin=0.0, freight_price=0),
+        ])
+
+    def test_missing_columns_default_to_zero(self):
+        self.assert_parity([{'quote_id': 1, 'fish_size': None, 'fish_size_id': None}])
+
+    def test_random_result_sets(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.assert_parity(_random_rows(500, seed))
+
+
+if __name__ == '__main__':
+    unittest.main()
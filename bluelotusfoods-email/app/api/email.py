@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, status
 from app.schemas.email import VendorQuoteEmailRequest, OwnerNotificationEmailRequest, EmailResponse, VendorQuoteData, BuyerPricingEmailRequest, OwnerEstimateNotificationRequest, SendBPLEmailRequest, SendBPLUploadedEmailRequest
 from app.services.email_service import EmailService
+from app.services.idempotency import idempotency_store
+from app.services.pdf_renderer import RendererBusy
+from typing import Optional
 import structlog
 
 logger = structlog.get_logger()
@@ -9,7 +12,7 @@ email_service = EmailService()
 
 
 @router.post("/vendor-notification", response_model=EmailResponse)
-async def send_vendor_quote_email(request: VendorQuoteEmailRequest):
+async def send_vendor_quote_email(request: VendorQuoteEmailRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send vendor quote confirmation email with PDF attachment"""
     try:
         logger.info(f"Received email request for quote {request.quote_id}")
@@ -19,11 +22,11 @@ async def send_vendor_quote_email(request: VendorQuoteEmailRequest):
         quote_data = VendorQuoteData(**request.quote_data)
         
         # Send email
-        result = await email_service.send_vendor_quote_email(
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_vendor_quote_email(
             vendor_email=request.vendor_email,
             vendor_name=request.vendor_name,
             quote_data=quote_data
-        )
+        ))
         
         logger.info(f"Email service result: success={result.success}, message={result.message}")
         
@@ -35,6 +38,8 @@ async def send_vendor_quote_email(request: VendorQuoteEmailRequest):
         
         return result
         
+    except RendererBusy:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -52,7 +57,7 @@ async def health_check():
 
 
 @router.post("/owner-notification", response_model=EmailResponse)
-async def send_owner_notification_email(request: OwnerNotificationEmailRequest):
+async def send_owner_notification_email(request: OwnerNotificationEmailRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send owner notification email when a vendor submits a quote"""
     try:
         logger.info(f"Received owner notification request for quote {request.quote_id}")
@@ -62,11 +67,11 @@ async def send_owner_notification_email(request: OwnerNotificationEmailRequest):
         quote_data = VendorQuoteData(**request.quote_data)
         
         # Send email
-        result = await email_service.send_owner_notification_email(
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_owner_notification_email(
             owner_email=request.owner_email,
             vendor_name=request.vendor_name,
             quote_data=quote_data
-        )
+        ))
         
         logger.info(f"Owner notification result: success={result.success}, message={result.message}")
         
@@ -78,6 +83,8 @@ async def send_owner_notification_email(request: OwnerNotificationEmailRequest):
         
         return result
         
+    except RendererBusy:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -88,14 +95,14 @@ async def send_owner_notification_email(request: OwnerNotificationEmailRequest):
         )
 
 @router.post("/buyer-pricing/send-estimate", response_model=EmailResponse)
-async def send_buyer_pricing_email(request: BuyerPricingEmailRequest):
+async def send_buyer_pricing_email(request: BuyerPricingEmailRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send buyer pricing estimate email with PDF attachment"""
     try:
         logger.info(f"Received buyer pricing email request for estimate {request.estimate_number}")
         logger.info(f"Sending to emails: {request.buyer_emails}")
         
         # Send email
-        result = await email_service.send_buyer_pricing_email(
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_buyer_pricing_email(
             buyer_emails=request.buyer_emails,
             buyer_name=request.buyer_name,
             company_name=request.company_name,
@@ -104,7 +111,7 @@ async def send_buyer_pricing_email(request: BuyerPricingEmailRequest):
             delivery_date_from=request.delivery_date_from,
             delivery_date_to=request.delivery_date_to,
             notes=request.notes
-        )
+        ))
         
         logger.info(f"Buyer pricing email result: success={result.success}, message={result.message}")
         
@@ -116,6 +123,8 @@ async def send_buyer_pricing_email(request: BuyerPricingEmailRequest):
         
         return result
         
+    except RendererBusy:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -127,19 +136,20 @@ async def send_buyer_pricing_email(request: BuyerPricingEmailRequest):
 
 
 @router.post("/buyer-pricing/send-owner-notification", response_model=EmailResponse)
-async def send_owner_estimate_notification(request: OwnerEstimateNotificationRequest):
+async def send_owner_estimate_notification(request: OwnerEstimateNotificationRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send owner notification email when an estimate is sent to a buyer"""
     try:
         logger.info(f"Received owner estimate notification for estimate {request.estimate_number}")
 
-        result = await email_service.send_owner_estimate_notification(
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_owner_estimate_notification(
             owner_email=request.owner_email,
             company_name=request.company_name,
             estimate_number=request.estimate_number,
             items=request.items,
             delivery_date_from=request.delivery_date_from,
-            delivery_date_to=request.delivery_date_to
-        )
+            delivery_date_to=request.delivery_date_to,
+            buyer_name=request.buyer_name
+        ))
 
         if not result.success:
             raise HTTPException(
@@ -149,6 +159,8 @@ async def send_owner_estimate_notification(request: OwnerEstimateNotificationReq
 
         return result
 
+    except RendererBusy:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -160,13 +172,13 @@ async def send_owner_estimate_notification(request: OwnerEstimateNotificationReq
 
 
 @router.post("/bpl/send-emails", response_model=EmailResponse)
-async def send_bpl_emails(request: SendBPLEmailRequest):
+async def send_bpl_emails(request: SendBPLEmailRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send BPL emails - branded PDF to owner, plain PDF to vendor"""
     try:
         logger.info(f"Received BPL email request for PO {request.po_number}, port {request.port_code}")
         logger.info(f"Vendor: {request.vendor_name}, items count: {len(request.items)}")
 
-        result = await email_service.send_bpl_emails(request)
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_bpl_emails(request, idempotency_key))
 
         logger.info(f"BPL email result: success={result.success}, message={result.message}")
 
@@ -178,6 +190,8 @@ async def send_bpl_emails(request: SendBPLEmailRequest):
 
         return result
 
+    except RendererBusy:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -189,13 +203,13 @@ async def send_bpl_emails(request: SendBPLEmailRequest):
 
 
 @router.post("/bpl/send-uploaded", response_model=EmailResponse)
-async def send_bpl_uploaded_email(request: SendBPLUploadedEmailRequest):
+async def send_bpl_uploaded_email(request: SendBPLUploadedEmailRequest, idempotency_key: Optional[str] = Header(default=None)):
     """Send BPL emails with the vendor's uploaded document as the attachment."""
     try:
         logger.info(f"Received uploaded BPL email request for PO {request.po_number}, port {request.port_code}")
         logger.info(f"Vendor: {request.vendor_name}, file: {request.attachment_filename}")
 
-        result = await email_service.send_bpl_uploaded_emails(request)
+        result = await idempotency_store.run(idempotency_key, lambda: email_service.send_bpl_uploaded_emails(request, idempotency_key))
 
         logger.info(f"Uploaded BPL email result: success={result.success}, message={result.message}")
 
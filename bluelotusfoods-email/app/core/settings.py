@@ -11,6 +11,16 @@ class Settings(BaseSettings):
     smtp_use_tls: bool
     from_email: Optional[str]
     from_name: str
+    smtp_timeout: float = 30.0  # seconds per SMTP command
+    smtp_pool_size: int = 4  # max concurrent SMTP sessions
+    smtp_pool_max_idle: float = 120.0  # close sessions idle longer than this (seconds)
+    smtp_pool_max_messages: int = 100  # reconnect after this many messages on one session
+    pdf_render_workers: int = 1  # processes rendering PDFs off the event loop
+    pdf_render_max_queue: int = 4  # renders allowed to wait for a worker before answering 429
+    pdf_render_retry_after: int = 5  # Retry-After seconds sent with that 429
+    pdf_cache_max_bytes: int = 32 * 1024 * 1024  # in-memory LRU of rendered PDFs
+    pdf_cache_dir: Optional[str] = None  # also keep rendered PDFs on disk here
+    pdf_cache_disk_max_bytes: int = 256 * 1024 * 1024
     
     # Email Configuration
     email_simulation_mode: bool  # Set to True to simulate email sending without actual SMTP
@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api.email import router as email_router
 from app.api.test import router as test_router
 from app.core.settings import settings
+from app.services.smtp_pool import smtp_pool
+from app.services.pdf_renderer import pdf_renderer, RendererBusy
+from contextlib import asynccontextmanager
 import structlog
 import os
 import sys
@@ -38,10 +42,19 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pdf_renderer.start()
+    yield
+    # Shutdown: log out of pooled SMTP sessions, stop render workers
+    await smtp_pool.close()
+    pdf_renderer.shutdown()
+
 app = FastAPI(
     title="Blue Lotus Foods Email Service",
     description="Microservice for handling automated email notifications",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -53,6 +66,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Render queue full - tell the caller to come back later
+@app.exception_handler(RendererBusy)
+async def renderer_busy_handler(request: Request, exc: RendererBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # Include routers
 app.include_router(email_router, prefix="/email", tags=["Email"])
 app.include_router(test_router, prefix="/test", tags=["Test"])
@@ -71,5 +93,31 @@ async def health_check():
     return {
         "status": "healthy", 
         "service": "bluelotusfoods-email",
-        "port": os.environ.get('PORT', 'unknown')
-    }
\ No newline at end of file
+        "port": os.environ.get('PORT', 'unknown'),
+        "smtp_pool": smtp_pool.stats(),
+        "pdf_renderer": pdf_renderer.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of PDF render metrics"""
+    stats = pdf_renderer.stats()
+    lines = [
+        "# HELP bluelotus_email_pdf_renders_pending Renders running or waiting for a worker",
+        "# TYPE bluelotus_email_pdf_renders_pending gauge",
+        f"bluelotus_email_pdf_renders_pending {stats['pending']}",
+    ]
+    for metric, key, kind, help_text in (
+        ('bluelotus_email_pdf_renders_total', 'renders', 'counter', 'PDFs rendered'),
+        ('bluelotus_email_pdf_render_cache_hits_total', 'cached', 'counter', 'PDFs served from the render cache'),
+        ('bluelotus_email_pdf_render_shared_total', 'shared', 'counter', 'Requests that joined an identical render in progress'),
+        ('bluelotus_email_pdf_render_errors_total', 'errors', 'counter', 'Failed PDF renders'),
+        ('bluelotus_email_pdf_render_rejected_total', 'rejected', 'counter', 'Renders refused with 429'),
+        ('bluelotus_email_pdf_render_seconds_total', 'render_time', 'counter', 'Time spent rendering'),
+        ('bluelotus_email_pdf_render_seconds_max', 'max_render_time', 'gauge', 'Slowest render'),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for template, s in sorted(stats['templates'].items()):
+            lines.append(f'{metric}{{template="{template}"}} {s[key]}')
+    return "\n".join(lines) + "\n"
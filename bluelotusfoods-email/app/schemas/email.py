@@ -17,10 +17,20 @@ class OwnerNotificationEmailRequest(BaseModel):
     quote_data: dict  # The quote details from the database
     
 
+class RecipientResult(BaseModel):
+    """Outcome of one message of a fan-out send (e.g. the owner or vendor BPL copy)."""
+    role: str
+    recipient: str
+    success: bool
+    status: str  # sent, already_sent, simulated, failed
+    error: Optional[str] = None
+
+
 class EmailResponse(BaseModel):
     success: bool
     message: str
     email_id: Optional[str] = None
+    recipients: Optional[List[RecipientResult]] = None
 
 
 class QuoteDestination(BaseModel):
@@ -92,6 +102,7 @@ class OwnerEstimateNotificationRequest(BaseModel):
     items: List[BuyerEstimateItem]
     delivery_date_from: Optional[str] = None
     delivery_date_to: Optional[str] = None
+    buyer_name: Optional[str] = None  # shown on the PDF, as in the buyer's copy
 
 
 # ─── BPL Email Schemas ───────────────────────────────
@@ -6,11 +6,12 @@ from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 from typing import Optional
-import aiosmtplib
 from app.core.settings import settings
 from app.schemas.email import VendorQuoteData, EmailResponse, SendBPLEmailRequest, SendBPLUploadedEmailRequest
 import base64
-from app.services.pdf_generator import generate_vendor_quote_pdf, generate_estimate_pdf, generate_bpl_owner_pdf, generate_bpl_vendor_pdf
+from app.services.smtp_pool import smtp_pool
+from app.services.pdf_renderer import pdf_renderer, RendererBusy
+from app.services.fanout import Delivery, deliver_all, failure_summary
 import structlog
 
 logger = structlog.get_logger()
@@ -47,7 +48,7 @@ class EmailService:
                     'exclusive_offer': quote_data.exclusive_offer,
                     'created_at': quote_data.created_at
                 }
-                pdf_data = generate_vendor_quote_pdf(quote_dict)
+                pdf_data = await pdf_renderer.render('vendor_quote', quote_dict)
                 logger.info(f"Generated PDF for quote {quote_data.quote_id}, size: {len(pdf_data)} bytes")
                 return EmailResponse(
                     success=True,
@@ -79,7 +80,7 @@ class EmailService:
                 'exclusive_offer': quote_data.exclusive_offer,
                 'created_at': quote_data.created_at
             }
-            pdf_data = generate_vendor_quote_pdf(quote_dict)
+            pdf_data = await pdf_renderer.render('vendor_quote', quote_dict)
             
             # Create email message
             message = MIMEMultipart()
@@ -116,6 +117,9 @@ class EmailService:
                 email_id=f"quote_{quote_data.quote_id}"
             )
             
+        except RendererBusy:
+            # Answered with 429 by the app, not reported as a failed send
+            raise
         except Exception as e:
             logger.error(
                 "Failed to send vendor quote email",
@@ -154,7 +158,7 @@ class EmailService:
                     'exclusive_offer': quote_data.exclusive_offer,
                     'created_at': quote_data.created_at
                 }
-                pdf_data = generate_vendor_quote_pdf(quote_dict)
+                pdf_data = await pdf_renderer.render('vendor_quote', quote_dict)
                 logger.info(f"Generated PDF for owner notification quote {quote_data.quote_id}, size: {len(pdf_data)} bytes")
                 return EmailResponse(
                     success=True,
@@ -185,7 +189,7 @@ class EmailService:
                 'exclusive_offer': quote_data.exclusive_offer,
                 'created_at': quote_data.created_at
             }
-            pdf_data = generate_vendor_quote_pdf(quote_dict)
+            pdf_data = await pdf_renderer.render('vendor_quote', quote_dict)
             
             # Create email message
             message = MIMEMultipart()
@@ -230,6 +234,9 @@ class EmailService:
                 email_id=f"owner_notification_quote_{quote_data.quote_id}"
             )
             
+        except RendererBusy:
+            # Answered with 429 by the app, not reported as a failed send
+            raise
         except Exception as e:
             logger.error(
                 "Failed to send owner notification email",
@@ -421,25 +428,9 @@ class EmailService:
         """
     
     async def _send_email(self, message: MIMEMultipart):
-        """Send email using SMTP"""
+        """Send email over a pooled SMTP session"""
         try:
-            if settings.smtp_use_tls:
-                await aiosmtplib.send(
-                    message,
-                    hostname=settings.smtp_server,
-                    port=settings.smtp_port,
-                    start_tls=True,
-                    username=settings.smtp_username,
-                    password=settings.smtp_password,
-                )
-            else:
-                await aiosmtplib.send(
-                    message,
-                    hostname=settings.smtp_server,
-                    port=settings.smtp_port,
-                    username=settings.smtp_username,
-                    password=settings.smtp_password,
-                )
+            await smtp_pool.send(message)
         except Exception as e:
             logger.error("SMTP send failed", error=str(e))
             raise
@@ -465,7 +456,6 @@ class EmailService:
                 'buyer_names': buyer_name,  # Pass as string, not list
                 'delivery_date_from': delivery_date_from,
                 'delivery_date_to': delivery_date_to,
-                'notes': notes
             }
             
             # Convert items to dict format
@@ -496,7 +486,7 @@ class EmailService:
             if settings.email_simulation_mode:
                 logger.warning("Email simulation mode enabled - generating PDF but skipping SMTP")
                 # Generate PDF using the shared function - returns bytes directly
-                pdf_data = generate_estimate_pdf(estimate_data, items_dict)
+                pdf_data = await pdf_renderer.render('estimate', estimate_data, items_dict)
                 logger.info(f"Generated buyer pricing PDF for estimate {estimate_number}, size: {len(pdf_data)} bytes")
                 return EmailResponse(
                     success=True,
@@ -513,7 +503,7 @@ class EmailService:
                 )
             
             # Generate PDF using the shared function (returns bytes)
-            pdf_data = generate_estimate_pdf(estimate_data, items_dict)
+            pdf_data = await pdf_renderer.render('estimate', estimate_data, items_dict)
             
             # Create email message
             message = MIMEMultipart()
@@ -553,6 +543,9 @@ class EmailService:
                 email_id=f"estimate_{estimate_number}"
             )
             
+        except RendererBusy:
+            # Answered with 429 by the app, not reported as a failed send
+            raise
         except Exception as e:
             logger.error(
                 "Failed to send buyer pricing email",
@@ -679,16 +672,18 @@ class EmailService:
         estimate_number: str,
         items: list,
         delivery_date_from: str = None,
-        delivery_date_to: str = None
+        delivery_date_to: str = None,
+        buyer_name: str = None
     ) -> EmailResponse:
         """Send owner notification email when an estimate is sent to a buyer"""
         try:
-            # Prepare estimate data for PDF (same PDF as buyer receives)
+            # Prepare estimate data for PDF (same PDF as buyer receives, so
+            # the render cache serves it)
             estimate_data = {
                 'estimate_number': estimate_number,
                 'estimate_date': datetime.now().strftime("%Y-%m-%d"),
                 'company_name': company_name,
-                'buyer_names': company_name,
+                'buyer_names': buyer_name or company_name,
                 'delivery_date_from': delivery_date_from,
                 'delivery_date_to': delivery_date_to,
             }
@@ -719,7 +714,7 @@ class EmailService:
 
             if settings.email_simulation_mode:
                 logger.warning("Email simulation mode - skipping owner estimate notification SMTP")
-                pdf_data = generate_estimate_pdf(estimate_data, items_dict)
+                pdf_data = await pdf_renderer.render('estimate', estimate_data, items_dict)
                 logger.info(f"Generated owner notification PDF for estimate {estimate_number}, size: {len(pdf_data)} bytes")
                 return EmailResponse(
                     success=True,
@@ -735,7 +730,7 @@ class EmailService:
                 )
 
             # Generate same PDF as buyer receives
-            pdf_data = generate_estimate_pdf(estimate_data, items_dict)
+            pdf_data = await pdf_renderer.render('estimate', estimate_data, items_dict)
 
             # Create email message
             now = datetime.now()
@@ -775,6 +770,9 @@ class EmailService:
                 email_id=f"owner_estimate_{estimate_number}"
             )
 
+        except RendererBusy:
+            # Answered with 429 by the app, not reported as a failed send
+            raise
         except Exception as e:
             logger.error(
                 "Failed to send owner estimate notification",
@@ -883,9 +881,9 @@ class EmailService:
         </html>
         """
 
-    async def send_bpl_emails(self, request: SendBPLEmailRequest) -> EmailResponse:
+    async def send_bpl_emails(self, request: SendBPLEmailRequest, idempotency_key: Optional[str] = None) -> EmailResponse:
         """
-        Send two BPL emails:
+        Send two BPL emails, rendered and sent concurrently:
         1. Blue Lotus branded PDF → owner
         2. Plain PDF with vendor details → vendor
         """
@@ -926,21 +924,8 @@ class EmailService:
                 ],
             }
 
-            # Generate both PDFs
-            owner_pdf = generate_bpl_owner_pdf(bpl_data)
-            vendor_pdf = generate_bpl_vendor_pdf(bpl_data)
-
-            logger.info(f"Generated BPL PDFs: owner={len(owner_pdf)} bytes, vendor={len(vendor_pdf)} bytes")
-
-            if settings.email_simulation_mode:
-                logger.warning("Email simulation mode - BPL PDFs generated, SMTP skipped")
-                return EmailResponse(
-                    success=True,
-                    message="BPL email simulation successful - PDFs generated, SMTP skipped",
-                    email_id=f"bpl_{request.po_number}_{request.port_code}_simulation"
-                )
-
-            if not settings.smtp_username or not settings.smtp_password or not settings.from_email:
+            if not settings.email_simulation_mode and (
+                    not settings.smtp_username or not settings.smtp_password or not settings.from_email):
                 logger.warning("SMTP not configured, skipping BPL email send")
                 return EmailResponse(success=False, message="Email service not configured (missing SMTP credentials)")
 
@@ -975,15 +960,6 @@ class EmailService:
             """
             owner_msg.attach(MIMEText(owner_body, "html"))
 
-            owner_att = MIMEBase('application', 'octet-stream')
-            owner_att.set_payload(owner_pdf)
-            encoders.encode_base64(owner_att)
-            owner_att.add_header('Content-Disposition', f'attachment; filename="BPL_{safe_po}_{request.port_code}_BLF.pdf"')
-            owner_msg.attach(owner_att)
-
-            await self._send_email(owner_msg)
-            logger.info(f"BPL owner email sent to {request.owner_email}")
-
             # ─── Email 2: Vendor (plain) ───
             vendor_msg = MIMEMultipart()
             vendor_msg["From"] = f"{settings.from_name} <{settings.from_email}>"
@@ -1002,29 +978,45 @@ class EmailService:
             """
             vendor_msg.attach(MIMEText(vendor_body, "html"))
 
-            vendor_att = MIMEBase('application', 'octet-stream')
-            vendor_att.set_payload(vendor_pdf)
-            encoders.encode_base64(vendor_att)
-            vendor_att.add_header('Content-Disposition', f'attachment; filename="BPL_{safe_po}_{request.port_code}.pdf"')
-            vendor_msg.attach(vendor_att)
+            # ─── Render both PDFs, then send both emails, concurrently ───
+            results = await deliver_all([
+                Delivery('owner', request.owner_email, owner_msg, 'bpl_owner', (bpl_data,),
+                         attachment_name=f"BPL_{safe_po}_{request.port_code}_BLF.pdf"),
+                Delivery('vendor', request.vendor_email, vendor_msg, 'bpl_vendor', (bpl_data,),
+                         attachment_name=f"BPL_{safe_po}_{request.port_code}.pdf"),
+            ], idempotency_key=idempotency_key, dry_run=settings.email_simulation_mode)
 
-            await self._send_email(vendor_msg)
-            logger.info(f"BPL vendor email sent to {request.vendor_email}")
+            if settings.email_simulation_mode:
+                logger.warning("Email simulation mode - BPL PDFs generated, SMTP skipped")
+                return EmailResponse(
+                    success=True,
+                    message="BPL email simulation successful - PDFs generated, SMTP skipped",
+                    email_id=f"bpl_{request.po_number}_{request.port_code}_simulation",
+                    recipients=results
+                )
+
+            failures = failure_summary(results)
+            if failures:
+                return EmailResponse(success=False, message=f"Failed to send BPL emails: {failures}", recipients=results)
 
             return EmailResponse(
                 success=True,
                 message="BPL emails sent to owner and vendor",
-                email_id=f"bpl_{request.po_number}_{request.port_code}"
+                email_id=f"bpl_{request.po_number}_{request.port_code}",
+                recipients=results
             )
 
+        except RendererBusy:
+            # Answered with 429 by the app, not reported as a failed send
+            raise
         except Exception as e:
             logger.error(f"Failed to send BPL emails: {str(e)}", error=str(e))
             return EmailResponse(success=False, message=f"Failed to send BPL emails: {str(e)}")
 
-    async def send_bpl_uploaded_emails(self, request: SendBPLUploadedEmailRequest) -> EmailResponse:
+    async def send_bpl_uploaded_emails(self, request: SendBPLUploadedEmailRequest, idempotency_key: Optional[str] = None) -> EmailResponse:
         """
         Send BPL emails with vendor's uploaded document as attachment.
-        Sent to both owner and vendor. No PDF generation — raw file attached.
+        Sent to both owner and vendor, concurrently. No PDF generation — raw file attached.
         """
         try:
             file_bytes = base64.b64decode(request.attachment_bytes)
@@ -1090,9 +1082,6 @@ class EmailService:
             owner_msg.attach(MIMEText(owner_body, "html"))
             owner_msg.attach(_build_att(f"BPL_{safe_po}_{request.port_code}_{request.attachment_filename}"))
 
-            await self._send_email(owner_msg)
-            logger.info(f"Uploaded BPL owner email sent to {request.owner_email}")
-
             # ─── Email 2: Vendor ───
             vendor_msg = MIMEMultipart()
             vendor_msg["From"] = f"{settings.from_name} <{settings.from_email}>"
@@ -1112,13 +1101,20 @@ class EmailService:
             vendor_msg.attach(MIMEText(vendor_body, "html"))
             vendor_msg.attach(_build_att(request.attachment_filename))
 
-            await self._send_email(vendor_msg)
-            logger.info(f"Uploaded BPL vendor email sent to {request.vendor_email}")
+            results = await deliver_all([
+                Delivery('owner', request.owner_email, owner_msg),
+                Delivery('vendor', request.vendor_email, vendor_msg),
+            ], idempotency_key=idempotency_key)
+
+            failures = failure_summary(results)
+            if failures:
+                return EmailResponse(success=False, message=f"Failed to send uploaded BPL emails: {failures}", recipients=results)
 
             return EmailResponse(
                 success=True,
                 message="Uploaded BPL emails sent to owner and vendor",
-                email_id=f"bpl_upload_{request.po_number}_{request.port_code}"
+                email_id=f"bpl_upload_{request.po_number}_{request.port_code}",
+                recipients=results
             )
 
         except Exception as e:
@@ -0,0 +1,107 @@
+"""
+Fan-out delivery: one request, several recipients, each with their own
+message and (optionally) their own PDF.
+
+deliver_all() renders every PDF the messages attach at once through the
+render pool, then sends every message at once over pooled SMTP sessions,
+so a BPL send (owner and vendor copy) takes about as long as its slowest
+render plus its slowest send rather than the sum of all four.
+
+All PDFs are rendered before anything is sent: a render that fails
+(RendererBusy included) fails the whole request with nothing sent, and
+the API's job queue retries it cleanly. Send failures are per recipient:
+each gets a RecipientResult, and under an Idempotency-Key the recipients
+that were reached are remembered, so the retry of a partly failed send
+only emails the ones that weren't.
+"""
+import asyncio
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from typing import List, Optional
+
+import structlog
+
+from app.schemas.email import RecipientResult
+from app.services.idempotency import idempotency_store
+from app.services.pdf_renderer import pdf_renderer
+from app.services.smtp_pool import smtp_pool
+
+logger = structlog.get_logger()
+
+
+class Delivery:
+    """
+    One message of a fan-out. With a template, the PDF rendered from
+    TEMPLATES[template](*template_args) is attached to the message as
+    attachment_name before it is sent.
+    """
+
+    def __init__(self, role: str, recipient: str, message: MIMEMultipart, template: Optional[str] = None,
+                 template_args: tuple = (), attachment_name: Optional[str] = None):
+        self.role = role
+        self.recipient = recipient
+        self.message = message
+        self.template = template
+        self.template_args = template_args
+        self.attachment_name = attachment_name
+
+    async def render_attachment(self):
+        if self.template is None:
+            return
+        pdf = await pdf_renderer.render(self.template, *self.template_args)
+        attachment = MIMEBase('application', 'octet-stream')
+        attachment.set_payload(pdf)
+        encoders.encode_base64(attachment)
+        attachment.add_header('Content-Disposition', f'attachment; filename="{self.attachment_name}"')
+        self.message.attach(attachment)
+
+
+def _recipient_id(delivery: Delivery) -> str:
+    # The address, so a retry with a corrected address sends to it; with the
+    # role, so owner and vendor copies to one address are tracked apart
+    return f"{delivery.role}:{delivery.recipient}"
+
+
+async def _send(delivery: Delivery, idempotency_key: Optional[str]) -> RecipientResult:
+    try:
+        await smtp_pool.send(delivery.message)
+    except Exception as e:
+        logger.error("Fan-out send failed", role=delivery.role, recipient=delivery.recipient, error=str(e))
+        return RecipientResult(role=delivery.role, recipient=delivery.recipient, success=False,
+                               status="failed", error=str(e))
+    idempotency_store.mark_delivered(idempotency_key, _recipient_id(delivery))
+    logger.info("Fan-out email sent", role=delivery.role, recipient=delivery.recipient)
+    return RecipientResult(role=delivery.role, recipient=delivery.recipient, success=True, status="sent")
+
+
+async def deliver_all(deliveries: List[Delivery], idempotency_key: Optional[str] = None,
+                      dry_run: bool = False) -> List[RecipientResult]:
+    """
+    Render and send every delivery concurrently; one result per delivery, in order.
+    dry_run renders the attachments but sends nothing (email simulation mode).
+    Render errors propagate; send errors are reported in the results.
+    """
+    pending = [d for d in deliveries if not idempotency_store.delivered(idempotency_key, _recipient_id(d))]
+    # Identical renders are shared by the renderer, so duplicates here cost nothing
+    await asyncio.gather(*[d.render_attachment() for d in pending])
+
+    if dry_run:
+        results = [RecipientResult(role=d.role, recipient=d.recipient, success=True, status="simulated")
+                   for d in pending]
+    else:
+        results = await asyncio.gather(*[_send(d, idempotency_key) for d in pending])
+
+    by_role = {r.role: r for r in results}
+    return [
+        by_role.get(d.role) or RecipientResult(role=d.role, recipient=d.recipient, success=True, status="already_sent")
+        for d in deliveries
+    ]
+
+
+def failure_summary(results: List[RecipientResult]) -> Optional[str]:
+    """None if every recipient was reached, else who wasn't and why."""
+    failed = [r for r in results if not r.success]
+    if not failed:
+        return None
+    return "; ".join(f"{r.role} ({r.recipient}): {r.error}" for r in failed)
@@ -0,0 +1,103 @@
+"""
+Idempotency-Key handling for the send endpoints.
+
+The API delivers emails from its job queue at least once: a job whose
+response was lost (timeout, instance restart) is sent again with the same
+Idempotency-Key header. Successful results are remembered per key for
+IDEMPOTENCY_TTL seconds, so a repeat gets the first result back instead of
+emailing twice, and a repeat that arrives while the first send is still
+running waits for it. Failed sends are not remembered, so a retry sends.
+For fan-out sends the recipients already reached (role and address) are
+remembered too, so the retry of a partly failed send skips them.
+
+Keys are kept in this instance's memory; a repeat routed to another
+instance, or arriving after a restart, is sent again.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import structlog
+
+from app.schemas.email import EmailResponse
+
+logger = structlog.get_logger()
+
+IDEMPOTENCY_TTL = 24 * 3600.0
+MAX_KEYS = 10000
+
+
+class IdempotencyStore:
+
+    def __init__(self, ttl: float, max_keys: int):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._results: "OrderedDict[str, Tuple[float, EmailResponse]]" = OrderedDict()
+        # Per-key lock and the number of run() calls holding or waiting for it
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._delivered: "OrderedDict[str, Tuple[float, Set[str]]]" = OrderedDict()
+
+    def _cached(self, key: str) -> Optional[EmailResponse]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._results[key]
+            return None
+        return entry[1]
+
+    def _remember(self, key: str, result: EmailResponse):
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_keys:
+            self._results.popitem(last=False)
+
+    def delivered(self, key: Optional[str], recipient: str) -> bool:
+        """Whether a send under this key already reached this recipient."""
+        entry = self._delivered.get(key) if key else None
+        if entry is None:
+            return False
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._delivered[key]
+            return False
+        return recipient in entry[1]
+
+    def mark_delivered(self, key: Optional[str], recipient: str):
+        if not key:
+            return
+        entry = self._delivered.pop(key, None)
+        recipients = entry[1] if entry else set()
+        recipients.add(recipient)
+        self._delivered[key] = (entry[0] if entry else time.monotonic(), recipients)
+        while len(self._delivered) > self.max_keys:
+            self._delivered.popitem(last=False)
+
+    async def run(self, key: Optional[str], send: Callable[[], Awaitable[EmailResponse]]) -> EmailResponse:
+        """Call send() unless a send with this key already succeeded; no key means always send."""
+        if not key:
+            return await send()
+
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                cached = self._cached(key)
+                if cached is not None:
+                    logger.info("Duplicate send skipped", idempotency_key=key)
+                    return cached
+                result = await send()
+                if result.success:
+                    self._remember(key, result)
+                return result
+        finally:
+            # lock.locked() is briefly False while the lock is handed to the
+            # next waiter, so only the count says when nobody needs it
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+
+idempotency_store = IdempotencyStore(IDEMPOTENCY_TTL, MAX_KEYS)
@@ -1,20 +1,16 @@
 """
 PDF generation service for buyer estimates
 """
-import os
 from datetime import datetime
 from typing import Dict, List, Any
 from decimal import Decimal
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate, Frame
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 
-# Logo path
-LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'BLF-Logo.png')
+from app.services import pdf_theme as theme
 
 def add_page_footer(canvas, doc):
     """Add footer with page numbers and continuation notice"""
@@ -128,49 +124,7 @@ def generate_estimate_pdf(estimate_data: Dict[str, Any], items: List[Dict[str, A
     elements = []
     
     # Create header banner with logo, company name, and title
-    if os.path.exists(LOGO_PATH):
-        # Create a table for the header banner
-        logo_img = Image(LOGO_PATH, width=0.8*inch, height=0.8*inch)
-        
-        header_data = [[
-            logo_img,
-            Paragraph("<b>Blue Lotus Foods LLC</b>", ParagraphStyle(
-                'BannerCenter',
-                fontSize=18,
-                textColor=colors.white,
-                alignment=TA_CENTER,
-            )),
-            Paragraph("<b>Product Pricing</b>", ParagraphStyle(
-                'BannerRight',
-                fontSize=14,
-                textColor=colors.white,
-                alignment=TA_RIGHT,
-            ))
-        ]]
-        
-        header_table = Table(header_data, colWidths=[1.5*inch, 4*inch, 2*inch])
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#0A3D5C')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (0, 0), 10),
-            ('RIGHTPADDING', (-1, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.15*inch))
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.white,
-        backColor=colors.HexColor('#0A3D5C'),
-        spaceAfter=6,
-        spaceBefore=12,
-    )
+    elements.extend(theme.header_banner("Product Pricing"))
     
     # Add estimate information
     info_data = [
@@ -180,48 +134,21 @@ def generate_estimate_pdf(estimate_data: Dict[str, Any], items: List[Dict[str, A
     ]
     
     info_table = Table(info_data, colWidths=[1*inch, 2.5*inch, 1*inch, 2.5*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#0A3D5C')),
-        ('TEXTCOLOR', (2, 0), (2, -1), colors.HexColor('#0A3D5C')),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
+    info_table.setStyle(theme.ESTIMATE_INFO_TABLE)
     elements.append(info_table)
     elements.append(Spacer(1, 0.15*inch))
     
     # Add introductory text
-    intro_style = ParagraphStyle(
-        'IntroText',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.black,
-        spaceAfter=4,
-        alignment=TA_LEFT,
-        leading=14,
-    )
-    
     intro_text = """We are delighted to furnish you with the pricing information and pertinent details for the product 
     mentioned below. We kindly request your prompt confirmation of the order today, enabling us to 
     arrange delivery on the specified date mentioned above."""
     
-    note_style = ParagraphStyle(
-        'NoteText',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#4a5568'),
-        spaceAfter=8,
-        alignment=TA_LEFT,
-        leading=12,
-    )
-    
     note_text = """<b>Note:</b> The prices provided are estimates only. Tariff and clearing charges may vary depending on the 
     catch, and freight charges are subject to change based on route and market demand."""
     
-    elements.append(Paragraph(intro_text, intro_style))
+    elements.append(Paragraph(intro_text, theme.INTRO_TEXT))
     elements.append(Spacer(1, 0.05*inch))
-    elements.append(Paragraph(note_text, note_style))
+    elements.append(Paragraph(note_text, theme.NOTE_TEXT))
     elements.append(Spacer(1, 0.15*inch))
     
     # Group items
@@ -236,18 +163,7 @@ def generate_estimate_pdf(estimate_data: Dict[str, Any], items: List[Dict[str, A
         ]
         
         fish_info_table = Table(fish_info_data, colWidths=[1.2*inch, 1.8*inch, 1.3*inch, 1.8*inch, 0.7*inch, 0.7*inch])
-        fish_info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#0A3D5C')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (4, 0), (4, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ]))
+        fish_info_table.setStyle(theme.ESTIMATE_FISH_INFO_TABLE)
         elements.append(fish_info_table)
         elements.append(Spacer(1, 0.1*inch))
         
@@ -279,28 +195,7 @@ def generate_estimate_pdf(estimate_data: Dict[str, Any], items: List[Dict[str, A
         
         # Create table
         item_table = Table(table_data, colWidths=[1.5*inch, 1.5*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-        item_table.setStyle(TableStyle([
-            # Header row
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
-            ('TOPPADDING', (0, 0), (-1, 0), 4),
-            
-            # Data rows
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
-        ]))
+        item_table.setStyle(theme.ESTIMATE_ITEM_TABLE)
         elements.append(item_table)
         elements.append(Spacer(1, 0.15*inch))
     
@@ -347,38 +242,9 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
                            topMargin=0.5*inch, bottomMargin=0.9*inch)
     
     elements = []
-    styles = getSampleStyleSheet()
     
     # Header with logo
-    if os.path.exists(LOGO_PATH):
-        logo_img = Image(LOGO_PATH, width=0.8*inch, height=0.8*inch)
-        header_data = [[
-            logo_img,
-            Paragraph("<b>Blue Lotus Foods LLC</b>", ParagraphStyle(
-                'BannerCenter',
-                fontSize=18,
-                textColor=colors.white,
-                alignment=TA_CENTER,
-            )),
-            Paragraph("<b>Quote Confirmation</b>", ParagraphStyle(
-                'BannerRight',
-                fontSize=14,
-                textColor=colors.white,
-                alignment=TA_RIGHT,
-            ))
-        ]]
-        
-        header_table = Table(header_data, colWidths=[1.5*inch, 4*inch, 2*inch])
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#0A3D5C')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (0, 0), 10),
-            ('RIGHTPADDING', (-1, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.15*inch))
+    elements.extend(theme.header_banner("Quote Confirmation"))
     
     # Quote Information
     info_data = [
@@ -388,28 +254,13 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
     ]
     
     info_table = Table(info_data, colWidths=[1*inch, 2.5*inch, 1*inch, 2.5*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#0A3D5C')),
-        ('TEXTCOLOR', (2, 0), (2, -1), colors.HexColor('#0A3D5C')),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    info_table.setStyle(theme.QUOTE_INFO_TABLE)
     elements.append(info_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # Destinations
     if quote_data.get('destinations'):
-        elements.append(Paragraph("<b>DESTINATIONS & LOGISTICS</b>", ParagraphStyle(
-            'SectionHeader',
-            fontSize=12,
-            textColor=colors.white,
-            backColor=colors.HexColor('#0A3D5C'),
-            spaceBefore=6,
-            spaceAfter=6,
-        )))
+        elements.append(Paragraph("<b>DESTINATIONS & LOGISTICS</b>", theme.SECTION_HEADER))
         
         dest_header = ['Destination', 'Airfreight/Kg', 'Arrival Date', 'Min Weight (kg)', 'Max Weight (kg)']
         dest_data = [dest_header]
@@ -424,33 +275,17 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
             ])
         
         dest_table = Table(dest_data, colWidths=[2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch], repeatRows=1)
-        dest_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0A3D5C')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
+        dest_table.setStyle(theme.QUOTE_DEST_TABLE)
         elements.append(dest_table)
         elements.append(Spacer(1, 0.2*inch))
     
     # Products
     if quote_data.get('sizes'):
-        elements.append(Paragraph("<b>PRODUCTS & PRICING</b>", ParagraphStyle(
-            'SectionHeader',
-            fontSize=12,
-            textColor=colors.white,
-            backColor=colors.HexColor('#0A3D5C'),
-            spaceBefore=6,
-            spaceAfter=6,
-        )))
+        elements.append(Paragraph("<b>PRODUCTS & PRICING</b>", theme.SECTION_HEADER))
         
         # Use Paragraph style for wrapping cells
-        cell_style = ParagraphStyle('CellWrap', fontSize=9, leading=11)
-        cell_style_center = ParagraphStyle('CellWrapCenter', fontSize=9, leading=11, alignment=TA_CENTER)
+        cell_style = theme.CELL
+        cell_style_center = theme.CELL_CENTER
         
         prod_header = ['Fish Type', 'Cut', 'Grade', 'Weight Range', 'Price/Kg', 'Quantity']
         prod_data = [prod_header]
@@ -466,20 +301,7 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
             ])
         
         prod_table = Table(prod_data, colWidths=[2*inch, 1*inch, 1*inch, 1*inch, 1*inch, 1*inch], repeatRows=1)
-        prod_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0A3D5C')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
+        prod_table.setStyle(theme.QUOTE_PRODUCT_TABLE)
         elements.append(prod_table)
     
     # ── QUOTE SUMMARY (per-destination pricing breakdown) ──
@@ -488,19 +310,12 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
     
     if destinations and sizes:
         elements.append(Spacer(1, 0.25*inch))
-        elements.append(Paragraph("<b>QUOTE SUMMARY</b>", ParagraphStyle(
-            'SummaryHeader',
-            fontSize=12,
-            textColor=colors.white,
-            backColor=colors.HexColor('#0A3D5C'),
-            spaceBefore=6,
-            spaceAfter=6,
-        )))
+        elements.append(Paragraph("<b>QUOTE SUMMARY</b>", theme.SECTION_HEADER))
         
-        cell_normal = ParagraphStyle('SumCellNormal', fontSize=9, leading=11)
-        cell_center = ParagraphStyle('SumCellCenter', fontSize=9, leading=11, alignment=TA_CENTER)
-        cell_right = ParagraphStyle('SumCellRight', fontSize=9, leading=11, alignment=TA_RIGHT)
-        cell_right_bold = ParagraphStyle('SumCellRightBold', fontSize=9, leading=11, alignment=TA_RIGHT, fontName='Helvetica-Bold', textColor=colors.HexColor('#1e40af'))
+        cell_normal = theme.CELL
+        cell_center = theme.CELL_CENTER
+        cell_right = theme.CELL_RIGHT
+        cell_right_bold = theme.CELL_RIGHT_BOLD
         
         for dest in destinations:
             dest_name = dest.get('destination', '')
@@ -517,16 +332,7 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
                 dest_label += f"  |  Weight: {min_wt} – {max_wt} kg"
             
             elements.append(Spacer(1, 0.1*inch))
-            elements.append(Paragraph(dest_label, ParagraphStyle(
-                'DestSubHeader',
-                fontSize=10,
-                textColor=colors.white,
-                backColor=colors.HexColor('#2563EB'),
-                spaceBefore=4,
-                spaceAfter=4,
-                leftIndent=4,
-                rightIndent=4,
-            )))
+            elements.append(Paragraph(dest_label, theme.DEST_SUB_HEADER))
             
             # Table: Fish | Cut | Grade | Wt Range | Airfreight/kg | Price/kg | Total/kg
             sum_header = ['Fish', 'Cut', 'Grade', 'Wt/Fish (kg)', 'Airfreight/kg', 'Price/kg', 'Total/kg']
@@ -546,26 +352,14 @@ def generate_vendor_quote_pdf(quote_data: dict) -> bytes:
                 ])
             
             sum_table = Table(sum_data, colWidths=[1.6*inch, 0.8*inch, 0.8*inch, 0.9*inch, 1*inch, 0.9*inch, 0.9*inch], repeatRows=1)
-            sum_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0A3D5C')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#D1D5DB')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F3F4F6')]),
-            ]))
+            sum_table.setStyle(theme.QUOTE_SUMMARY_TABLE)
             elements.append(sum_table)
     
     # Notes
     if quote_data.get('notes'):
         elements.append(Spacer(1, 0.2*inch))
-        elements.append(Paragraph("<b>Notes:</b>", styles['Heading3']))
-        elements.append(Paragraph(quote_data['notes'], styles['Normal']))
+        elements.append(Paragraph("<b>Notes:</b>", theme.SAMPLE_STYLES['Heading3']))
+        elements.append(Paragraph(quote_data['notes'], theme.SAMPLE_STYLES['Normal']))
     
     # Build PDF
     doc.build(elements)
@@ -597,30 +391,11 @@ def generate_bpl_owner_pdf(bpl_data: Dict[str, Any]) -> bytes:
     doc.addPageTemplates([template])
 
     elements = []
-    styles = getSampleStyleSheet()
-    brand = colors.HexColor('#0A3D5C')
+    bpl_theme = theme.BPL_OWNER
 
     # ── Header banner with logo ──
-    if os.path.exists(LOGO_PATH):
-        logo_img = Image(LOGO_PATH, width=0.8*inch, height=0.8*inch)
-        header_data = [[
-            logo_img,
-            Paragraph("<b>Blue Lotus Foods LLC</b>", ParagraphStyle(
-                'BannerLeft', fontSize=18, textColor=colors.white, alignment=TA_LEFT)),
-            Paragraph("<b>Detailed BPL</b>", ParagraphStyle(
-                'BannerRight', fontSize=14, textColor=colors.white, alignment=TA_RIGHT)),
-        ]]
-        header_table = Table(header_data, colWidths=[1.0*inch, 4.2*inch, 2.3*inch])
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), brand),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (0, 0), 10),
-            ('RIGHTPADDING', (-1, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.15*inch))
+    elements.extend(theme.header_banner("Detailed BPL", col_widths=(1.0*inch, 4.2*inch, 2.3*inch),
+                                        company_style=theme.BANNER_COMPANY_LEFT))
 
     # ── Shipment info grid ──
     po_number = bpl_data.get('po_number', 'N/A')
@@ -638,26 +413,19 @@ def generate_bpl_owner_pdf(bpl_data: Dict[str, Any]) -> bytes:
         ['Packed Date:', packed_date, 'Expiry Date:', expiry_date],
     ]
     info_table = Table(info_data, colWidths=[1.1*inch, 2.4*inch, 1.1*inch, 2.4*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, -1), brand),
-        ('TEXTCOLOR', (2, 0), (2, -1), brand),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    info_table.setStyle(bpl_theme.info_table)
     elements.append(info_table)
     elements.append(Spacer(1, 0.2*inch))
 
     # ── Box details per PO item ──
-    _build_bpl_box_tables(elements, bpl_data, styles, brand, owner_mode=True)
+    _build_bpl_box_tables(elements, bpl_data, bpl_theme, owner_mode=True)
 
     # ── Notes ──
     notes = bpl_data.get('notes')
     if notes:
         elements.append(Spacer(1, 0.15*inch))
-        elements.append(Paragraph("<b>Notes:</b>", styles['Normal']))
-        elements.append(Paragraph(notes, styles['Normal']))
+        elements.append(Paragraph("<b>Notes:</b>", theme.SAMPLE_STYLES['Normal']))
+        elements.append(Paragraph(notes, theme.SAMPLE_STYLES['Normal']))
 
     doc.build(elements)
     pdf_bytes = buffer.getvalue()
@@ -681,13 +449,10 @@ def generate_bpl_vendor_pdf(bpl_data: Dict[str, Any]) -> bytes:
     doc.addPageTemplates([PageTemplate(id='main', frames=frame)])
 
     elements = []
-    styles = getSampleStyleSheet()
-    dark = colors.HexColor('#1e293b')
+    bpl_theme = theme.BPL_VENDOR
 
     # ── Title ──
-    elements.append(Paragraph(
-        "<b>Box Packaging List</b>",
-        ParagraphStyle('BPLTitle', fontSize=18, textColor=dark, alignment=TA_CENTER, spaceAfter=8)))
+    elements.append(Paragraph("<b>Box Packaging List</b>", theme.BPL_TITLE))
     elements.append(Spacer(1, 0.1*inch))
 
     # ── Vendor info ──
@@ -701,8 +466,7 @@ def generate_bpl_vendor_pdf(bpl_data: Dict[str, Any]) -> bytes:
     if vendor_email:
         vendor_lines.append(vendor_email)
 
-    elements.append(Paragraph("<br/>".join(vendor_lines), ParagraphStyle(
-        'VendorInfo', fontSize=11, textColor=dark, spaceAfter=10)))
+    elements.append(Paragraph("<br/>".join(vendor_lines), theme.BPL_VENDOR_INFO))
     elements.append(Spacer(1, 0.05*inch))
 
     # ── Shipment info grid ──
@@ -721,26 +485,19 @@ def generate_bpl_vendor_pdf(bpl_data: Dict[str, Any]) -> bytes:
         ['Packed Date:', packed_date, 'Expiry Date:', expiry_date],
     ]
     info_table = Table(info_data, colWidths=[1.1*inch, 2.4*inch, 1.1*inch, 2.4*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, -1), dark),
-        ('TEXTCOLOR', (2, 0), (2, -1), dark),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    info_table.setStyle(bpl_theme.info_table)
     elements.append(info_table)
     elements.append(Spacer(1, 0.2*inch))
 
     # ── Box details per PO item ──
-    _build_bpl_box_tables(elements, bpl_data, styles, dark)
+    _build_bpl_box_tables(elements, bpl_data, bpl_theme)
 
     # ── Notes ──
     notes = bpl_data.get('notes')
     if notes:
         elements.append(Spacer(1, 0.15*inch))
-        elements.append(Paragraph("<b>Notes:</b>", styles['Normal']))
-        elements.append(Paragraph(notes, styles['Normal']))
+        elements.append(Paragraph("<b>Notes:</b>", theme.SAMPLE_STYLES['Normal']))
+        elements.append(Paragraph(notes, theme.SAMPLE_STYLES['Normal']))
 
     doc.build(elements)
     pdf_bytes = buffer.getvalue()
@@ -762,7 +519,7 @@ def _fmt_weight_range(from_kg: float, to_kg: float) -> str:
     return f"{kg_to_display(from_kg)} \u2013 {kg_to_display(to_kg)}"
 
 
-def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_color, owner_mode=False):
+def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], bpl_theme: theme.BPLTheme, owner_mode=False):
     """Shared helper: build box detail tables grouped by PO item.
     owner_mode=True  → no size in banner, stacked weights, LBS columns, summary table
     owner_mode=False → includes size, comma-sep weights, KG only, no summary
@@ -784,15 +541,9 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
             sub_header_text += f" · {size_label}"
 
         # Sub-header bar
-        sh_data = [[Paragraph(f"<b>{sub_header_text}</b>", ParagraphStyle(
-            'ItemSub', fontSize=10, textColor=colors.white))]]
+        sh_data = [[Paragraph(f"<b>{sub_header_text}</b>", theme.BPL_ITEM_SUB_HEADER)]]
         sh_table = Table(sh_data, colWidths=[7.5*inch])
-        sh_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), accent_color),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        sh_table.setStyle(bpl_theme.item_sub_header)
         elements.append(sh_table)
 
         if owner_mode:
@@ -800,7 +551,7 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
 
         boxes = item.get('boxes', [])
         if not boxes:
-            elements.append(Paragraph("No boxes", styles['Normal']))
+            elements.append(Paragraph("No boxes", theme.SAMPLE_STYLES['Normal']))
             elements.append(Spacer(1, 0.1*inch))
             if owner_mode:
                 summary_rows.append((sub_header_text, 0.0, 0.0))
@@ -835,7 +586,7 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
                 item_total_kg += box_total_kg
                 item_total_lbs += box_total_lbs
 
-                piece_style = ParagraphStyle('PieceCell', fontSize=8, leading=11)
+                piece_style = theme.BPL_PIECE_OWNER
                 table_data.append([
                     str(box.get('box_number', '')),
                     str(box.get('num_pieces', len(pieces))),
@@ -850,19 +601,7 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
                                f"{item_total_kg:.1f}", f"{item_total_lbs:.1f}"])
 
             t = Table(table_data, colWidths=[0.55*inch, 0.55*inch, 1.8*inch, 1.8*inch, 1.0*inch, 1.0*inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -2), 0.5, colors.HexColor('#D1D5DB')),
-                ('LINEABOVE', (0, -1), (-1, -1), 1, accent_color),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('ALIGN', (0, 0), (1, -1), 'CENTER'),
-                ('ALIGN', (4, 0), (5, -1), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
+            t.setStyle(bpl_theme.box_table)
 
         else:
             # ── Vendor: 4 columns, comma-sep weights, KG only ──
@@ -885,7 +624,7 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
                 table_data.append([
                     str(box.get('box_number', '')),
                     str(box.get('num_pieces', len(pieces))),
-                    Paragraph(piece_str, ParagraphStyle('PieceCell', fontSize=9, leading=12)),
+                    Paragraph(piece_str, theme.BPL_PIECE_VENDOR),
                     f"{box_total_kg:.1f}",
                 ])
 
@@ -893,19 +632,7 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
             table_data.append(['', '', '', f"{item_total_kg:.1f}"])
 
             t = Table(table_data, colWidths=[0.7*inch, 0.8*inch, 4.2*inch, 1.2*inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -2), 0.5, colors.HexColor('#D1D5DB')),
-                ('LINEABOVE', (0, -1), (-1, -1), 1, accent_color),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('ALIGN', (0, 0), (1, -1), 'CENTER'),
-                ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
+            t.setStyle(bpl_theme.box_table)
 
         elements.append(t)
         elements.append(Spacer(1, 0.15*inch))
@@ -929,21 +656,9 @@ def _build_bpl_box_tables(elements, bpl_data: Dict[str, Any], styles, accent_col
             grand_lbs += lbs
 
         # Grand total row
-        sum_data.append([Paragraph("<b>Grand Total</b>", ParagraphStyle('GT', fontSize=10)),
+        sum_data.append([Paragraph("<b>Grand Total</b>", theme.BPL_GRAND_TOTAL),
                          f"{grand_kg:,.1f}", f"{grand_lbs:,.1f}"])
 
         sum_table = Table(sum_data, colWidths=[3.2*inch, 1.0*inch, 1.0*inch])
-        sum_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -2), 0.5, colors.HexColor('#D1D5DB')),
-            ('ALIGN', (1, 0), (2, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-            ('LINEABOVE', (0, -1), (-1, -1), 1.5, accent_color),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f1f5f9')),
-        ]))
+        sum_table.setStyle(bpl_theme.summary_table)
         elements.append(sum_table)
@@ -0,0 +1,182 @@
+"""
+Runs the ReportLab PDF templates in a process pool.
+
+Rendering is CPU-bound; done inline in an async handler, a large BPL
+blocks every other request on the event loop. render() hands the template
+to a pool of settings.pdf_render_workers processes instead. At most
+settings.pdf_render_max_queue renders wait behind the running ones; past
+that render() raises RendererBusy, which the app answers with 429 and a
+Retry-After header, and the API's job queue retries later.
+
+Every render goes through the content-addressed render cache first, and
+concurrent requests for the same document share one render, so an
+identical PDF is only rendered once.
+
+Per-template render counts and times (measured in the worker, so queue
+wait isn't included) and cache hits are exposed on /metrics.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+import structlog
+
+from app.core.settings import settings
+from app.services import pdf_theme
+from app.services.render_cache import RenderCache, render_key
+from app.services.pdf_generator import (
+    generate_vendor_quote_pdf, generate_estimate_pdf, generate_bpl_owner_pdf, generate_bpl_vendor_pdf
+)
+
+logger = structlog.get_logger()
+
+TEMPLATES: Dict[str, Callable[..., bytes]] = {
+    'vendor_quote': generate_vendor_quote_pdf,
+    'estimate': generate_estimate_pdf,
+    'bpl_owner': generate_bpl_owner_pdf,
+    'bpl_vendor': generate_bpl_vendor_pdf,
+}
+
+
+class RendererBusy(Exception):
+    """Too many renders queued; the caller should retry after retry_after seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"PDF renderer is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _render_timed(template: str, args: tuple):
+    # Runs in the worker process
+    start = time.perf_counter()
+    pdf = TEMPLATES[template](*args)
+    return pdf, time.perf_counter() - start
+
+
+class _TemplateStats:
+    __slots__ = ('renders', 'cached', 'shared', 'errors', 'rejected', 'render_time', 'max_render_time')
+
+    def __init__(self):
+        self.renders = 0
+        self.cached = 0
+        self.shared = 0
+        self.errors = 0
+        self.rejected = 0
+        self.render_time = 0.0
+        self.max_render_time = 0.0
+
+
+class PDFRenderer:
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int, cache: RenderCache):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, _TemplateStats] = {name: _TemplateStats() for name in TEMPLATES}
+
+    def start(self):
+        """Create the pool; the workers themselves start on first use."""
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and holds
+            # SMTP sockets isn't safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                # Decode the logo as each worker starts, not in its first render
+                initializer=pdf_theme.load,
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, template: str, *args) -> bytes:
+        """
+        TEMPLATES[template](*args), from the cache or rendered in the pool.
+        Raises RendererBusy when a render is needed and the queue is full.
+        """
+        stats = self._stats[template]
+        key = render_key(template, args)
+        pdf = await self.cache.get(key)
+        if pdf is not None:
+            stats.cached += 1
+            return pdf
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            stats.shared += 1
+        else:
+            in_flight = self._in_flight[key] = asyncio.ensure_future(self._render(template, key, args))
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: one caller going away doesn't cancel the render for the others
+        return await asyncio.shield(in_flight)
+
+    async def _render(self, template: str, key: str, args: tuple) -> bytes:
+        stats = self._stats[template]
+        if self._pending >= self.workers + self.max_queue:
+            stats.rejected += 1
+            raise RendererBusy(self.retry_after)
+
+        self.start()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                pdf, elapsed = await loop.run_in_executor(self._executor, _render_timed, template, args)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); replace the pool for the next render
+                logger.error("PDF render pool broken, restarting it", template=template)
+                self.shutdown()
+                raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        stats.renders += 1
+        stats.render_time += elapsed
+        stats.max_render_time = max(stats.max_render_time, elapsed)
+        await self.cache.put(key, pdf)
+        return pdf
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "cache": self.cache.stats(),
+            "templates": {
+                name: {
+                    "renders": s.renders,
+                    "cached": s.cached,
+                    "shared": s.shared,
+                    "errors": s.errors,
+                    "rejected": s.rejected,
+                    "render_time": s.render_time,
+                    "avg_render_time": s.render_time / s.renders if s.renders else 0.0,
+                    "max_render_time": s.max_render_time,
+                }
+                for name, s in self._stats.items()
+            },
+        }
+
+
+pdf_renderer = PDFRenderer(
+    workers=settings.pdf_render_workers,
+    max_queue=settings.pdf_render_max_queue,
+    retry_after=settings.pdf_render_retry_after,
+    cache=RenderCache(
+        max_bytes=settings.pdf_cache_max_bytes,
+        disk_dir=settings.pdf_cache_dir,
+        disk_max_bytes=settings.pdf_cache_disk_max_bytes,
+    ),
+)
@@ -0,0 +1,328 @@
+"""
+Shared building blocks for the PDF templates in pdf_generator.py.
+
+The templates used to rebuild all of this on every render: a fresh
+getSampleStyleSheet(), new ParagraphStyle/TableStyle objects, and the logo
+PNG opened and decoded from disk. Here the styles are built once at import,
+and load() decodes the logo once and keeps its pixels in memory. The render
+pool runs load() as its worker initializer, so each worker pays for it at
+startup rather than on its first render.
+
+Importing this module also turns off ReportLab's ASCII85 encoding of
+image streams. Without the optional rl_accel extension that encoding is
+pure Python and was most of the cost of a one-page document with the
+logo; it only keeps the PDF 7-bit clean, which attachments don't need,
+and makes the image stream a quarter bigger.
+
+Styles are shared between documents; ReportLab only reads them. Flowables
+carry layout state, so header_banner() builds a new banner per document
+from the shared pieces.
+"""
+import os
+from typing import List, Optional
+
+from PIL import Image as PILImage
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable, Paragraph, Spacer, Table, TableStyle
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'BLF-Logo.png')
+
+# Printed size of the logo in the header banner
+LOGO_SIZE = 0.8*inch
+
+rl_config.useA85 = 0
+
+BRAND = colors.HexColor('#0A3D5C')
+DARK = colors.HexColor('#1e293b')
+GRID_GREY = colors.HexColor('#D1D5DB')
+HEADER_GREY = colors.HexColor('#f1f5f9')
+
+# ── Paragraph styles ──
+
+SAMPLE_STYLES = getSampleStyleSheet()
+
+BANNER_COMPANY_CENTER = ParagraphStyle('BannerCenter', fontSize=18, textColor=colors.white, alignment=TA_CENTER)
+BANNER_COMPANY_LEFT = ParagraphStyle('BannerLeft', fontSize=18, textColor=colors.white, alignment=TA_LEFT)
+BANNER_TITLE = ParagraphStyle('BannerRight', fontSize=14, textColor=colors.white, alignment=TA_RIGHT)
+
+SECTION_HEADER = ParagraphStyle(
+    'SectionHeader',
+    fontSize=12,
+    textColor=colors.white,
+    backColor=BRAND,
+    spaceBefore=6,
+    spaceAfter=6,
+)
+DEST_SUB_HEADER = ParagraphStyle(
+    'DestSubHeader',
+    fontSize=10,
+    textColor=colors.white,
+    backColor=colors.HexColor('#2563EB'),
+    spaceBefore=4,
+    spaceAfter=4,
+    leftIndent=4,
+    rightIndent=4,
+)
+INTRO_TEXT = ParagraphStyle(
+    'IntroText',
+    parent=SAMPLE_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.black,
+    spaceAfter=4,
+    alignment=TA_LEFT,
+    leading=14,
+)
+NOTE_TEXT = ParagraphStyle(
+    'NoteText',
+    parent=SAMPLE_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.HexColor('#4a5568'),
+    spaceAfter=8,
+    alignment=TA_LEFT,
+    leading=12,
+)
+
+CELL = ParagraphStyle('CellWrap', fontSize=9, leading=11)
+CELL_CENTER = ParagraphStyle('CellWrapCenter', fontSize=9, leading=11, alignment=TA_CENTER)
+CELL_RIGHT = ParagraphStyle('SumCellRight', fontSize=9, leading=11, alignment=TA_RIGHT)
+CELL_RIGHT_BOLD = ParagraphStyle('SumCellRightBold', fontSize=9, leading=11, alignment=TA_RIGHT,
+                                 fontName='Helvetica-Bold', textColor=colors.HexColor('#1e40af'))
+
+BPL_TITLE = ParagraphStyle('BPLTitle', fontSize=18, textColor=DARK, alignment=TA_CENTER, spaceAfter=8)
+BPL_VENDOR_INFO = ParagraphStyle('VendorInfo', fontSize=11, textColor=DARK, spaceAfter=10)
+BPL_ITEM_SUB_HEADER = ParagraphStyle('ItemSub', fontSize=10, textColor=colors.white)
+BPL_PIECE_OWNER = ParagraphStyle('PieceCell', fontSize=8, leading=11)
+BPL_PIECE_VENDOR = ParagraphStyle('PieceCell', fontSize=9, leading=12)
+BPL_GRAND_TOTAL = ParagraphStyle('GT', fontSize=10)
+
+# ── Table styles ──
+
+BANNER_TABLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), BRAND),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (0, 0), 10),
+    ('RIGHTPADDING', (-1, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+])
+
+ESTIMATE_INFO_TABLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0, 0), (0, -1), BRAND),
+    ('TEXTCOLOR', (2, 0), (2, -1), BRAND),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+ESTIMATE_FISH_INFO_TABLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), BRAND),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (4, 0), (4, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+])
+
+ESTIMATE_ITEM_TABLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
+    ('TOPPADDING', (0, 0), (-1, 0), 4),
+
+    # Data rows
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
+])
+
+QUOTE_INFO_TABLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0, 0), (0, -1), BRAND),
+    ('TEXTCOLOR', (2, 0), (2, -1), BRAND),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+
+QUOTE_DEST_TABLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), BRAND),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+QUOTE_PRODUCT_TABLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), BRAND),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+QUOTE_SUMMARY_TABLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), BRAND),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRID_GREY),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F3F4F6')]),
+])
+
+
+def _bpl_info_table(accent) -> TableStyle:
+    return TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+        ('TEXTCOLOR', (0, 0), (0, -1), accent),
+        ('TEXTCOLOR', (2, 0), (2, -1), accent),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+
+def _bpl_item_sub_header(accent) -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), accent),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ])
+
+
+def _bpl_box_table(accent, owner_mode: bool) -> TableStyle:
+    # Owner tables right-align the KG and LBS totals, vendor tables only the KG total
+    totals_from = 4 if owner_mode else 3
+    totals_to = 5 if owner_mode else 3
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_GREY),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -2), 0.5, GRID_GREY),
+        ('LINEABOVE', (0, -1), (-1, -1), 1, accent),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (1, -1), 'CENTER'),
+        ('ALIGN', (totals_from, 0), (totals_to, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ])
+
+
+def _bpl_summary_table(accent) -> TableStyle:
+    return TableStyle([
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_GREY),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -2), 0.5, GRID_GREY),
+        ('ALIGN', (1, 0), (2, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LINEABOVE', (0, -1), (-1, -1), 1.5, accent),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, -1), (-1, -1), HEADER_GREY),
+    ])
+
+
+class BPLTheme:
+    """Table styles for one BPL variant: BRAND for the owner, DARK for the vendor."""
+
+    def __init__(self, accent, owner_mode: bool):
+        self.accent = accent
+        self.info_table = _bpl_info_table(accent)
+        self.item_sub_header = _bpl_item_sub_header(accent)
+        self.box_table = _bpl_box_table(accent, owner_mode)
+        self.summary_table = _bpl_summary_table(accent)
+
+
+BPL_OWNER = BPLTheme(BRAND, owner_mode=True)
+BPL_VENDOR = BPLTheme(DARK, owner_mode=False)
+
+# ── Logo and header banner ──
+
+_logo: Optional[ImageReader] = None
+_logo_loaded = False
+
+
+class _Logo(Flowable):
+    """Draws the pre-decoded logo; platypus.Image would open and decode the file again."""
+
+    def __init__(self, image: ImageReader, width: float, height: float):
+        super().__init__()
+        self.image = image
+        self.width = width
+        self.height = height
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self.image, 0, 0, self.width, self.height, mask='auto')
+
+
+def load() -> Optional[ImageReader]:
+    """Decode the logo once per process; None (and no banner) if the file is missing."""
+    global _logo, _logo_loaded
+    if not _logo_loaded:
+        _logo_loaded = True
+        if os.path.exists(LOGO_PATH):
+            # Kept at the source resolution (~450 dpi at LOGO_SIZE): resampling
+            # it down blurs the flat colours and makes the compressed stream bigger
+            with PILImage.open(LOGO_PATH) as img:
+                _logo = ImageReader(img.convert('RGBA'))
+            # Extracts and keeps the RGB and alpha data now instead of in the first render
+            _logo.getRGBData()
+    return _logo
+
+
+def header_banner(title: str, col_widths=(1.5*inch, 4*inch, 2*inch),
+                  company_style: ParagraphStyle = BANNER_COMPANY_CENTER) -> List[Flowable]:
+    """Logo, company name and title on a brand-coloured bar, plus the gap below it."""
+    logo = load()
+    if logo is None:
+        return []
+    header_table = Table([[
+        _Logo(logo, LOGO_SIZE, LOGO_SIZE),
+        Paragraph("<b>Blue Lotus Foods LLC</b>", company_style),
+        Paragraph(f"<b>{title}</b>", BANNER_TITLE),
+    ]], colWidths=list(col_widths))
+    header_table.setStyle(BANNER_TABLE)
+    return [header_table, Spacer(1, 0.15*inch)]
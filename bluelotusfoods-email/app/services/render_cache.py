@@ -0,0 +1,142 @@
+"""
+Content-addressed cache of rendered PDFs.
+
+A PDF is keyed by the SHA-256 of its template name and input data
+serialized as canonical JSON (sorted keys, fixed separators), so the same
+document is rendered once however many emails attach it: the buyer and
+owner copies of an estimate, the vendor and owner copies of a quote, or a
+resend of an estimate that hasn't changed.
+
+The memory tier is an LRU bounded by total PDF bytes
+(settings.pdf_cache_max_bytes). If settings.pdf_cache_dir is set, PDFs are
+also written there and survive restarts; that tier is bounded by
+settings.pdf_cache_disk_max_bytes, oldest files removed first.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+def render_key(template: str, args: tuple) -> str:
+    canonical = json.dumps([template, list(args)], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ─── memory tier ───────────────────────────────────────
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        pdf = self._entries.get(key)
+        if pdf is not None:
+            self._entries.move_to_end(key)
+        return pdf
+
+    def _put_memory(self, key: str, pdf: bytes):
+        if len(pdf) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = pdf
+        self._bytes += len(pdf)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    # ─── disk tier ─────────────────────────────────────────
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                pdf = f.read()
+            os.utime(self._path(key))
+            return pdf
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, pdf: bytes):
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(pdf)
+        os.replace(tmp, self._path(key))
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pdf'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    # ─── public ────────────────────────────────────────────
+
+    async def get(self, key: str) -> Optional[bytes]:
+        pdf = self._get_memory(key)
+        if pdf is not None:
+            self.memory_hits += 1
+            return pdf
+        if self.disk_dir:
+            try:
+                pdf = await asyncio.to_thread(self._read_disk, key)
+            except OSError as e:
+                logger.warning("PDF cache disk read failed", error=str(e))
+                pdf = None
+            if pdf is not None:
+                self.disk_hits += 1
+                self._put_memory(key, pdf)
+                return pdf
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, pdf: bytes):
+        self._put_memory(key, pdf)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, key, pdf)
+            except OSError as e:
+                logger.warning("PDF cache disk write failed", error=str(e))
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk_dir": self.disk_dir,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,172 @@
+"""
+Pool of authenticated SMTP sessions.
+
+Opening a session costs a TCP connect, STARTTLS and AUTH, which used to be
+paid for every message (twice per BPL send, owner + vendor). The pool keeps
+up to settings.smtp_pool_size logged-in sessions and hands them out one
+message at a time; callers wait for a free slot beyond that, so the SMTP
+server never sees more concurrent sessions than the cap.
+
+A session idle for more than HEALTH_CHECK_AFTER seconds is checked with
+NOOP before reuse; one idle past settings.smtp_pool_max_idle, or that has
+sent settings.smtp_pool_max_messages messages, is closed instead. If a
+reused session turns out to be dead (disconnected, timed out, or the
+server answers 421 "closing channel") the message is retried once on a
+fresh session.
+"""
+import asyncio
+import time
+from collections import deque
+from email.message import Message
+from typing import Deque, Optional
+
+import aiosmtplib
+import structlog
+
+from app.core.settings import settings
+
+logger = structlog.get_logger()
+
+# Idle sessions younger than this are reused without a NOOP round trip
+HEALTH_CHECK_AFTER = 10.0
+
+# Server is closing the connection (e.g. idle timeout, too many messages)
+SERVICE_CLOSING = 421
+
+CONNECTION_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+class _Session:
+    __slots__ = ('smtp', 'last_used', 'messages')
+
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+
+def _is_connection_failure(error: Exception) -> bool:
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    return isinstance(error, aiosmtplib.SMTPResponseException) and error.code == SERVICE_CLOSING
+
+
+class SMTPPool:
+
+    def __init__(self, size: int, max_idle: float, max_messages: int):
+        self.size = size
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self._idle: Deque[_Session] = deque()
+        self._slots = asyncio.Semaphore(size)
+        self.in_use = 0
+        self.connects = 0
+        self.reused = 0
+        self.reconnects = 0
+        self.discarded = 0
+
+    async def _connect(self) -> _Session:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_server,
+            port=settings.smtp_port,
+            # Same as the one-shot aiosmtplib.send() this replaced: forced
+            # STARTTLS when configured, opportunistic otherwise
+            start_tls=True if settings.smtp_use_tls else None,
+            timeout=settings.smtp_timeout,
+        )
+        await smtp.connect()
+        try:
+            if settings.smtp_username and settings.smtp_password:
+                await smtp.login(settings.smtp_username, settings.smtp_password)
+        except Exception:
+            smtp.close()
+            raise
+        self.connects += 1
+        return _Session(smtp)
+
+    async def _close(self, session: _Session):
+        self.discarded += 1
+        try:
+            if session.smtp.is_connected:
+                await asyncio.wait_for(session.smtp.quit(), timeout=5)
+        except Exception:
+            session.smtp.close()
+
+    async def _usable(self, session: _Session) -> bool:
+        idle = time.monotonic() - session.last_used
+        if not session.smtp.is_connected or idle > self.max_idle or session.messages >= self.max_messages:
+            return False
+        if idle > HEALTH_CHECK_AFTER:
+            try:
+                await session.smtp.noop()
+            except Exception:
+                return False
+        return True
+
+    async def _acquire(self) -> Optional[_Session]:
+        """An idle session that is still good, or None if a new one is needed."""
+        while self._idle:
+            # Most recently used first: it is the least likely to have gone stale
+            session = self._idle.pop()
+            if await self._usable(session):
+                self.reused += 1
+                return session
+            await self._close(session)
+        return None
+
+    async def send(self, message: Message):
+        async with self._slots:
+            self.in_use += 1
+            try:
+                session = await self._acquire()
+                reused = session is not None
+                if session is None:
+                    session = await self._connect()
+                try:
+                    await session.smtp.send_message(message)
+                except Exception as e:
+                    await self._close(session)
+                    if not (reused and _is_connection_failure(e)):
+                        raise
+                    # The pooled session died under us; one more try on a fresh one
+                    logger.warning("Pooled SMTP session failed, reconnecting", error=str(e))
+                    self.reconnects += 1
+                    session = await self._connect()
+                    try:
+                        await session.smtp.send_message(message)
+                    except Exception:
+                        await self._close(session)
+                        raise
+                session.messages += 1
+                session.last_used = time.monotonic()
+                self._idle.append(session)
+            finally:
+                self.in_use -= 1
+
+    async def close(self):
+        while self._idle:
+            await self._close(self._idle.pop())
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "connects": self.connects,
+            "reused": self.reused,
+            "reconnects": self.reconnects,
+            "discarded": self.discarded,
+        }
+
+
+smtp_pool = SMTPPool(
+    size=settings.smtp_pool_size,
+    max_idle=settings.smtp_pool_max_idle,
+    max_messages=settings.smtp_pool_max_messages,
+)